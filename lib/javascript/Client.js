@@ -44,6 +44,36 @@ function narrative_job_mock(url, auth, auth_cb, timeout, async_job_check_time_ms
         return json_call_ajax(_url, "narrative_job_mock.check_jobs",
             [params], 1, _callback, _errorCallback);
     };
+ 
+     this.check_jobs_since = function (params, _callback, _errorCallback) {
+        if (typeof params === 'function')
+            throw 'Argument params can not be a function';
+        if (_callback && typeof _callback !== 'function')
+            throw 'Argument _callback must be a function if defined';
+        if (_errorCallback && typeof _errorCallback !== 'function')
+            throw 'Argument _errorCallback must be a function if defined';
+        if (typeof arguments === 'function' && arguments.length > 1+2)
+            throw 'Too many arguments ('+arguments.length+' instead of '+(1+2)+')';
+        return json_call_ajax(_url, "narrative_job_mock.check_jobs_since",
+            [params], 1, _callback, _errorCallback);
+    };
+ 
+     this.wait_for_job_states = function (job_ids, timeout_ms, known_states, _callback, _errorCallback) {
+        if (typeof job_ids === 'function')
+            throw 'Argument job_ids can not be a function';
+        if (typeof timeout_ms === 'function')
+            throw 'Argument timeout_ms can not be a function';
+        if (typeof known_states === 'function')
+            throw 'Argument known_states can not be a function';
+        if (_callback && typeof _callback !== 'function')
+            throw 'Argument _callback must be a function if defined';
+        if (_errorCallback && typeof _errorCallback !== 'function')
+            throw 'Argument _errorCallback must be a function if defined';
+        if (typeof arguments === 'function' && arguments.length > 3+2)
+            throw 'Too many arguments ('+arguments.length+' instead of '+(3+2)+')';
+        return json_call_ajax(_url, "narrative_job_mock.wait_for_job_states",
+            [job_ids, timeout_ms, known_states], 1, _callback, _errorCallback);
+    };
   
     this.status = function (_callback, _errorCallback) {
         if (_callback && typeof _callback !== 'function')
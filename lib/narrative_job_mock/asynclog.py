@@ -0,0 +1,102 @@
+'''
+Moves log writes off the request thread: messages are queued and written by
+a background thread.
+'''
+import atexit
+import os
+import Queue
+import random
+import threading
+import zlib
+
+# syslog levels, as used by biokbase.log
+WARNING = 4
+INFO = 6
+
+POLICIES = ('block', 'drop')
+
+
+class AsyncLogWriter(object):
+    '''
+    Queues log_message calls and writes them to target, which should be a
+    biokbase.log.log, from a background thread. The thread drains up to
+    batch_size messages each time it wakes.
+
+    The queue holds at most queue_size messages. When it's full, the 'block'
+    policy makes the caller wait for room and 'drop' throws the message away;
+    the number dropped is logged as a warning once there's room again.
+
+    Info and debug messages are kept at info_sample_rate (0 to 1). The choice
+    is made per call_id, so a request's messages are kept or dropped together.
+    Warnings and errors are always kept.
+    '''
+
+    def __init__(self, target, queue_size=10000, batch_size=100, policy='block',
+                 info_sample_rate=1.0):
+        if policy not in POLICIES:
+            raise ValueError('log queue policy must be one of ' + ', '.join(POLICIES))
+        self._target = target
+        self._queue_size = queue_size
+        self._batch_size = batch_size
+        self._block = policy == 'block'
+        self._sample_rate = info_sample_rate
+        self._pid = None
+        self._dropped = 0
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def log_message(self, level, message, *args):
+        if level >= INFO and self._sample_rate < 1 and not self._sampled(args):
+            return
+        self._start()
+        try:
+            self._queue.put((level, message, args), self._block)
+        except Queue.Full:
+            with self._lock:
+                self._dropped += 1
+
+    def flush(self):
+        '''
+        Writes everything still queued in the calling thread, e.g. at exit when
+        the writer thread may already be gone.
+        '''
+        if self._pid == os.getpid():
+            self._write([], self._queue.qsize())
+
+    def _sampled(self, args):
+        # args end with the call id; keying on it keeps whole requests
+        call_id = args[-1] if args else None
+        if call_id is None:
+            return random.random() < self._sample_rate
+        return (zlib.crc32(str(call_id)) & 0xffff) < self._sample_rate * 0x10000
+
+    def _start(self):
+        # threads don't survive a fork, so each process starts its own
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = Queue.Queue(self._queue_size)
+                self._dropped = 0
+                writer = threading.Thread(target=self._run, name='AsyncLogWriter')
+                writer.daemon = True
+                writer.start()
+                self._pid = os.getpid()
+
+    def _run(self):
+        while True:
+            # wait for a message, then write whatever else is queued with it
+            self._write([self._queue.get()], self._batch_size - 1)
+
+    def _write(self, batch, count):
+        for _ in range(count):
+            try:
+                batch.append(self._queue.get_nowait())
+            except Queue.Empty:
+                break
+        for level, message, args in batch:
+            self._target.log_message(level, message, *args)
+        with self._lock:
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            self._target.log_message(WARNING, 'Dropped %d log messages' % dropped)
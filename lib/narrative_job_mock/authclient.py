@@ -5,51 +5,76 @@ A very basic KBase auth client for the Python server.
 
 @author: gaprice@lbl.gov
 '''
+import os as _os
 import time as _time
+import Queue as _Queue
 import requests as _requests
 import threading as _threading
 import hashlib
+from lrucache import LRUCache
+from singleflight import Flight
 
 
 class TokenCache(object):
-    ''' A basic cache for tokens. '''
+    '''
+    A basic cache for tokens. Tokens are kept, hashed, for _MAX_TIME_SEC after
+    they're added, and the least recently used ones are dropped past maxsize.
 
-    _MAX_TIME_SEC = 5 * 60  # 5 min
+    The cache is split into stripes, each an LRU cache with its own lock,
+    picked by the start of the token's hash, so threads looking up different
+    tokens rarely wait on each other. Token hashes are memoized in a bounded
+    dict that's read without a lock.
+    '''
 
-    _lock = _threading.RLock()
+    _MAX_TIME_SEC = 5 * 60  # 5 min
 
-    def __init__(self, maxsize=2000):
-        self._cache = {}
-        self._maxsize = maxsize
-        self._halfmax = maxsize / 2  # int division to round down
+    def __init__(self, maxsize=2000, stripes=8, digest_cache_size=4096):
+        per_stripe = max(1, (maxsize + stripes - 1) // stripes)
+        self._stripes = [LRUCache(maxsize=per_stripe, ttl=self._MAX_TIME_SEC)
+                         for _ in range(stripes)]
+        self._digests = dict()
+        self._max_digests = digest_cache_size
 
     def get_user(self, token):
-        token = hashlib.sha256(token).hexdigest()
-        with self._lock:
-            usertime = self._cache.get(token)
-        if not usertime:
-            return None
+        entry = self.get_entry(token)
+        return entry[0] if entry else None
 
-        user, intime = usertime
-        if _time.time() - intime > self._MAX_TIME_SEC:
+    def get_entry(self, token):
+        '''
+        Returns the user for token and how many seconds ago it was added, or
+        None if it isn't cached.
+        '''
+        digest = self._digest(token)
+        entry = self._stripe(digest).get(digest)
+        if entry is None:
             return None
-        return user
+        user, added = entry
+        return user, _time.time() - added
 
     def add_valid_token(self, token, user):
         if not token:
             raise ValueError('Must supply token')
         if not user:
             raise ValueError('Must supply user')
-        token = hashlib.sha256(token).hexdigest()
-        with self._lock:
-            self._cache[token] = [user, _time.time()]
-            if len(self._cache) > self._maxsize:
-                for i, (t, _) in enumerate(sorted(self._cache.items(),
-                                                  key=lambda (_, v): v[1])):
-                    if i <= self._halfmax:
-                        del self._cache[t]
-                    else:
-                        break
+        digest = self._digest(token)
+        self._stripe(digest).put(digest, (user, _time.time()))
+
+    def remove(self, token):
+        digest = self._digest(token)
+        self._stripe(digest).pop(digest)
+
+    def _digest(self, token):
+        digest = self._digests.get(token)
+        if digest is None:
+            digest = hashlib.sha256(token).hexdigest()
+            if len(self._digests) >= self._max_digests:
+                # single dict operations are atomic, so this is safe unlocked
+                self._digests.clear()
+            self._digests[token] = digest
+        return digest
+
+    def _stripe(self, digest):
+        return self._stripes[int(digest[:8], 16) % len(self._stripes)]
 
 
 class KBaseAuth(object):
@@ -58,23 +83,128 @@ class KBaseAuth(object):
     '''
 
     _LOGIN_URL = 'https://kbase.us/services/auth/api/legacy/KBase/Sessions/Login'
+    # the answers that mean the token itself is no good
+    _REJECTED_STATUSES = (401, 403)
 
-    def __init__(self, auth_url=None):
+    def __init__(self, auth_url=None, rejected_cache_size=1000, rejected_ttl=30,
+                 refresh_fraction=None, refresh_queue_size=1000):
         '''
-        Constructor
+        Constructor. Tokens the auth service rejects are remembered for
+        rejected_ttl seconds, up to rejected_cache_size of them.
+
+        If refresh_fraction is set, a cached token that's read after that
+        fraction of its time in the cache has passed is validated again in the
+        background, while the caller gets the cached user. Up to
+        refresh_queue_size tokens wait to be refreshed; more are skipped.
         '''
         self._authurl = auth_url
         if not self._authurl:
             self._authurl = self._LOGIN_URL
         self._cache = TokenCache()
+        # token hash -> the error the auth service rejected it with
+        self._rejected = LRUCache(maxsize=rejected_cache_size, ttl=rejected_ttl)
+        # token -> Flight of the validation in progress
+        self._validations = dict()
+        self._validations_lock = _threading.Lock()
+        self._stats = {'validations': 0, 'collapsed': 0, 'refreshes': 0,
+                       'refresh_failures': 0}
+        self._refresh_after = TokenCache._MAX_TIME_SEC * refresh_fraction \
+            if refresh_fraction else None
+        self._refresh_queue_size = refresh_queue_size
+        self._refresh_pid = None
+        # hashes of the tokens waiting for or being refreshed
+        self._refreshing = set()
 
     def get_user(self, token):
+        '''
+        Returns the user for token, from the cache or else the auth service.
+        Only one request per token goes to the auth service at a time; other
+        callers with the same token wait for its answer. Tokens it recently
+        rejected fail with the same error without asking it again.
+        '''
         if not token:
             raise ValueError('Must supply token')
-        user = self._cache.get_user(token)
-        if user:
+        entry = self._cache.get_entry(token)
+        if entry:
+            user, age = entry
+            if self._refresh_after is not None and age > self._refresh_after:
+                self._refresh_ahead(token)
             return user
+        rejection = self._rejected.get(self._cache._digest(token))
+        if rejection is not None:
+            raise ValueError(rejection)
+        return self._validate_once(token)
+
+    def _validate_once(self, token):
+        '''
+        Validates token, unless another thread already is, in which case
+        this waits for and returns its answer.
+        '''
+        with self._validations_lock:
+            validation = self._validations.get(token)
+            if validation is None:
+                validation = Flight()
+                self._validations[token] = validation
+                self._stats['validations'] += 1
+                leader = True
+            else:
+                self._stats['collapsed'] += 1
+                leader = False
+        if not leader:
+            return validation.wait()
+
+        try:
+            return validation.run(self._validate, token)
+        finally:
+            with self._validations_lock:
+                del self._validations[token]
+
+    def _refresh_ahead(self, token):
+        digest = self._cache._digest(token)
+        with self._validations_lock:
+            # threads don't survive a fork, so each process starts its own
+            if self._refresh_pid != _os.getpid():
+                self._refresh_queue = _Queue.Queue(self._refresh_queue_size)
+                self._refreshing = set()
+                refresher = _threading.Thread(target=self._refresh, name='KBaseAuthRefresh')
+                refresher.daemon = True
+                refresher.start()
+                self._refresh_pid = _os.getpid()
+            if digest in self._refreshing:
+                return
+            try:
+                self._refresh_queue.put_nowait(token)
+            except _Queue.Full:
+                return
+            self._refreshing.add(digest)
+
+    def _refresh(self):
+        while True:
+            token = self._refresh_queue.get()
+            digest = self._cache._digest(token)
+            try:
+                self._validate_once(token)
+                refreshed = True
+            except Exception:
+                refreshed = False
+                # a token the auth service now rejects shouldn't be served from
+                # the cache any more, but one it couldn't check still can be
+                if self._rejected.get(digest) is not None:
+                    self._cache.remove(token)
+            with self._validations_lock:
+                self._refreshing.discard(digest)
+                self._stats['refreshes' if refreshed else 'refresh_failures'] += 1
+
+    def stats(self):
+        '''
+        Counts the validations sent to the auth service, the callers that
+        waited on one already in progress instead, and background refreshes,
+        along with the stats of the rejected token cache.
+        '''
+        with self._validations_lock:
+            return dict(self._stats, rejected=self._rejected.stats())
 
+    def _validate(self, token):
         d = {'token': token, 'fields': 'user_id'}
         ret = _requests.post(self._authurl, data=d)
         if not ret.ok:
@@ -82,9 +212,13 @@ class KBaseAuth(object):
                 err = ret.json()
             except:
                 ret.raise_for_status()
-            raise ValueError('Error connecting to auth service: {} {}\n{}'
-                             .format(ret.status_code, ret.reason,
-                                     err['error']['message']))
+            message = 'Error connecting to auth service: {} {}\n{}'.format(
+                ret.status_code, ret.reason, err['error']['message'])
+            # only the auth service turning the token down is remembered, not
+            # it failing or throttling (e.g. 408, 429), so those aren't cached
+            if ret.status_code in self._REJECTED_STATUSES:
+                self._rejected.put(self._cache._digest(token), message)
+            raise ValueError(message)
 
         user = ret.json()['user_id']
         self._cache.add_valid_token(token, user)
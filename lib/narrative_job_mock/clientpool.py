@@ -0,0 +1,96 @@
+'''
+A registry of long lived NarrativeJobService clients, one per token, that
+share a single keep-alive HTTP connection pool.
+'''
+import cookielib as _cookielib
+import threading as _threading
+import requests as _requests
+from NarrativeJobService import baseclient as _baseclient
+from NarrativeJobService.NarrativeJobServiceClient import NarrativeJobService
+from NarrativeJobService.baseclient import BaseClient
+from lrucache import LRUCache
+
+
+class _NoCookies(_cookielib.DefaultCookiePolicy):
+    '''
+    Refuses all cookies, so a session shared by many users' tokens can't
+    carry one user's cookies into another's requests.
+    '''
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+class _SessionRouter(object):
+    '''
+    Takes the place of the requests module in the generated baseclient, so its
+    unmodified _call posts through the session of the _SessionClient making
+    the call on this thread, or plain requests.post for any other client.
+    Everything else is passed through to the requests module.
+    '''
+
+    def __init__(self):
+        self._local = _threading.local()
+
+    def post(self, *args, **kwargs):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            return _requests.post(*args, **kwargs)
+        return session.post(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(_requests, name)
+
+
+_router = _SessionRouter()
+_baseclient._requests = _router
+
+
+class _SessionClient(BaseClient):
+    '''
+    A BaseClient that sends its requests through a shared requests.Session,
+    so connections to the service are reused rather than reopened per call.
+    '''
+
+    def __init__(self, session, url, **kwargs):
+        super(_SessionClient, self).__init__(url, **kwargs)
+        self._session = session
+
+    def _call(self, url, method, params, context=None):
+        _router._local.session = self._session
+        try:
+            return super(_SessionClient, self)._call(url, method, params, context)
+        finally:
+            _router._local.session = None
+
+
+class NJSClientPool(object):
+    '''
+    Hands out NarrativeJobService clients keyed by token. Clients are kept in
+    an LRU cache with a time to live, and all of them share one connection
+    pool, so repeat pollers skip both client setup and the TCP/TLS handshake.
+    '''
+
+    def __init__(self, njs_url, maxsize=500, ttl=60 * 60, pool_size=10):
+        self._njs_url = njs_url
+        self._clients = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._session = _requests.Session()
+        self._session.cookies.set_policy(_NoCookies())
+        adapter = _requests.adapters.HTTPAdapter(pool_connections=pool_size,
+                                                 pool_maxsize=pool_size)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    def get_client(self, token):
+        njs = self._clients.get(token)
+        if njs is None:
+            njs = NarrativeJobService(url=self._njs_url, token=token)
+            njs._client = _SessionClient(self._session, self._njs_url, token=token)
+            self._clients.put(token, njs)
+        return njs
+
+    def stats(self):
+        return self._clients.stats()
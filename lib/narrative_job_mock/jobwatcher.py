@@ -0,0 +1,284 @@
+'''
+Long polling and event streams for job state changes. Requests waiting on
+jobs are held in the server, and one background thread polls NJS for all of
+them.
+'''
+import os
+import Queue
+import threading
+import time
+
+
+class _Waiter(object):
+    '''
+    One request waiting for any of its jobs to leave its known state.
+    '''
+    __slots__ = ('token', 'job_ids', 'known_states', 'done', 'result', 'error')
+
+    def __init__(self, token, job_ids, known_states):
+        self.token = token
+        self.job_ids = job_ids
+        self.known_states = known_states
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def changes(self, checked):
+        '''
+        Returns the states and errors for this waiter's jobs that differ from
+        what it knows, or None if nothing changed.
+        '''
+        states = checked.get('job_states') or {}
+        errors = checked.get('check_error') or {}
+        result = {'job_states': {}, 'check_error': {}, 'timed_out': 0}
+        for job_id in self.job_ids:
+            if job_id in errors:
+                result['check_error'][job_id] = errors[job_id]
+            elif job_id in states and \
+                    states[job_id].get('job_state') != self.known_states.get(job_id):
+                result['job_states'][job_id] = states[job_id]
+        if result['job_states'] or result['check_error']:
+            return result
+        return None
+
+    def update(self, checked):
+        '''
+        Called by the poll thread with each check. Returns True once the
+        waiter is done and should be dropped.
+        '''
+        self.result = self.changes(checked)
+        if self.result is None:
+            return False
+        self.done.set()
+        return True
+
+    def retrying(self, error, delay):
+        # long polls just keep waiting, up to their timeout
+        pass
+
+    def fail(self, error):
+        self.error = error
+        self.done.set()
+
+
+class Subscription(object):
+    '''
+    A stream of job state changes, read through events(). The first event
+    for each job is its current state, then one more is sent each time its
+    job_state changes. Jobs are dropped from the subscription once they're
+    finished or fail to check, and when all of them are the stream ends.
+    '''
+
+    def __init__(self, token, job_ids, is_terminal):
+        self.token = token
+        # the jobs still being watched
+        self.job_ids = list()
+        for job_id in job_ids:
+            if job_id not in self.job_ids:
+                self.job_ids.append(job_id)
+        self._is_terminal = is_terminal
+        self._known_states = dict()
+        self._queue = Queue.Queue()
+        self.closed = False
+
+    def events(self, keepalive=None):
+        '''
+        Yields (name, data) events until the stream ends. If nothing happens
+        for keepalive seconds, (None, None) is yielded so the caller can
+        keep the connection open.
+        '''
+        while True:
+            try:
+                event = self._queue.get(timeout=keepalive)
+            except Queue.Empty:
+                yield None, None
+                continue
+            if event is None:
+                return
+            yield event
+
+    def close(self):
+        ''' Stops the subscription; the poll thread drops it on its next pass. '''
+        self.closed = True
+
+    def update(self, checked):
+        if self.closed:
+            return True
+        states = checked.get('job_states') or {}
+        errors = checked.get('check_error') or {}
+        finished = list()
+        for job_id in self.job_ids:
+            if job_id in errors:
+                self._queue.put(('check_error', {'job_id': job_id, 'error': errors[job_id]}))
+                finished.append(job_id)
+            elif job_id in states:
+                state = states[job_id]
+                if state.get('job_state') != self._known_states.get(job_id):
+                    self._known_states[job_id] = state.get('job_state')
+                    self._queue.put(('job_state', state))
+                if self._is_terminal(state):
+                    finished.append(job_id)
+        self.job_ids = [job_id for job_id in self.job_ids if job_id not in finished]
+        if self.job_ids:
+            return False
+        self._queue.put(('end', {}))
+        self._queue.put(None)
+        return True
+
+    def retrying(self, error, delay):
+        self._queue.put(('poll_error', {'message': str(error), 'retry_in': delay}))
+
+    def fail(self, error):
+        self._queue.put(('error', {'message': str(error)}))
+        self._queue.put(None)
+
+
+class JobWatcher(object):
+    '''
+    Holds wait_for_job_states requests until one of their jobs changes state
+    or they time out, and feeds job event Subscriptions. A single thread per
+    process polls every poll_interval seconds, checking the jobs of all
+    waiters and subscriptions with the same token in one call to check,
+    which is called as check(token, job_ids) and should return a check_jobs
+    result. is_terminal tells whether a job state is final, which ends a
+    subscription's interest in the job. The thread stops when nobody is
+    waiting.
+
+    When a check fails, that token's jobs are checked again after twice the
+    delay of the last try, starting from poll_interval, and subscriptions
+    get a poll_error event. Only after max_failures checks in a row fail
+    are its waiters and subscriptions failed.
+    '''
+
+    def __init__(self, check, poll_interval=1.0, is_terminal=None, max_failures=5):
+        self._check = check
+        self._poll_interval = poll_interval
+        self._is_terminal = is_terminal or (lambda state: bool(state.get('finished')))
+        self._max_failures = max_failures
+        self._reset()
+        self._stats = {'waits': 0, 'changed': 0, 'timed_out': 0, 'polls': 0,
+                       'subscriptions': 0, 'poll_errors': 0}
+
+    def _reset(self):
+        # threads don't survive a fork, so each process starts over
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._waiters = list()
+        self._thread = None
+        # token -> (failures in a row, time of the next try), for failing checks
+        self._failures = dict()
+
+    def wait(self, token, job_ids, known_states, timeout):
+        '''
+        Waits up to timeout seconds for any job in job_ids to be in a state
+        other than the one in known_states, and returns the changed states
+        and any check errors. Jobs missing from known_states count as changed.
+        '''
+        self._stats['waits'] += 1
+        waiter = _Waiter(token, list(job_ids), known_states)
+        # the first check is made right away, so callers with stale states
+        # don't wait out a poll interval
+        result = waiter.changes(self._check(token, waiter.job_ids))
+        if result is None and timeout > 0:
+            self._add(waiter)
+            waiter.done.wait(timeout)
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            if waiter.error is not None:
+                raise waiter.error
+            result = waiter.result
+        if result is None:
+            self._stats['timed_out'] += 1
+            return {'job_states': {}, 'check_error': {}, 'timed_out': 1}
+        self._stats['changed'] += 1
+        return result
+
+    def subscribe(self, token, job_ids):
+        '''
+        Returns a Subscription to the state changes of the jobs in job_ids.
+        Their current states are checked right away, so they're the first
+        events.
+        '''
+        self._stats['subscriptions'] += 1
+        subscription = Subscription(token, job_ids, self._is_terminal)
+        if not subscription.update(self._check(token, subscription.job_ids)):
+            self._add(subscription)
+        return subscription
+
+    def stats(self):
+        return dict(self._stats, waiting=len(self._waiters))
+
+    def _add(self, waiter):
+        if self._pid != os.getpid():
+            self._reset()
+        with self._lock:
+            self._waiters.append(waiter)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='JobWatcher')
+                self._thread.daemon = True
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self._poll_interval)
+            try:
+                if not self._poll_all():
+                    return
+            except Exception:
+                # keep going: if this thread died, _add wouldn't start another,
+                # and every later wait would sit out its timeout
+                self._stats['poll_errors'] += 1
+
+    def _poll_all(self):
+        '''
+        Polls once for every token with waiters, except those backing off
+        after failures. Returns False, and lets the thread go, if there are
+        no waiters left.
+        '''
+        with self._lock:
+            if not self._waiters:
+                self._thread = None
+                return False
+            by_token = dict()
+            for waiter in self._waiters:
+                by_token.setdefault(waiter.token, list()).append(waiter)
+        now = time.time()
+        for token in list(self._failures):
+            if token not in by_token:
+                del self._failures[token]
+        for token, waiters in by_token.items():
+            if self._failures.get(token, (0, now))[1] <= now:
+                self._poll(token, waiters)
+        return True
+
+    def _poll(self, token, waiters):
+        job_ids = list()
+        for waiter in waiters:
+            job_ids.extend(job_id for job_id in waiter.job_ids if job_id not in job_ids)
+        self._stats['polls'] += 1
+        try:
+            checked = self._check(token, job_ids)
+        except Exception as e:
+            self._stats['poll_errors'] += 1
+            failures = self._failures.get(token, (0, None))[0] + 1
+            if failures >= self._max_failures:
+                self._failures.pop(token, None)
+                self._remove(waiters)
+                for waiter in waiters:
+                    waiter.fail(e)
+                return
+            delay = self._poll_interval * 2 ** failures
+            # less one poll_interval, which _run sleeps before the next try anyway
+            self._failures[token] = (failures, time.time() + delay - self._poll_interval)
+            for waiter in waiters:
+                waiter.retrying(e, delay)
+            return
+        self._failures.pop(token, None)
+        self._remove([waiter for waiter in waiters if waiter.update(checked)])
+
+    def _remove(self, waiters):
+        with self._lock:
+            for waiter in waiters:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
@@ -0,0 +1,209 @@
+'''
+Pluggable JSON codecs for the server, so requests can be parsed and
+responses encoded by a C accelerated library when one is installed.
+'''
+import json as _json
+import re as _re
+import uuid as _uuid
+
+
+class JSONFragment(object):
+    '''
+    A value together with its already encoded JSON. Codecs splice the encoded
+    JSON into their output rather than encoding the value again. To the rest
+    of the code it reads like the (dict) value it holds.
+    '''
+    __slots__ = ('value', 'encoded')
+
+    def __init__(self, value, encoded):
+        self.value = value
+        self.encoded = encoded
+
+    def __getitem__(self, key):
+        return self.value[key]
+
+    def __contains__(self, key):
+        return key in self.value
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __len__(self):
+        return len(self.value)
+
+    def get(self, key, default=None):
+        return self.value.get(key, default)
+
+    def keys(self):
+        return self.value.keys()
+
+    def items(self):
+        return self.value.items()
+
+    def toJSONable(self):
+        return self.value
+
+    def __json__(self):
+        # ujson writes out what this returns as is
+        return self.encoded
+
+
+class _Splicer(object):
+    '''
+    Swaps JSONFragments for placeholder strings while encoding, then swaps the
+    fragments' JSON in for the placeholders afterwards. Placeholders carry a
+    random key so they can't collide with real strings.
+    '''
+
+    def __init__(self, default):
+        self._default = default
+        self._fragments = list()
+        self._key = None
+
+    def default(self, obj):
+        if isinstance(obj, JSONFragment):
+            if self._key is None:
+                self._key = _uuid.uuid4().hex
+            self._fragments.append(obj.encoded)
+            return u'\x00%s:%d\x00' % (self._key, len(self._fragments) - 1)
+        return self._default(obj)
+
+    def splice(self, encoded):
+        if not self._fragments:
+            return encoded
+        placeholder = _re.compile(r'"\\u0000%s:(\d+)\\u0000"' % self._key)
+        return placeholder.sub(lambda m: self._fragments[int(m.group(1))], encoded)
+
+
+def _default(obj):
+    '''
+    Encodes the extra types the server supports: sets and toJSONable objects
+    (including JSONFragments, when they aren't spliced).
+    '''
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, 'toJSONable'):
+        return obj.toJSONable()
+    raise TypeError(repr(obj) + ' is not JSON serializable')
+
+
+class _JSONObjectEncoder(_json.JSONEncoder):
+
+    def default(self, obj):
+        try:
+            return _default(obj)
+        except TypeError:
+            return _json.JSONEncoder.default(self, obj)
+
+
+class StdlibCodec(object):
+    ''' The standard library json module. Always available. '''
+
+    name = 'json'
+
+    def __init__(self, cls=None):
+        self._cls = cls or _JSONObjectEncoder
+
+    def loads(self, data):
+        return _json.loads(data)
+
+    def dumps(self, obj):
+        encoder = self._cls()
+        splicer = _Splicer(encoder.default)
+        encoder.default = splicer.default
+        return splicer.splice(encoder.encode(obj))
+
+
+class SimplejsonCodec(object):
+    ''' simplejson, with its C speedups. Supports the extra types through default. '''
+
+    name = 'simplejson'
+
+    def __init__(self, cls=None):
+        import simplejson
+        self._simplejson = simplejson
+
+    def loads(self, data):
+        return self._simplejson.loads(data)
+
+    def dumps(self, obj):
+        splicer = _Splicer(_default)
+        return splicer.splice(self._simplejson.dumps(obj, default=splicer.default))
+
+
+class UJSONCodec(object):
+    '''
+    ujson. JSONFragments are spliced in through ujson's __json__ hook. It
+    can't encode the other extra types, so responses holding them are
+    encoded by the standard library instead.
+
+    ujson parses integers from 2**31 up as longs, where the standard library
+    gives ints, and can't parse integers past 64 bits at all; those requests
+    are parsed by the standard library instead.
+    '''
+
+    name = 'ujson'
+
+    def __init__(self, cls=None):
+        import ujson
+        self._ujson = ujson
+        self._fallback = StdlibCodec(cls)
+
+    def loads(self, data):
+        try:
+            return self._ujson.loads(data)
+        except ValueError:
+            # too big for ujson, or not JSON; the standard library tells which
+            return self._fallback.loads(data)
+
+    def dumps(self, obj):
+        try:
+            return self._ujson.dumps(obj)
+        except (TypeError, OverflowError):
+            return self._fallback.dumps(obj)
+
+
+class AutoCodec(object):
+    '''
+    Picks the fastest library for each direction: ujson parses when it's
+    installed, and the standard library's C encoder does all the encoding,
+    since neither simplejson nor ujson beats it at that here.
+    '''
+
+    name = 'auto'
+
+    def __init__(self, cls=None):
+        self._encoder = StdlibCodec(cls)
+        try:
+            self._parser = UJSONCodec(cls)
+        except ImportError:
+            self._parser = self._encoder
+
+    def loads(self, data):
+        return self._parser.loads(data)
+
+    def dumps(self, obj):
+        return self._encoder.dumps(obj)
+
+
+CODECS = {
+    'auto': AutoCodec,
+    'json': StdlibCodec,
+    'simplejson': SimplejsonCodec,
+    'ujson': UJSONCodec
+}
+
+
+def get_codec(name='auto', cls=None):
+    '''
+    Returns the named codec, one of 'json', 'simplejson', 'ujson' or 'auto'
+    for AutoCodec. If the named library isn't installed, the standard library
+    codec is returned. cls is the json.JSONEncoder subclass the standard
+    library codec encodes with.
+    '''
+    if name not in CODECS:
+        raise ValueError('Unknown JSON codec: ' + str(name))
+    try:
+        return CODECS[name](cls)
+    except ImportError:
+        return StdlibCodec(cls)
@@ -0,0 +1,77 @@
+'''
+Incremental JSON encoding for large JSON-RPC responses.
+'''
+import re
+import uuid
+from jsoncodec import JSONFragment
+
+
+class StreamEncoder(object):
+    '''
+    Encodes an object as a series of JSON chunks instead of one string.
+    Iterable toJSONable objects (such as a MockBatch) are walked lazily, one
+    element at a time, so peak memory doesn't grow with their size.
+    Everything else is encoded by the wrapped encoder, which should be a
+    json.JSONEncoder, in one call for each lazy element and one for the rest
+    of the response. JSONFragments are written out as their encoded JSON.
+    '''
+
+    def __init__(self, encoder, chunk_size=64 * 1024):
+        self._encoder = encoder
+        self._default = encoder.default
+        encoder.default = self._placeholder
+        self._chunk_size = chunk_size
+        # like jsoncodec's splicing, the lazy objects are swapped for
+        # placeholder strings while encoding, and written out in their place
+        self._key = uuid.uuid4().hex
+        self._pattern = re.compile(r'"\\u0000%s:(\d+)\\u0000"' % self._key)
+        self._lazy = list()
+
+    def iterencode(self, obj):
+        '''
+        Yields the JSON for obj in chunks of roughly chunk_size characters.
+        '''
+        buf = list()
+        size = 0
+        for part in self._iterencode(obj):
+            buf.append(part)
+            size += len(part)
+            if size >= self._chunk_size:
+                yield ''.join(buf)
+                buf = list()
+                size = 0
+        if buf:
+            yield ''.join(buf)
+
+    def _placeholder(self, obj):
+        if isinstance(obj, JSONFragment) or (hasattr(obj, 'toJSONable') and
+                                             hasattr(obj, '__iter__')):
+            self._lazy.append(obj)
+            return u'\x00%s:%d\x00' % (self._key, len(self._lazy) - 1)
+        return self._default(obj)
+
+    def _iterencode(self, obj):
+        encoded = self._encoder.encode(obj)
+        pos = 0
+        for match in self._pattern.finditer(encoded):
+            yield encoded[pos:match.start()]
+            index = int(match.group(1))
+            lazy, self._lazy[index] = self._lazy[index], None
+            if isinstance(lazy, JSONFragment):
+                yield lazy.encoded
+            else:
+                for part in self._iterencode_list(lazy):
+                    yield part
+            pos = match.end()
+        yield encoded[pos:]
+
+    def _iterencode_list(self, obj):
+        yield '['
+        first = True
+        for value in obj:
+            if not first:
+                yield self._encoder.item_separator
+            first = False
+            for part in self._iterencode(value):
+                yield part
+        yield ']'
@@ -0,0 +1,104 @@
+'''
+A small thread safe LRU cache with optional per-entry expiry, shared by the
+various caches in this module.
+'''
+import time as _time
+import threading as _threading
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    '''
+    A size bounded, least recently used cache. If ttl (in seconds) is given,
+    entries older than that are treated as missing and dropped on access.
+    Each put also drops up to expire_batch expired entries from the least
+    recently used end, so unused entries don't linger until they're pushed
+    out. Keeps hit/miss/eviction counters, available through stats().
+
+    By default maxsize counts entries. If sizeof is given, it's called on
+    each value put, and maxsize bounds the total of those sizes instead.
+    '''
+
+    def __init__(self, maxsize=1000, ttl=None, expire_batch=2, sizeof=None):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._expire_batch = expire_batch
+        self._sizeof = sizeof
+        self._size = 0
+        self._data = OrderedDict()
+        self._lock = _threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                self._misses += 1
+                return default
+            value, expires, size = entry
+            if expires is not None and _time.time() > expires:
+                self._size -= size
+                self._misses += 1
+                self._evictions += 1
+                return default
+            # re-inserting moves the key to the most recently used end
+            self._data[key] = entry
+            self._hits += 1
+            return value
+
+    def put(self, key, value):
+        now = _time.time()
+        expires = now + self._ttl if self._ttl else None
+        size = self._sizeof(value) if self._sizeof else 1
+        with self._lock:
+            self._discard(key)
+            self._data[key] = (value, expires, size)
+            self._size += size
+            while self._size > self._maxsize:
+                self._size -= self._data.popitem(last=False)[1][2]
+                self._evictions += 1
+            if self._ttl:
+                self._expire(now)
+
+    def _expire(self, now):
+        # only looks at the least recently used end, so this stays O(1)
+        for _ in range(self._expire_batch):
+            if not self._data:
+                return
+            oldest = next(iter(self._data))
+            if now <= self._data[oldest][1]:
+                return
+            self._discard(oldest)
+            self._evictions += 1
+
+    def _discard(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._size -= entry[2]
+        return entry
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._discard(key)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._data),
+                    'total_size': self._size,
+                    'maxsize': self._maxsize,
+                    'hits': self._hits,
+                    'misses': self._misses,
+                    'evictions': self._evictions}
@@ -137,6 +137,8 @@ JobState is a reference to a hash where the following keys are defined:
 	cancelled has a value which is a narrative_job_mock.boolean
 	canceled has a value which is a narrative_job_mock.boolean
 	sub_jobs has a value which is an UnspecifiedObject, which can hold any non-null object
+	sub_jobs_total has a value which is an int
+	sub_jobs_summary has a value which is a reference to a hash where the key is a string and the value is an int
 boolean is an int
 JsonRpcError is a reference to a hash where the following keys are defined:
 	name has a value which is a string
@@ -168,6 +170,8 @@ JobState is a reference to a hash where the following keys are defined:
 	cancelled has a value which is a narrative_job_mock.boolean
 	canceled has a value which is a narrative_job_mock.boolean
 	sub_jobs has a value which is an UnspecifiedObject, which can hold any non-null object
+	sub_jobs_total has a value which is an int
+	sub_jobs_summary has a value which is a reference to a hash where the key is a string and the value is an int
 boolean is an int
 JsonRpcError is a reference to a hash where the following keys are defined:
 	name has a value which is a string
@@ -250,6 +254,9 @@ $return is a narrative_job_mock.CheckJobsResults
 CheckJobsParams is a reference to a hash where the following keys are defined:
 	job_ids has a value which is a reference to a list where each element is a narrative_job_mock.job_id
 	with_job_params has a value which is a narrative_job_mock.boolean
+	sub_jobs_offset has a value which is an int
+	sub_jobs_limit has a value which is an int
+	sub_jobs_mode has a value which is a string
 job_id is a string
 boolean is an int
 CheckJobsResults is a reference to a hash where the following keys are defined:
@@ -271,6 +278,8 @@ JobState is a reference to a hash where the following keys are defined:
 	cancelled has a value which is a narrative_job_mock.boolean
 	canceled has a value which is a narrative_job_mock.boolean
 	sub_jobs has a value which is an UnspecifiedObject, which can hold any non-null object
+	sub_jobs_total has a value which is an int
+	sub_jobs_summary has a value which is a reference to a hash where the key is a string and the value is an int
 JsonRpcError is a reference to a hash where the following keys are defined:
 	name has a value which is a string
 	code has a value which is an int
@@ -307,6 +316,9 @@ $return is a narrative_job_mock.CheckJobsResults
 CheckJobsParams is a reference to a hash where the following keys are defined:
 	job_ids has a value which is a reference to a list where each element is a narrative_job_mock.job_id
 	with_job_params has a value which is a narrative_job_mock.boolean
+	sub_jobs_offset has a value which is an int
+	sub_jobs_limit has a value which is an int
+	sub_jobs_mode has a value which is a string
 job_id is a string
 boolean is an int
 CheckJobsResults is a reference to a hash where the following keys are defined:
@@ -328,6 +340,8 @@ JobState is a reference to a hash where the following keys are defined:
 	cancelled has a value which is a narrative_job_mock.boolean
 	canceled has a value which is a narrative_job_mock.boolean
 	sub_jobs has a value which is an UnspecifiedObject, which can hold any non-null object
+	sub_jobs_total has a value which is an int
+	sub_jobs_summary has a value which is a reference to a hash where the key is a string and the value is an int
 JsonRpcError is a reference to a hash where the following keys are defined:
 	name has a value which is a string
 	code has a value which is an int
@@ -410,6 +424,346 @@ wsref is a string
     }
 }
  
+
+
+=head2 check_jobs_since
+
+  $return = $obj->check_jobs_since($params)
+
+=over 4
+
+=item Parameter and return types
+
+=begin html
+
+<pre>
+$params is a narrative_job_mock.CheckJobsSinceParams
+$return is a narrative_job_mock.CheckJobsSinceResults
+CheckJobsSinceParams is a reference to a hash where the following keys are defined:
+	job_ids has a value which is a reference to a list where each element is a narrative_job_mock.job_id
+	cursor has a value which is a string
+	with_job_params has a value which is a narrative_job_mock.boolean
+	sub_jobs_offset has a value which is an int
+	sub_jobs_limit has a value which is an int
+	sub_jobs_mode has a value which is a string
+job_id is a string
+boolean is an int
+CheckJobsSinceResults is a reference to a hash where the following keys are defined:
+	job_states has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JobState
+	job_params has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.RunJobParams
+	check_error has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JsonRpcError
+	cursor has a value which is a string
+JobState is a reference to a hash where the following keys are defined:
+	job_id has a value which is a string
+	finished has a value which is a narrative_job_mock.boolean
+	ujs_url has a value which is a string
+	status has a value which is an UnspecifiedObject, which can hold any non-null object
+	result has a value which is an UnspecifiedObject, which can hold any non-null object
+	error has a value which is a narrative_job_mock.JsonRpcError
+	job_state has a value which is a string
+	position has a value which is an int
+	creation_time has a value which is an int
+	exec_start_time has a value which is an int
+	finish_time has a value which is an int
+	cancelled has a value which is a narrative_job_mock.boolean
+	canceled has a value which is a narrative_job_mock.boolean
+	sub_jobs has a value which is an UnspecifiedObject, which can hold any non-null object
+	sub_jobs_total has a value which is an int
+	sub_jobs_summary has a value which is a reference to a hash where the key is a string and the value is an int
+JsonRpcError is a reference to a hash where the following keys are defined:
+	name has a value which is a string
+	code has a value which is an int
+	message has a value which is a string
+	error has a value which is a string
+RunJobParams is a reference to a hash where the following keys are defined:
+	method has a value which is a string
+	params has a value which is a reference to a list where each element is an UnspecifiedObject, which can hold any non-null object
+	service_ver has a value which is a string
+	rpc_context has a value which is a narrative_job_mock.RpcContext
+	remote_url has a value which is a string
+	source_ws_objects has a value which is a reference to a list where each element is a narrative_job_mock.wsref
+	app_id has a value which is a string
+	meta has a value which is a reference to a hash where the key is a string and the value is a string
+	wsid has a value which is an int
+RpcContext is a reference to a hash where the following keys are defined:
+	call_stack has a value which is a reference to a list where each element is a narrative_job_mock.MethodCall
+	run_id has a value which is a string
+MethodCall is a reference to a hash where the following keys are defined:
+	time has a value which is a narrative_job_mock.timestamp
+	method has a value which is a string
+	job_id has a value which is a narrative_job_mock.job_id
+timestamp is a string
+wsref is a string
+
+</pre>
+
+=end html
+
+=begin text
+
+$params is a narrative_job_mock.CheckJobsSinceParams
+$return is a narrative_job_mock.CheckJobsSinceResults
+CheckJobsSinceParams is a reference to a hash where the following keys are defined:
+	job_ids has a value which is a reference to a list where each element is a narrative_job_mock.job_id
+	cursor has a value which is a string
+	with_job_params has a value which is a narrative_job_mock.boolean
+	sub_jobs_offset has a value which is an int
+	sub_jobs_limit has a value which is an int
+	sub_jobs_mode has a value which is a string
+job_id is a string
+boolean is an int
+CheckJobsSinceResults is a reference to a hash where the following keys are defined:
+	job_states has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JobState
+	job_params has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.RunJobParams
+	check_error has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JsonRpcError
+	cursor has a value which is a string
+JobState is a reference to a hash where the following keys are defined:
+	job_id has a value which is a string
+	finished has a value which is a narrative_job_mock.boolean
+	ujs_url has a value which is a string
+	status has a value which is an UnspecifiedObject, which can hold any non-null object
+	result has a value which is an UnspecifiedObject, which can hold any non-null object
+	error has a value which is a narrative_job_mock.JsonRpcError
+	job_state has a value which is a string
+	position has a value which is an int
+	creation_time has a value which is an int
+	exec_start_time has a value which is an int
+	finish_time has a value which is an int
+	cancelled has a value which is a narrative_job_mock.boolean
+	canceled has a value which is a narrative_job_mock.boolean
+	sub_jobs has a value which is an UnspecifiedObject, which can hold any non-null object
+	sub_jobs_total has a value which is an int
+	sub_jobs_summary has a value which is a reference to a hash where the key is a string and the value is an int
+JsonRpcError is a reference to a hash where the following keys are defined:
+	name has a value which is a string
+	code has a value which is an int
+	message has a value which is a string
+	error has a value which is a string
+RunJobParams is a reference to a hash where the following keys are defined:
+	method has a value which is a string
+	params has a value which is a reference to a list where each element is an UnspecifiedObject, which can hold any non-null object
+	service_ver has a value which is a string
+	rpc_context has a value which is a narrative_job_mock.RpcContext
+	remote_url has a value which is a string
+	source_ws_objects has a value which is a reference to a list where each element is a narrative_job_mock.wsref
+	app_id has a value which is a string
+	meta has a value which is a reference to a hash where the key is a string and the value is a string
+	wsid has a value which is an int
+RpcContext is a reference to a hash where the following keys are defined:
+	call_stack has a value which is a reference to a list where each element is a narrative_job_mock.MethodCall
+	run_id has a value which is a string
+MethodCall is a reference to a hash where the following keys are defined:
+	time has a value which is a narrative_job_mock.timestamp
+	method has a value which is a string
+	job_id has a value which is a narrative_job_mock.job_id
+timestamp is a string
+wsref is a string
+
+
+=end text
+
+=item Description
+
+Like check_jobs, but only returns the jobs whose state changed since
+the given cursor, along with a new cursor.
+
+=back
+
+=cut
+
+ sub check_jobs_since
+{
+    my($self, @args) = @_;
+
+# Authentication: required
+
+    if ((my $n = @args) != 1)
+    {
+	Bio::KBase::Exceptions::ArgumentValidationError->throw(error =>
+							       "Invalid argument count for function check_jobs_since (received $n, expecting 1)");
+    }
+    {
+	my($params) = @args;
+
+	my @_bad_arguments;
+        (ref($params) eq 'HASH') or push(@_bad_arguments, "Invalid type for argument 1 \"params\" (value was \"$params\")");
+        if (@_bad_arguments) {
+	    my $msg = "Invalid arguments passed to check_jobs_since:\n" . join("", map { "\t$_\n" } @_bad_arguments);
+	    Bio::KBase::Exceptions::ArgumentValidationError->throw(error => $msg,
+								   method_name => 'check_jobs_since');
+	}
+    }
+
+    my $url = $self->{url};
+    my $result = $self->{client}->call($url, $self->{headers}, {
+	    method => "narrative_job_mock.check_jobs_since",
+	    params => \@args,
+    });
+    if ($result) {
+	if ($result->is_error) {
+	    Bio::KBase::Exceptions::JSONRPC->throw(error => $result->error_message,
+					       code => $result->content->{error}->{code},
+					       method_name => 'check_jobs_since',
+					       data => $result->content->{error}->{error} # JSON::RPC::ReturnObject only supports JSONRPC 1.1 or 1.O
+					      );
+	} else {
+	    return wantarray ? @{$result->result} : $result->result->[0];
+	}
+    } else {
+        Bio::KBase::Exceptions::HTTP->throw(error => "Error invoking method check_jobs_since",
+					    status_line => $self->{client}->status_line,
+					    method_name => 'check_jobs_since',
+				       );
+    }
+}
+ 
+
+
+=head2 wait_for_job_states
+
+  $results = $obj->wait_for_job_states($job_ids, $timeout_ms, $known_states)
+
+=over 4
+
+=item Parameter and return types
+
+=begin html
+
+<pre>
+$job_ids is a reference to a list where each element is a narrative_job_mock.job_id
+$timeout_ms is an int
+$known_states is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a string
+$results is a narrative_job_mock.WaitForJobStatesResults
+job_id is a string
+WaitForJobStatesResults is a reference to a hash where the following keys are defined:
+	job_states has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JobState
+	check_error has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JsonRpcError
+	timed_out has a value which is a narrative_job_mock.boolean
+JobState is a reference to a hash where the following keys are defined:
+	job_id has a value which is a string
+	finished has a value which is a narrative_job_mock.boolean
+	ujs_url has a value which is a string
+	status has a value which is an UnspecifiedObject, which can hold any non-null object
+	result has a value which is an UnspecifiedObject, which can hold any non-null object
+	error has a value which is a narrative_job_mock.JsonRpcError
+	job_state has a value which is a string
+	position has a value which is an int
+	creation_time has a value which is an int
+	exec_start_time has a value which is an int
+	finish_time has a value which is an int
+	cancelled has a value which is a narrative_job_mock.boolean
+	canceled has a value which is a narrative_job_mock.boolean
+	sub_jobs has a value which is an UnspecifiedObject, which can hold any non-null object
+	sub_jobs_total has a value which is an int
+	sub_jobs_summary has a value which is a reference to a hash where the key is a string and the value is an int
+boolean is an int
+JsonRpcError is a reference to a hash where the following keys are defined:
+	name has a value which is a string
+	code has a value which is an int
+	message has a value which is a string
+	error has a value which is a string
+
+</pre>
+
+=end html
+
+=begin text
+
+$job_ids is a reference to a list where each element is a narrative_job_mock.job_id
+$timeout_ms is an int
+$known_states is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a string
+$results is a narrative_job_mock.WaitForJobStatesResults
+job_id is a string
+WaitForJobStatesResults is a reference to a hash where the following keys are defined:
+	job_states has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JobState
+	check_error has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JsonRpcError
+	timed_out has a value which is a narrative_job_mock.boolean
+JobState is a reference to a hash where the following keys are defined:
+	job_id has a value which is a string
+	finished has a value which is a narrative_job_mock.boolean
+	ujs_url has a value which is a string
+	status has a value which is an UnspecifiedObject, which can hold any non-null object
+	result has a value which is an UnspecifiedObject, which can hold any non-null object
+	error has a value which is a narrative_job_mock.JsonRpcError
+	job_state has a value which is a string
+	position has a value which is an int
+	creation_time has a value which is an int
+	exec_start_time has a value which is an int
+	finish_time has a value which is an int
+	cancelled has a value which is a narrative_job_mock.boolean
+	canceled has a value which is a narrative_job_mock.boolean
+	sub_jobs has a value which is an UnspecifiedObject, which can hold any non-null object
+	sub_jobs_total has a value which is an int
+	sub_jobs_summary has a value which is a reference to a hash where the key is a string and the value is an int
+boolean is an int
+JsonRpcError is a reference to a hash where the following keys are defined:
+	name has a value which is a string
+	code has a value which is an int
+	message has a value which is a string
+	error has a value which is a string
+
+
+=end text
+
+=item Description
+
+Waits for any of the given jobs to leave the state the caller knows it
+to be in, or for timeout_ms milliseconds to pass, whichever is first.
+known_states maps job ids to their last known job_state; jobs not in it
+count as changed. The timeout is capped by the server.
+
+=back
+
+=cut
+
+ sub wait_for_job_states
+{
+    my($self, @args) = @_;
+
+# Authentication: required
+
+    if ((my $n = @args) != 3)
+    {
+	Bio::KBase::Exceptions::ArgumentValidationError->throw(error =>
+							       "Invalid argument count for function wait_for_job_states (received $n, expecting 3)");
+    }
+    {
+	my($job_ids, $timeout_ms, $known_states) = @args;
+
+	my @_bad_arguments;
+        (ref($job_ids) eq 'ARRAY') or push(@_bad_arguments, "Invalid type for argument 1 \"job_ids\" (value was \"$job_ids\")");
+        (!ref($timeout_ms)) or push(@_bad_arguments, "Invalid type for argument 2 \"timeout_ms\" (value was \"$timeout_ms\")");
+        (ref($known_states) eq 'HASH') or push(@_bad_arguments, "Invalid type for argument 3 \"known_states\" (value was \"$known_states\")");
+        if (@_bad_arguments) {
+	    my $msg = "Invalid arguments passed to wait_for_job_states:\n" . join("", map { "\t$_\n" } @_bad_arguments);
+	    Bio::KBase::Exceptions::ArgumentValidationError->throw(error => $msg,
+								   method_name => 'wait_for_job_states');
+	}
+    }
+
+    my $url = $self->{url};
+    my $result = $self->{client}->call($url, $self->{headers}, {
+	    method => "narrative_job_mock.wait_for_job_states",
+	    params => \@args,
+    });
+    if ($result) {
+	if ($result->is_error) {
+	    Bio::KBase::Exceptions::JSONRPC->throw(error => $result->error_message,
+					       code => $result->content->{error}->{code},
+					       method_name => 'wait_for_job_states',
+					       data => $result->content->{error}->{error} # JSON::RPC::ReturnObject only supports JSONRPC 1.1 or 1.O
+					      );
+	} else {
+	    return wantarray ? @{$result->result} : $result->result->[0];
+	}
+    } else {
+        Bio::KBase::Exceptions::HTTP->throw(error => "Error invoking method wait_for_job_states",
+					    status_line => $self->{client}->status_line,
+					    method_name => 'wait_for_job_states',
+				       );
+    }
+}
+ 
   
 sub status
 {
@@ -852,6 +1206,10 @@ creation_time, exec_start_time and finish_time - time moments of submission, exe
     start and finish events in milliseconds since Unix Epoch,
 canceled - whether the job is canceled or not.
 cancelled - Deprecated field, please use 'canceled' field instead.
+sub_jobs - for batch jobs, the states of the child jobs in the requested window;
+sub_jobs_total - for batch jobs, the total number of child jobs;
+sub_jobs_summary - for batch jobs checked in 'summary' mode, the number
+    of child jobs in each state.
 
 
 =item Definition
@@ -874,6 +1232,8 @@ finish_time has a value which is an int
 cancelled has a value which is a narrative_job_mock.boolean
 canceled has a value which is a narrative_job_mock.boolean
 sub_jobs has a value which is an UnspecifiedObject, which can hold any non-null object
+sub_jobs_total has a value which is an int
+sub_jobs_summary has a value which is a reference to a hash where the key is a string and the value is an int
 
 </pre>
 
@@ -896,6 +1256,8 @@ finish_time has a value which is an int
 cancelled has a value which is a narrative_job_mock.boolean
 canceled has a value which is a narrative_job_mock.boolean
 sub_jobs has a value which is an UnspecifiedObject, which can hold any non-null object
+sub_jobs_total has a value which is an int
+sub_jobs_summary has a value which is a reference to a hash where the key is a string and the value is an int
 
 
 =end text
@@ -910,6 +1272,19 @@ sub_jobs has a value which is an UnspecifiedObject, which can hold any non-null
 
 
 
+=item Description
+
+job_ids - ids of jobs to check;
+with_job_params - if true, also return the parameters of the jobs;
+sub_jobs_offset, sub_jobs_limit - for batch jobs, only return the child
+    jobs in this window, starting at sub_jobs_offset (default 0) and
+    returning at most sub_jobs_limit of them (default all);
+sub_jobs_mode - how to report the child jobs of batch jobs. 'full'
+    (the default) returns them in sub_jobs, 'summary' only returns
+    the number in each state in sub_jobs_summary, and 'none' returns
+    neither.
+
+
 =item Definition
 
 =begin html
@@ -918,6 +1293,9 @@ sub_jobs has a value which is an UnspecifiedObject, which can hold any non-null
 a reference to a hash where the following keys are defined:
 job_ids has a value which is a reference to a list where each element is a narrative_job_mock.job_id
 with_job_params has a value which is a narrative_job_mock.boolean
+sub_jobs_offset has a value which is an int
+sub_jobs_limit has a value which is an int
+sub_jobs_mode has a value which is a string
 
 </pre>
 
@@ -928,6 +1306,9 @@ with_job_params has a value which is a narrative_job_mock.boolean
 a reference to a hash where the following keys are defined:
 job_ids has a value which is a reference to a list where each element is a narrative_job_mock.job_id
 with_job_params has a value which is a narrative_job_mock.boolean
+sub_jobs_offset has a value which is an int
+sub_jobs_limit has a value which is an int
+sub_jobs_mode has a value which is a string
 
 
 =end text
@@ -977,6 +1358,141 @@ check_error has a value which is a reference to a hash where the key is a narrat
 
 
 
+=head2 CheckJobsSinceParams
+
+=over 4
+
+
+
+=item Description
+
+job_ids - ids of jobs to check;
+cursor - the cursor returned by the last call to check_jobs_since for
+    these jobs, or empty to get the states of all of them;
+with_job_params, sub_jobs_offset, sub_jobs_limit, sub_jobs_mode - as in
+    CheckJobsParams. Changing these makes the cursor start over.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+job_ids has a value which is a reference to a list where each element is a narrative_job_mock.job_id
+cursor has a value which is a string
+with_job_params has a value which is a narrative_job_mock.boolean
+sub_jobs_offset has a value which is an int
+sub_jobs_limit has a value which is an int
+sub_jobs_mode has a value which is a string
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+job_ids has a value which is a reference to a list where each element is a narrative_job_mock.job_id
+cursor has a value which is a string
+with_job_params has a value which is a narrative_job_mock.boolean
+sub_jobs_offset has a value which is an int
+sub_jobs_limit has a value which is an int
+sub_jobs_mode has a value which is a string
+
+
+=end text
+
+=back
+
+
+
+=head2 CheckJobsSinceResults
+
+=over 4
+
+
+
+=item Description
+
+job_states - states of jobs that changed since the cursor was issued,
+job_params - parameters of those jobs,
+check_error - this map includes info about errors happening during job checking,
+cursor - pass this to the next call to only get the jobs that change after this one.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+job_states has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JobState
+job_params has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.RunJobParams
+check_error has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JsonRpcError
+cursor has a value which is a string
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+job_states has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JobState
+job_params has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.RunJobParams
+check_error has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JsonRpcError
+cursor has a value which is a string
+
+
+=end text
+
+=back
+
+
+
+=head2 WaitForJobStatesResults
+
+=over 4
+
+
+
+=item Description
+
+job_states - states of the jobs that are no longer in their known
+    state, without sub_jobs;
+check_error - errors that happened while checking jobs;
+timed_out - true if no job changed before the timeout.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+job_states has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JobState
+check_error has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JsonRpcError
+timed_out has a value which is a narrative_job_mock.boolean
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+job_states has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JobState
+check_error has a value which is a reference to a hash where the key is a narrative_job_mock.job_id and the value is a narrative_job_mock.JsonRpcError
+timed_out has a value which is a narrative_job_mock.boolean
+
+
+=end text
+
+=back
+
+
+
 =cut
 
 package narrative_job_mock::narrative_job_mockClient::RpcClient;
@@ -51,19 +51,24 @@ class narrative_job_mock(object):
            exec_start_time and finish_time - time moments of submission,
            execution start and finish events in milliseconds since Unix
            Epoch, canceled - whether the job is canceled or not. cancelled -
-           Deprecated field, please use 'canceled' field instead.) ->
-           structure: parameter "job_id" of String, parameter "finished" of
-           type "boolean" (@range [0,1]), parameter "ujs_url" of String,
-           parameter "status" of unspecified object, parameter "result" of
-           unspecified object, parameter "error" of type "JsonRpcError"
-           (Error block of JSON RPC response) -> structure: parameter "name"
-           of String, parameter "code" of Long, parameter "message" of
-           String, parameter "error" of String, parameter "job_state" of
-           String, parameter "position" of Long, parameter "creation_time" of
-           Long, parameter "exec_start_time" of Long, parameter "finish_time"
-           of Long, parameter "cancelled" of type "boolean" (@range [0,1]),
-           parameter "canceled" of type "boolean" (@range [0,1]), parameter
-           "sub_jobs" of unspecified object
+           Deprecated field, please use 'canceled' field instead. sub_jobs -
+           for batch jobs, the states of the child jobs in the requested
+           window; sub_jobs_total - for batch jobs, the total number of child
+           jobs; sub_jobs_summary - for batch jobs checked in 'summary' mode,
+           the number of child jobs in each state.) -> structure: parameter
+           "job_id" of String, parameter "finished" of type "boolean" (@range
+           [0,1]), parameter "ujs_url" of String, parameter "status" of
+           unspecified object, parameter "result" of unspecified object,
+           parameter "error" of type "JsonRpcError" (Error block of JSON RPC
+           response) -> structure: parameter "name" of String, parameter
+           "code" of Long, parameter "message" of String, parameter "error"
+           of String, parameter "job_state" of String, parameter "position"
+           of Long, parameter "creation_time" of Long, parameter
+           "exec_start_time" of Long, parameter "finish_time" of Long,
+           parameter "cancelled" of type "boolean" (@range [0,1]), parameter
+           "canceled" of type "boolean" (@range [0,1]), parameter "sub_jobs"
+           of unspecified object, parameter "sub_jobs_total" of Long,
+           parameter "sub_jobs_summary" of mapping from String to Long
         """
         return self._client.call_method(
             'narrative_job_mock.check_job',
@@ -71,9 +76,19 @@ class narrative_job_mock(object):
 
     def check_jobs(self, params, context=None):
         """
-        :param params: instance of type "CheckJobsParams" -> structure:
+        :param params: instance of type "CheckJobsParams" (job_ids - ids of
+           jobs to check; with_job_params - if true, also return the
+           parameters of the jobs; sub_jobs_offset, sub_jobs_limit - for
+           batch jobs, only return the child jobs in this window, starting at
+           sub_jobs_offset (default 0) and returning at most sub_jobs_limit
+           of them (default all); sub_jobs_mode - how to report the child
+           jobs of batch jobs. 'full' (the default) returns them in sub_jobs,
+           'summary' only returns the number in each state in
+           sub_jobs_summary, and 'none' returns neither.) -> structure:
            parameter "job_ids" of list of type "job_id" (A job id.),
-           parameter "with_job_params" of type "boolean" (@range [0,1])
+           parameter "with_job_params" of type "boolean" (@range [0,1]),
+           parameter "sub_jobs_offset" of Long, parameter "sub_jobs_limit" of
+           Long, parameter "sub_jobs_mode" of String
         :returns: instance of type "CheckJobsResults" (job_states - states of
            jobs, job_params - parameters of jobs, check_error - this map
            includes info about errors happening during job checking.) ->
@@ -92,71 +107,239 @@ class narrative_job_mock(object):
            exec_start_time and finish_time - time moments of submission,
            execution start and finish events in milliseconds since Unix
            Epoch, canceled - whether the job is canceled or not. cancelled -
-           Deprecated field, please use 'canceled' field instead.) ->
-           structure: parameter "job_id" of String, parameter "finished" of
-           type "boolean" (@range [0,1]), parameter "ujs_url" of String,
-           parameter "status" of unspecified object, parameter "result" of
-           unspecified object, parameter "error" of type "JsonRpcError"
-           (Error block of JSON RPC response) -> structure: parameter "name"
-           of String, parameter "code" of Long, parameter "message" of
-           String, parameter "error" of String, parameter "job_state" of
-           String, parameter "position" of Long, parameter "creation_time" of
-           Long, parameter "exec_start_time" of Long, parameter "finish_time"
-           of Long, parameter "cancelled" of type "boolean" (@range [0,1]),
-           parameter "canceled" of type "boolean" (@range [0,1]), parameter
-           "sub_jobs" of unspecified object, parameter "job_params" of
-           mapping from type "job_id" (A job id.) to type "RunJobParams"
-           (method - service defined in standard JSON RPC way, typically it's
-           module name from spec-file followed by '.' and name of funcdef
-           from spec-file corresponding to running method (e.g.
-           'KBaseTrees.construct_species_tree' from trees service); params -
-           the parameters of the method that performed this call; Optional
-           parameters: service_ver - specific version of deployed service,
-           last version is used if this parameter is not defined rpc_context
-           - context of current method call including nested call history
-           remote_url - run remote service call instead of local command line
-           execution. source_ws_objects - denotes the workspace objects that
-           will serve as a source of data when running the SDK method. These
-           references will be added to the autogenerated provenance. app_id -
-           the id of the Narrative application running this job (e.g.
-           repo/name) mapping<string, string> meta - user defined metadata to
-           associate with the job. This data is passed to the User and Job
-           State (UJS) service. wsid - a workspace id to associate with the
-           job. This is passed to the UJS service, which will share the job
-           based on the permissions of the workspace rather than UJS ACLs.)
-           -> structure: parameter "method" of String, parameter "params" of
-           list of unspecified object, parameter "service_ver" of String,
-           parameter "rpc_context" of type "RpcContext" (call_stack -
-           upstream calls details including nested service calls and parent
-           jobs where calls are listed in order from outer to inner.) ->
-           structure: parameter "call_stack" of list of type "MethodCall"
-           (time - the time the call was started; method - service defined in
-           standard JSON RPC way, typically it's module name from spec-file
-           followed by '.' and name of funcdef from spec-file corresponding
-           to running method (e.g. 'KBaseTrees.construct_species_tree' from
-           trees service); job_id - job id if method is asynchronous
-           (optional field).) -> structure: parameter "time" of type
-           "timestamp" (A time in the format YYYY-MM-DDThh:mm:ssZ, where Z is
-           either the character Z (representing the UTC timezone) or the
-           difference in time to UTC in the format +/-HHMM, eg:
-           2012-12-17T23:24:06-0500 (EST time) 2013-04-03T08:56:32+0000 (UTC
-           time) 2013-04-03T08:56:32Z (UTC time)), parameter "method" of
-           String, parameter "job_id" of type "job_id" (A job id.), parameter
-           "run_id" of String, parameter "remote_url" of String, parameter
-           "source_ws_objects" of list of type "wsref" (A workspace object
-           reference of the form X/Y/Z, where X is the workspace name or id,
-           Y is the object name or id, Z is the version, which is optional.),
-           parameter "app_id" of String, parameter "meta" of mapping from
-           String to String, parameter "wsid" of Long, parameter
-           "check_error" of mapping from type "job_id" (A job id.) to type
-           "JsonRpcError" (Error block of JSON RPC response) -> structure:
-           parameter "name" of String, parameter "code" of Long, parameter
-           "message" of String, parameter "error" of String
+           Deprecated field, please use 'canceled' field instead. sub_jobs -
+           for batch jobs, the states of the child jobs in the requested
+           window; sub_jobs_total - for batch jobs, the total number of child
+           jobs; sub_jobs_summary - for batch jobs checked in 'summary' mode,
+           the number of child jobs in each state.) -> structure: parameter
+           "job_id" of String, parameter "finished" of type "boolean" (@range
+           [0,1]), parameter "ujs_url" of String, parameter "status" of
+           unspecified object, parameter "result" of unspecified object,
+           parameter "error" of type "JsonRpcError" (Error block of JSON RPC
+           response) -> structure: parameter "name" of String, parameter
+           "code" of Long, parameter "message" of String, parameter "error"
+           of String, parameter "job_state" of String, parameter "position"
+           of Long, parameter "creation_time" of Long, parameter
+           "exec_start_time" of Long, parameter "finish_time" of Long,
+           parameter "cancelled" of type "boolean" (@range [0,1]), parameter
+           "canceled" of type "boolean" (@range [0,1]), parameter "sub_jobs"
+           of unspecified object, parameter "sub_jobs_total" of Long,
+           parameter "sub_jobs_summary" of mapping from String to Long,
+           parameter "job_params" of mapping from type "job_id" (A job id.)
+           to type "RunJobParams" (method - service defined in standard JSON
+           RPC way, typically it's module name from spec-file followed by '.'
+           and name of funcdef from spec-file corresponding to running method
+           (e.g. 'KBaseTrees.construct_species_tree' from trees service);
+           params - the parameters of the method that performed this call;
+           Optional parameters: service_ver - specific version of deployed
+           service, last version is used if this parameter is not defined
+           rpc_context - context of current method call including nested call
+           history remote_url - run remote service call instead of local
+           command line execution. source_ws_objects - denotes the workspace
+           objects that will serve as a source of data when running the SDK
+           method. These references will be added to the autogenerated
+           provenance. app_id - the id of the Narrative application running
+           this job (e.g. repo/name) mapping<string, string> meta - user
+           defined metadata to associate with the job. This data is passed to
+           the User and Job State (UJS) service. wsid - a workspace id to
+           associate with the job. This is passed to the UJS service, which
+           will share the job based on the permissions of the workspace
+           rather than UJS ACLs.) -> structure: parameter "method" of String,
+           parameter "params" of list of unspecified object, parameter
+           "service_ver" of String, parameter "rpc_context" of type
+           "RpcContext" (call_stack - upstream calls details including nested
+           service calls and parent jobs where calls are listed in order from
+           outer to inner.) -> structure: parameter "call_stack" of list of
+           type "MethodCall" (time - the time the call was started; method -
+           service defined in standard JSON RPC way, typically it's module
+           name from spec-file followed by '.' and name of funcdef from
+           spec-file corresponding to running method (e.g.
+           'KBaseTrees.construct_species_tree' from trees service); job_id -
+           job id if method is asynchronous (optional field).) -> structure:
+           parameter "time" of type "timestamp" (A time in the format
+           YYYY-MM-DDThh:mm:ssZ, where Z is either the character Z
+           (representing the UTC timezone) or the difference in time to UTC
+           in the format +/-HHMM, eg: 2012-12-17T23:24:06-0500 (EST time)
+           2013-04-03T08:56:32+0000 (UTC time) 2013-04-03T08:56:32Z (UTC
+           time)), parameter "method" of String, parameter "job_id" of type
+           "job_id" (A job id.), parameter "run_id" of String, parameter
+           "remote_url" of String, parameter "source_ws_objects" of list of
+           type "wsref" (A workspace object reference of the form X/Y/Z,
+           where X is the workspace name or id, Y is the object name or id, Z
+           is the version, which is optional.), parameter "app_id" of String,
+           parameter "meta" of mapping from String to String, parameter
+           "wsid" of Long, parameter "check_error" of mapping from type
+           "job_id" (A job id.) to type "JsonRpcError" (Error block of JSON
+           RPC response) -> structure: parameter "name" of String, parameter
+           "code" of Long, parameter "message" of String, parameter "error"
+           of String
         """
         return self._client.call_method(
             'narrative_job_mock.check_jobs',
             [params], self._service_ver, context)
 
+    def check_jobs_since(self, params, context=None):
+        """
+        Like check_jobs, but only returns the jobs whose state changed since
+        the given cursor, along with a new cursor.
+        :param params: instance of type "CheckJobsSinceParams" (job_ids - ids
+           of jobs to check; cursor - the cursor returned by the last call to
+           check_jobs_since for these jobs, or empty to get the states of all
+           of them; with_job_params, sub_jobs_offset, sub_jobs_limit,
+           sub_jobs_mode - as in CheckJobsParams. Changing these makes the
+           cursor start over.) -> structure: parameter "job_ids" of list of
+           type "job_id" (A job id.), parameter "cursor" of String, parameter
+           "with_job_params" of type "boolean" (@range [0,1]), parameter
+           "sub_jobs_offset" of Long, parameter "sub_jobs_limit" of Long,
+           parameter "sub_jobs_mode" of String
+        :returns: instance of type "CheckJobsSinceResults" (job_states -
+           states of jobs that changed since the cursor was issued,
+           job_params - parameters of those jobs, check_error - this map
+           includes info about errors happening during job checking, cursor -
+           pass this to the next call to only get the jobs that change after
+           this one.) -> structure: parameter "job_states" of mapping from
+           type "job_id" (A job id.) to type "JobState" (job_id - id of job
+           running method finished - indicates whether job is done (including
+           error/cancel cases) or not, if the value is true then either of
+           'returned_data' or 'detailed_error' should be defined; ujs_url -
+           url of UserAndJobState service used by job service status - tuple
+           returned by UserAndJobState.get_job_status method result - keeps
+           exact copy of what original server method puts in result block of
+           JSON RPC response; error - keeps exact copy of what original
+           server method puts in error block of JSON RPC response; job_state
+           - 'queued', 'in-progress', 'completed', or 'suspend'; position -
+           position of the job in execution waiting queue; creation_time,
+           exec_start_time and finish_time - time moments of submission,
+           execution start and finish events in milliseconds since Unix
+           Epoch, canceled - whether the job is canceled or not. cancelled -
+           Deprecated field, please use 'canceled' field instead. sub_jobs -
+           for batch jobs, the states of the child jobs in the requested
+           window; sub_jobs_total - for batch jobs, the total number of child
+           jobs; sub_jobs_summary - for batch jobs checked in 'summary' mode,
+           the number of child jobs in each state.) -> structure: parameter
+           "job_id" of String, parameter "finished" of type "boolean" (@range
+           [0,1]), parameter "ujs_url" of String, parameter "status" of
+           unspecified object, parameter "result" of unspecified object,
+           parameter "error" of type "JsonRpcError" (Error block of JSON RPC
+           response) -> structure: parameter "name" of String, parameter
+           "code" of Long, parameter "message" of String, parameter "error"
+           of String, parameter "job_state" of String, parameter "position"
+           of Long, parameter "creation_time" of Long, parameter
+           "exec_start_time" of Long, parameter "finish_time" of Long,
+           parameter "cancelled" of type "boolean" (@range [0,1]), parameter
+           "canceled" of type "boolean" (@range [0,1]), parameter "sub_jobs"
+           of unspecified object, parameter "sub_jobs_total" of Long,
+           parameter "sub_jobs_summary" of mapping from String to Long,
+           parameter "job_params" of mapping from type "job_id" (A job id.)
+           to type "RunJobParams" (method - service defined in standard JSON
+           RPC way, typically it's module name from spec-file followed by '.'
+           and name of funcdef from spec-file corresponding to running method
+           (e.g. 'KBaseTrees.construct_species_tree' from trees service);
+           params - the parameters of the method that performed this call;
+           Optional parameters: service_ver - specific version of deployed
+           service, last version is used if this parameter is not defined
+           rpc_context - context of current method call including nested call
+           history remote_url - run remote service call instead of local
+           command line execution. source_ws_objects - denotes the workspace
+           objects that will serve as a source of data when running the SDK
+           method. These references will be added to the autogenerated
+           provenance. app_id - the id of the Narrative application running
+           this job (e.g. repo/name) mapping<string, string> meta - user
+           defined metadata to associate with the job. This data is passed to
+           the User and Job State (UJS) service. wsid - a workspace id to
+           associate with the job. This is passed to the UJS service, which
+           will share the job based on the permissions of the workspace
+           rather than UJS ACLs.) -> structure: parameter "method" of String,
+           parameter "params" of list of unspecified object, parameter
+           "service_ver" of String, parameter "rpc_context" of type
+           "RpcContext" (call_stack - upstream calls details including nested
+           service calls and parent jobs where calls are listed in order from
+           outer to inner.) -> structure: parameter "call_stack" of list of
+           type "MethodCall" (time - the time the call was started; method -
+           service defined in standard JSON RPC way, typically it's module
+           name from spec-file followed by '.' and name of funcdef from
+           spec-file corresponding to running method (e.g.
+           'KBaseTrees.construct_species_tree' from trees service); job_id -
+           job id if method is asynchronous (optional field).) -> structure:
+           parameter "time" of type "timestamp" (A time in the format
+           YYYY-MM-DDThh:mm:ssZ, where Z is either the character Z
+           (representing the UTC timezone) or the difference in time to UTC
+           in the format +/-HHMM, eg: 2012-12-17T23:24:06-0500 (EST time)
+           2013-04-03T08:56:32+0000 (UTC time) 2013-04-03T08:56:32Z (UTC
+           time)), parameter "method" of String, parameter "job_id" of type
+           "job_id" (A job id.), parameter "run_id" of String, parameter
+           "remote_url" of String, parameter "source_ws_objects" of list of
+           type "wsref" (A workspace object reference of the form X/Y/Z,
+           where X is the workspace name or id, Y is the object name or id, Z
+           is the version, which is optional.), parameter "app_id" of String,
+           parameter "meta" of mapping from String to String, parameter
+           "wsid" of Long, parameter "check_error" of mapping from type
+           "job_id" (A job id.) to type "JsonRpcError" (Error block of JSON
+           RPC response) -> structure: parameter "name" of String, parameter
+           "code" of Long, parameter "message" of String, parameter "error"
+           of String, parameter "cursor" of String
+        """
+        return self._client.call_method(
+            'narrative_job_mock.check_jobs_since',
+            [params], self._service_ver, context)
+
+    def wait_for_job_states(self, job_ids, timeout_ms, known_states, context=None):
+        """
+        Waits for any of the given jobs to leave the state the caller knows
+        it to be in, or for timeout_ms milliseconds to pass, whichever is
+        first. known_states maps job ids to their last known job_state; jobs
+        not in it count as changed. The timeout is capped by the server.
+        :param job_ids: instance of list of type "job_id" (A job id.)
+        :param timeout_ms: instance of Long
+        :param known_states: instance of mapping from type "job_id" (A job
+           id.) to String
+        :returns: instance of type "WaitForJobStatesResults" (job_states -
+           states of the jobs that are no longer in their known state,
+           without sub_jobs; check_error - errors that happened while
+           checking jobs; timed_out - true if no job changed before the
+           timeout.) -> structure: parameter "job_states" of mapping from
+           type "job_id" (A job id.) to type "JobState" (job_id - id of job
+           running method finished - indicates whether job is done (including
+           error/cancel cases) or not, if the value is true then either of
+           'returned_data' or 'detailed_error' should be defined; ujs_url -
+           url of UserAndJobState service used by job service status - tuple
+           returned by UserAndJobState.get_job_status method result - keeps
+           exact copy of what original server method puts in result block of
+           JSON RPC response; error - keeps exact copy of what original
+           server method puts in error block of JSON RPC response; job_state
+           - 'queued', 'in-progress', 'completed', or 'suspend'; position -
+           position of the job in execution waiting queue; creation_time,
+           exec_start_time and finish_time - time moments of submission,
+           execution start and finish events in milliseconds since Unix
+           Epoch, canceled - whether the job is canceled or not. cancelled -
+           Deprecated field, please use 'canceled' field instead. sub_jobs -
+           for batch jobs, the states of the child jobs in the requested
+           window; sub_jobs_total - for batch jobs, the total number of child
+           jobs; sub_jobs_summary - for batch jobs checked in 'summary' mode,
+           the number of child jobs in each state.) -> structure: parameter
+           "job_id" of String, parameter "finished" of type "boolean" (@range
+           [0,1]), parameter "ujs_url" of String, parameter "status" of
+           unspecified object, parameter "result" of unspecified object,
+           parameter "error" of type "JsonRpcError" (Error block of JSON RPC
+           response) -> structure: parameter "name" of String, parameter
+           "code" of Long, parameter "message" of String, parameter "error"
+           of String, parameter "job_state" of String, parameter "position"
+           of Long, parameter "creation_time" of Long, parameter
+           "exec_start_time" of Long, parameter "finish_time" of Long,
+           parameter "cancelled" of type "boolean" (@range [0,1]), parameter
+           "canceled" of type "boolean" (@range [0,1]), parameter "sub_jobs"
+           of unspecified object, parameter "sub_jobs_total" of Long,
+           parameter "sub_jobs_summary" of mapping from String to Long,
+           parameter "check_error" of mapping from type "job_id" (A job id.)
+           to type "JsonRpcError" (Error block of JSON RPC response) ->
+           structure: parameter "name" of String, parameter "code" of Long,
+           parameter "message" of String, parameter "error" of String,
+           parameter "timed_out" of type "boolean" (@range [0,1])
+        """
+        return self._client.call_method(
+            'narrative_job_mock.wait_for_job_states',
+            [job_ids, timeout_ms, known_states], self._service_ver, context)
+
     def status(self, context=None):
         return self._client.call_method('narrative_job_mock.status',
                                         [], self._service_ver, context)
@@ -6,7 +6,7 @@ from Bio import SeqIO
 from pprint import pprint, pformat
 from AssemblyUtil.AssemblyUtilClient import AssemblyUtil
 from KBaseReport.KBaseReportClient import KBaseReport
-from statemocker import StateMocker
+from statemocker import StateMocker, SUB_JOBS_MODES
 #END_HEADER
 
 
@@ -31,6 +31,20 @@ class narrative_job_mock:
 
     #BEGIN_CLASS_HEADER
     # Class variables and functions can be defined in this block
+    def _is_int(self, value):
+        return isinstance(value, (int, long)) and not isinstance(value, bool)
+
+    def _sub_jobs_options(self, params):
+        sub_jobs_offset = params.get('sub_jobs_offset') or 0
+        sub_jobs_limit = params.get('sub_jobs_limit')
+        if not self._is_int(sub_jobs_offset) or sub_jobs_offset < 0:
+            raise ValueError('sub_jobs_offset must be an integer of at least 0')
+        if sub_jobs_limit is not None and (not self._is_int(sub_jobs_limit) or sub_jobs_limit < 0):
+            raise ValueError('sub_jobs_limit must be an integer of at least 0')
+        sub_jobs_mode = params.get('sub_jobs_mode') or 'full'
+        if sub_jobs_mode not in SUB_JOBS_MODES:
+            raise ValueError('sub_jobs_mode must be one of ' + ', '.join(SUB_JOBS_MODES))
+        return sub_jobs_offset, sub_jobs_limit, sub_jobs_mode
     #END_CLASS_HEADER
 
     # config contains contents of config file in a hash or None if it couldn't
@@ -43,6 +57,8 @@ class narrative_job_mock:
         # self.callback_url = os.environ['SDK_CALLBACK_URL']
         self.shared_folder = config['scratch']
         self.cfg = config
+        # long lived, so NJS clients and their connections are reused across calls
+        self.mocker = StateMocker(config)
 
         #END_CONSTRUCTOR
         pass
@@ -66,25 +82,29 @@ class narrative_job_mock:
            exec_start_time and finish_time - time moments of submission,
            execution start and finish events in milliseconds since Unix
            Epoch, canceled - whether the job is canceled or not. cancelled -
-           Deprecated field, please use 'canceled' field instead.) ->
-           structure: parameter "job_id" of String, parameter "finished" of
-           type "boolean" (@range [0,1]), parameter "ujs_url" of String,
-           parameter "status" of unspecified object, parameter "result" of
-           unspecified object, parameter "error" of type "JsonRpcError"
-           (Error block of JSON RPC response) -> structure: parameter "name"
-           of String, parameter "code" of Long, parameter "message" of
-           String, parameter "error" of String, parameter "job_state" of
-           String, parameter "position" of Long, parameter "creation_time" of
-           Long, parameter "exec_start_time" of Long, parameter "finish_time"
-           of Long, parameter "cancelled" of type "boolean" (@range [0,1]),
-           parameter "canceled" of type "boolean" (@range [0,1]), parameter
-           "sub_jobs" of unspecified object
+           Deprecated field, please use 'canceled' field instead. sub_jobs -
+           for batch jobs, the states of the child jobs in the requested
+           window; sub_jobs_total - for batch jobs, the total number of child
+           jobs; sub_jobs_summary - for batch jobs checked in 'summary' mode,
+           the number of child jobs in each state.) -> structure: parameter
+           "job_id" of String, parameter "finished" of type "boolean" (@range
+           [0,1]), parameter "ujs_url" of String, parameter "status" of
+           unspecified object, parameter "result" of unspecified object,
+           parameter "error" of type "JsonRpcError" (Error block of JSON RPC
+           response) -> structure: parameter "name" of String, parameter
+           "code" of Long, parameter "message" of String, parameter "error"
+           of String, parameter "job_state" of String, parameter "position"
+           of Long, parameter "creation_time" of Long, parameter
+           "exec_start_time" of Long, parameter "finish_time" of Long,
+           parameter "cancelled" of type "boolean" (@range [0,1]), parameter
+           "canceled" of type "boolean" (@range [0,1]), parameter "sub_jobs"
+           of unspecified object, parameter "sub_jobs_total" of Long,
+           parameter "sub_jobs_summary" of mapping from String to Long
         """
         # ctx is the context object
         # return variables are: job_state
         #BEGIN check_job
-        mocker = StateMocker(self.cfg, ctx['token'])
-        job_state = mocker.check_job(job_id)
+        job_state = self.mocker.check_job(ctx['token'], job_id)
         #END check_job
 
         # At some point might do deeper type checking...
@@ -96,9 +116,19 @@ class narrative_job_mock:
 
     def check_jobs(self, ctx, params):
         """
-        :param params: instance of type "CheckJobsParams" -> structure:
+        :param params: instance of type "CheckJobsParams" (job_ids - ids of
+           jobs to check; with_job_params - if true, also return the
+           parameters of the jobs; sub_jobs_offset, sub_jobs_limit - for
+           batch jobs, only return the child jobs in this window, starting at
+           sub_jobs_offset (default 0) and returning at most sub_jobs_limit
+           of them (default all); sub_jobs_mode - how to report the child
+           jobs of batch jobs. 'full' (the default) returns them in sub_jobs,
+           'summary' only returns the number in each state in
+           sub_jobs_summary, and 'none' returns neither.) -> structure:
            parameter "job_ids" of list of type "job_id" (A job id.),
-           parameter "with_job_params" of type "boolean" (@range [0,1])
+           parameter "with_job_params" of type "boolean" (@range [0,1]),
+           parameter "sub_jobs_offset" of Long, parameter "sub_jobs_limit" of
+           Long, parameter "sub_jobs_mode" of String
         :returns: instance of type "CheckJobsResults" (job_states - states of
            jobs, job_params - parameters of jobs, check_error - this map
            includes info about errors happening during job checking.) ->
@@ -117,73 +147,81 @@ class narrative_job_mock:
            exec_start_time and finish_time - time moments of submission,
            execution start and finish events in milliseconds since Unix
            Epoch, canceled - whether the job is canceled or not. cancelled -
-           Deprecated field, please use 'canceled' field instead.) ->
-           structure: parameter "job_id" of String, parameter "finished" of
-           type "boolean" (@range [0,1]), parameter "ujs_url" of String,
-           parameter "status" of unspecified object, parameter "result" of
-           unspecified object, parameter "error" of type "JsonRpcError"
-           (Error block of JSON RPC response) -> structure: parameter "name"
-           of String, parameter "code" of Long, parameter "message" of
-           String, parameter "error" of String, parameter "job_state" of
-           String, parameter "position" of Long, parameter "creation_time" of
-           Long, parameter "exec_start_time" of Long, parameter "finish_time"
-           of Long, parameter "cancelled" of type "boolean" (@range [0,1]),
-           parameter "canceled" of type "boolean" (@range [0,1]), parameter
-           "sub_jobs" of unspecified object, parameter "job_params" of
-           mapping from type "job_id" (A job id.) to type "RunJobParams"
-           (method - service defined in standard JSON RPC way, typically it's
-           module name from spec-file followed by '.' and name of funcdef
-           from spec-file corresponding to running method (e.g.
-           'KBaseTrees.construct_species_tree' from trees service); params -
-           the parameters of the method that performed this call; Optional
-           parameters: service_ver - specific version of deployed service,
-           last version is used if this parameter is not defined rpc_context
-           - context of current method call including nested call history
-           remote_url - run remote service call instead of local command line
-           execution. source_ws_objects - denotes the workspace objects that
-           will serve as a source of data when running the SDK method. These
-           references will be added to the autogenerated provenance. app_id -
-           the id of the Narrative application running this job (e.g.
-           repo/name) mapping<string, string> meta - user defined metadata to
-           associate with the job. This data is passed to the User and Job
-           State (UJS) service. wsid - a workspace id to associate with the
-           job. This is passed to the UJS service, which will share the job
-           based on the permissions of the workspace rather than UJS ACLs.)
-           -> structure: parameter "method" of String, parameter "params" of
-           list of unspecified object, parameter "service_ver" of String,
-           parameter "rpc_context" of type "RpcContext" (call_stack -
-           upstream calls details including nested service calls and parent
-           jobs where calls are listed in order from outer to inner.) ->
-           structure: parameter "call_stack" of list of type "MethodCall"
-           (time - the time the call was started; method - service defined in
-           standard JSON RPC way, typically it's module name from spec-file
-           followed by '.' and name of funcdef from spec-file corresponding
-           to running method (e.g. 'KBaseTrees.construct_species_tree' from
-           trees service); job_id - job id if method is asynchronous
-           (optional field).) -> structure: parameter "time" of type
-           "timestamp" (A time in the format YYYY-MM-DDThh:mm:ssZ, where Z is
-           either the character Z (representing the UTC timezone) or the
-           difference in time to UTC in the format +/-HHMM, eg:
-           2012-12-17T23:24:06-0500 (EST time) 2013-04-03T08:56:32+0000 (UTC
-           time) 2013-04-03T08:56:32Z (UTC time)), parameter "method" of
-           String, parameter "job_id" of type "job_id" (A job id.), parameter
-           "run_id" of String, parameter "remote_url" of String, parameter
-           "source_ws_objects" of list of type "wsref" (A workspace object
-           reference of the form X/Y/Z, where X is the workspace name or id,
-           Y is the object name or id, Z is the version, which is optional.),
-           parameter "app_id" of String, parameter "meta" of mapping from
-           String to String, parameter "wsid" of Long, parameter
-           "check_error" of mapping from type "job_id" (A job id.) to type
-           "JsonRpcError" (Error block of JSON RPC response) -> structure:
-           parameter "name" of String, parameter "code" of Long, parameter
-           "message" of String, parameter "error" of String
+           Deprecated field, please use 'canceled' field instead. sub_jobs -
+           for batch jobs, the states of the child jobs in the requested
+           window; sub_jobs_total - for batch jobs, the total number of child
+           jobs; sub_jobs_summary - for batch jobs checked in 'summary' mode,
+           the number of child jobs in each state.) -> structure: parameter
+           "job_id" of String, parameter "finished" of type "boolean" (@range
+           [0,1]), parameter "ujs_url" of String, parameter "status" of
+           unspecified object, parameter "result" of unspecified object,
+           parameter "error" of type "JsonRpcError" (Error block of JSON RPC
+           response) -> structure: parameter "name" of String, parameter
+           "code" of Long, parameter "message" of String, parameter "error"
+           of String, parameter "job_state" of String, parameter "position"
+           of Long, parameter "creation_time" of Long, parameter
+           "exec_start_time" of Long, parameter "finish_time" of Long,
+           parameter "cancelled" of type "boolean" (@range [0,1]), parameter
+           "canceled" of type "boolean" (@range [0,1]), parameter "sub_jobs"
+           of unspecified object, parameter "sub_jobs_total" of Long,
+           parameter "sub_jobs_summary" of mapping from String to Long,
+           parameter "job_params" of mapping from type "job_id" (A job id.)
+           to type "RunJobParams" (method - service defined in standard JSON
+           RPC way, typically it's module name from spec-file followed by '.'
+           and name of funcdef from spec-file corresponding to running method
+           (e.g. 'KBaseTrees.construct_species_tree' from trees service);
+           params - the parameters of the method that performed this call;
+           Optional parameters: service_ver - specific version of deployed
+           service, last version is used if this parameter is not defined
+           rpc_context - context of current method call including nested call
+           history remote_url - run remote service call instead of local
+           command line execution. source_ws_objects - denotes the workspace
+           objects that will serve as a source of data when running the SDK
+           method. These references will be added to the autogenerated
+           provenance. app_id - the id of the Narrative application running
+           this job (e.g. repo/name) mapping<string, string> meta - user
+           defined metadata to associate with the job. This data is passed to
+           the User and Job State (UJS) service. wsid - a workspace id to
+           associate with the job. This is passed to the UJS service, which
+           will share the job based on the permissions of the workspace
+           rather than UJS ACLs.) -> structure: parameter "method" of String,
+           parameter "params" of list of unspecified object, parameter
+           "service_ver" of String, parameter "rpc_context" of type
+           "RpcContext" (call_stack - upstream calls details including nested
+           service calls and parent jobs where calls are listed in order from
+           outer to inner.) -> structure: parameter "call_stack" of list of
+           type "MethodCall" (time - the time the call was started; method -
+           service defined in standard JSON RPC way, typically it's module
+           name from spec-file followed by '.' and name of funcdef from
+           spec-file corresponding to running method (e.g.
+           'KBaseTrees.construct_species_tree' from trees service); job_id -
+           job id if method is asynchronous (optional field).) -> structure:
+           parameter "time" of type "timestamp" (A time in the format
+           YYYY-MM-DDThh:mm:ssZ, where Z is either the character Z
+           (representing the UTC timezone) or the difference in time to UTC
+           in the format +/-HHMM, eg: 2012-12-17T23:24:06-0500 (EST time)
+           2013-04-03T08:56:32+0000 (UTC time) 2013-04-03T08:56:32Z (UTC
+           time)), parameter "method" of String, parameter "job_id" of type
+           "job_id" (A job id.), parameter "run_id" of String, parameter
+           "remote_url" of String, parameter "source_ws_objects" of list of
+           type "wsref" (A workspace object reference of the form X/Y/Z,
+           where X is the workspace name or id, Y is the object name or id, Z
+           is the version, which is optional.), parameter "app_id" of String,
+           parameter "meta" of mapping from String to String, parameter
+           "wsid" of Long, parameter "check_error" of mapping from type
+           "job_id" (A job id.) to type "JsonRpcError" (Error block of JSON
+           RPC response) -> structure: parameter "name" of String, parameter
+           "code" of Long, parameter "message" of String, parameter "error"
+           of String
         """
         # ctx is the context object
         # return variables are: returnVal
         #BEGIN check_jobs
-        mocker = StateMocker(self.cfg, ctx['token'])
         get_params = True if params.get('with_job_params', 0) == 1 else False
-        returnVal = mocker.check_jobs(params['job_ids'], get_params)
+        sub_jobs_offset, sub_jobs_limit, sub_jobs_mode = self._sub_jobs_options(params)
+        returnVal = self.mocker.check_jobs(ctx['token'], params['job_ids'], get_params,
+                                           sub_jobs_offset, sub_jobs_limit, sub_jobs_mode,
+                                           encode_fragments=True)
         #END check_jobs
 
         # At some point might do deeper type checking...
@@ -192,12 +230,201 @@ class narrative_job_mock:
                              'returnVal is not type dict as required.')
         # return the results
         return [returnVal]
+
+    def check_jobs_since(self, ctx, params):
+        """
+        Like check_jobs, but only returns the jobs whose state changed since
+        the given cursor, along with a new cursor.
+        :param params: instance of type "CheckJobsSinceParams" (job_ids - ids
+           of jobs to check; cursor - the cursor returned by the last call to
+           check_jobs_since for these jobs, or empty to get the states of all
+           of them; with_job_params, sub_jobs_offset, sub_jobs_limit,
+           sub_jobs_mode - as in CheckJobsParams. Changing these makes the
+           cursor start over.) -> structure: parameter "job_ids" of list of
+           type "job_id" (A job id.), parameter "cursor" of String, parameter
+           "with_job_params" of type "boolean" (@range [0,1]), parameter
+           "sub_jobs_offset" of Long, parameter "sub_jobs_limit" of Long,
+           parameter "sub_jobs_mode" of String
+        :returns: instance of type "CheckJobsSinceResults" (job_states -
+           states of jobs that changed since the cursor was issued,
+           job_params - parameters of those jobs, check_error - this map
+           includes info about errors happening during job checking, cursor -
+           pass this to the next call to only get the jobs that change after
+           this one.) -> structure: parameter "job_states" of mapping from
+           type "job_id" (A job id.) to type "JobState" (job_id - id of job
+           running method finished - indicates whether job is done (including
+           error/cancel cases) or not, if the value is true then either of
+           'returned_data' or 'detailed_error' should be defined; ujs_url -
+           url of UserAndJobState service used by job service status - tuple
+           returned by UserAndJobState.get_job_status method result - keeps
+           exact copy of what original server method puts in result block of
+           JSON RPC response; error - keeps exact copy of what original
+           server method puts in error block of JSON RPC response; job_state
+           - 'queued', 'in-progress', 'completed', or 'suspend'; position -
+           position of the job in execution waiting queue; creation_time,
+           exec_start_time and finish_time - time moments of submission,
+           execution start and finish events in milliseconds since Unix
+           Epoch, canceled - whether the job is canceled or not. cancelled -
+           Deprecated field, please use 'canceled' field instead. sub_jobs -
+           for batch jobs, the states of the child jobs in the requested
+           window; sub_jobs_total - for batch jobs, the total number of child
+           jobs; sub_jobs_summary - for batch jobs checked in 'summary' mode,
+           the number of child jobs in each state.) -> structure: parameter
+           "job_id" of String, parameter "finished" of type "boolean" (@range
+           [0,1]), parameter "ujs_url" of String, parameter "status" of
+           unspecified object, parameter "result" of unspecified object,
+           parameter "error" of type "JsonRpcError" (Error block of JSON RPC
+           response) -> structure: parameter "name" of String, parameter
+           "code" of Long, parameter "message" of String, parameter "error"
+           of String, parameter "job_state" of String, parameter "position"
+           of Long, parameter "creation_time" of Long, parameter
+           "exec_start_time" of Long, parameter "finish_time" of Long,
+           parameter "cancelled" of type "boolean" (@range [0,1]), parameter
+           "canceled" of type "boolean" (@range [0,1]), parameter "sub_jobs"
+           of unspecified object, parameter "sub_jobs_total" of Long,
+           parameter "sub_jobs_summary" of mapping from String to Long,
+           parameter "job_params" of mapping from type "job_id" (A job id.)
+           to type "RunJobParams" (method - service defined in standard JSON
+           RPC way, typically it's module name from spec-file followed by '.'
+           and name of funcdef from spec-file corresponding to running method
+           (e.g. 'KBaseTrees.construct_species_tree' from trees service);
+           params - the parameters of the method that performed this call;
+           Optional parameters: service_ver - specific version of deployed
+           service, last version is used if this parameter is not defined
+           rpc_context - context of current method call including nested call
+           history remote_url - run remote service call instead of local
+           command line execution. source_ws_objects - denotes the workspace
+           objects that will serve as a source of data when running the SDK
+           method. These references will be added to the autogenerated
+           provenance. app_id - the id of the Narrative application running
+           this job (e.g. repo/name) mapping<string, string> meta - user
+           defined metadata to associate with the job. This data is passed to
+           the User and Job State (UJS) service. wsid - a workspace id to
+           associate with the job. This is passed to the UJS service, which
+           will share the job based on the permissions of the workspace
+           rather than UJS ACLs.) -> structure: parameter "method" of String,
+           parameter "params" of list of unspecified object, parameter
+           "service_ver" of String, parameter "rpc_context" of type
+           "RpcContext" (call_stack - upstream calls details including nested
+           service calls and parent jobs where calls are listed in order from
+           outer to inner.) -> structure: parameter "call_stack" of list of
+           type "MethodCall" (time - the time the call was started; method -
+           service defined in standard JSON RPC way, typically it's module
+           name from spec-file followed by '.' and name of funcdef from
+           spec-file corresponding to running method (e.g.
+           'KBaseTrees.construct_species_tree' from trees service); job_id -
+           job id if method is asynchronous (optional field).) -> structure:
+           parameter "time" of type "timestamp" (A time in the format
+           YYYY-MM-DDThh:mm:ssZ, where Z is either the character Z
+           (representing the UTC timezone) or the difference in time to UTC
+           in the format +/-HHMM, eg: 2012-12-17T23:24:06-0500 (EST time)
+           2013-04-03T08:56:32+0000 (UTC time) 2013-04-03T08:56:32Z (UTC
+           time)), parameter "method" of String, parameter "job_id" of type
+           "job_id" (A job id.), parameter "run_id" of String, parameter
+           "remote_url" of String, parameter "source_ws_objects" of list of
+           type "wsref" (A workspace object reference of the form X/Y/Z,
+           where X is the workspace name or id, Y is the object name or id, Z
+           is the version, which is optional.), parameter "app_id" of String,
+           parameter "meta" of mapping from String to String, parameter
+           "wsid" of Long, parameter "check_error" of mapping from type
+           "job_id" (A job id.) to type "JsonRpcError" (Error block of JSON
+           RPC response) -> structure: parameter "name" of String, parameter
+           "code" of Long, parameter "message" of String, parameter "error"
+           of String, parameter "cursor" of String
+        """
+        # ctx is the context object
+        # return variables are: returnVal
+        #BEGIN check_jobs_since
+        get_params = True if params.get('with_job_params', 0) == 1 else False
+        sub_jobs_offset, sub_jobs_limit, sub_jobs_mode = self._sub_jobs_options(params)
+        returnVal = self.mocker.check_jobs_since(ctx['token'], params['job_ids'],
+                                                 params.get('cursor'), get_params,
+                                                 sub_jobs_offset, sub_jobs_limit,
+                                                 sub_jobs_mode)
+        #END check_jobs_since
+
+        # At some point might do deeper type checking...
+        if not isinstance(returnVal, dict):
+            raise ValueError('Method check_jobs_since return value ' +
+                             'returnVal is not type dict as required.')
+        # return the results
+        return [returnVal]
+
+    def wait_for_job_states(self, ctx, job_ids, timeout_ms, known_states):
+        """
+        Waits for any of the given jobs to leave the state the caller knows
+        it to be in, or for timeout_ms milliseconds to pass, whichever is
+        first. known_states maps job ids to their last known job_state; jobs
+        not in it count as changed. The timeout is capped by the server.
+        :param job_ids: instance of list of type "job_id" (A job id.)
+        :param timeout_ms: instance of Long
+        :param known_states: instance of mapping from type "job_id" (A job
+           id.) to String
+        :returns: instance of type "WaitForJobStatesResults" (job_states -
+           states of the jobs that are no longer in their known state,
+           without sub_jobs; check_error - errors that happened while
+           checking jobs; timed_out - true if no job changed before the
+           timeout.) -> structure: parameter "job_states" of mapping from
+           type "job_id" (A job id.) to type "JobState" (job_id - id of job
+           running method finished - indicates whether job is done (including
+           error/cancel cases) or not, if the value is true then either of
+           'returned_data' or 'detailed_error' should be defined; ujs_url -
+           url of UserAndJobState service used by job service status - tuple
+           returned by UserAndJobState.get_job_status method result - keeps
+           exact copy of what original server method puts in result block of
+           JSON RPC response; error - keeps exact copy of what original
+           server method puts in error block of JSON RPC response; job_state
+           - 'queued', 'in-progress', 'completed', or 'suspend'; position -
+           position of the job in execution waiting queue; creation_time,
+           exec_start_time and finish_time - time moments of submission,
+           execution start and finish events in milliseconds since Unix
+           Epoch, canceled - whether the job is canceled or not. cancelled -
+           Deprecated field, please use 'canceled' field instead. sub_jobs -
+           for batch jobs, the states of the child jobs in the requested
+           window; sub_jobs_total - for batch jobs, the total number of child
+           jobs; sub_jobs_summary - for batch jobs checked in 'summary' mode,
+           the number of child jobs in each state.) -> structure: parameter
+           "job_id" of String, parameter "finished" of type "boolean" (@range
+           [0,1]), parameter "ujs_url" of String, parameter "status" of
+           unspecified object, parameter "result" of unspecified object,
+           parameter "error" of type "JsonRpcError" (Error block of JSON RPC
+           response) -> structure: parameter "name" of String, parameter
+           "code" of Long, parameter "message" of String, parameter "error"
+           of String, parameter "job_state" of String, parameter "position"
+           of Long, parameter "creation_time" of Long, parameter
+           "exec_start_time" of Long, parameter "finish_time" of Long,
+           parameter "cancelled" of type "boolean" (@range [0,1]), parameter
+           "canceled" of type "boolean" (@range [0,1]), parameter "sub_jobs"
+           of unspecified object, parameter "sub_jobs_total" of Long,
+           parameter "sub_jobs_summary" of mapping from String to Long,
+           parameter "check_error" of mapping from type "job_id" (A job id.)
+           to type "JsonRpcError" (Error block of JSON RPC response) ->
+           structure: parameter "name" of String, parameter "code" of Long,
+           parameter "message" of String, parameter "error" of String,
+           parameter "timed_out" of type "boolean" (@range [0,1])
+        """
+        # ctx is the context object
+        # return variables are: results
+        #BEGIN wait_for_job_states
+        if timeout_ms < 0:
+            raise ValueError('timeout_ms must be at least 0')
+        results = self.mocker.wait_for_job_states(ctx['token'], job_ids, timeout_ms,
+                                                  known_states)
+        #END wait_for_job_states
+
+        # At some point might do deeper type checking...
+        if not isinstance(results, dict):
+            raise ValueError('Method wait_for_job_states return value ' +
+                             'results is not type dict as required.')
+        # return the results
+        return [results]
     def status(self, ctx):
         #BEGIN_STATUS
         returnVal = {'state': "OK",
                      'message': "",
                      'version': self.VERSION,
                      'git_url': self.GIT_URL,
-                     'git_commit_hash': self.GIT_COMMIT_HASH}
+                     'git_commit_hash': self.GIT_COMMIT_HASH,
+                     'stats': self.mocker.stats()}
         #END_STATUS
         return [returnVal]
@@ -1,10 +1,14 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from wsgiref.simple_server import make_server
+from wsgiref.simple_server import make_server, WSGIServer
+from SocketServer import BaseServer, ThreadingMixIn
+import Queue
 import sys
+import copy
 import json
 import traceback
 import datetime
+import threading
 from multiprocessing import Process
 from getopt import getopt, GetoptError
 from jsonrpcbase import JSONRPCService, InvalidParamsError, KeywordError,\
@@ -12,15 +16,21 @@ from jsonrpcbase import JSONRPCService, InvalidParamsError, KeywordError,\
 from jsonrpcbase import ServerError as JSONServerError
 from os import environ
 from ConfigParser import ConfigParser
+from urlparse import parse_qs
 from biokbase import log
 import requests as _requests
 import random as _random
 import os
 from narrative_job_mock.authclient import KBaseAuth as _KBaseAuth
+from narrative_job_mock.jsonstream import StreamEncoder as _StreamEncoder
+from narrative_job_mock.jsoncodec import get_codec as _get_codec
+from narrative_job_mock.asynclog import AsyncLogWriter as _AsyncLogWriter
 
 DEPLOY = 'KB_DEPLOYMENT_CONFIG'
 SERVICE = 'KB_SERVICE_NAME'
 AUTH = 'auth-service-url'
+# where Application serves Server-Sent Events of job state changes
+JOB_EVENTS_PATH = '/events'
 
 # Note that the error fields do not match the 2.0 JSONRPC spec
 
@@ -61,8 +71,145 @@ class JSONObjectEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, obj)
 
 
+class _DispatchEntry(object):
+    """
+    Everything needed to dispatch a call to one method, worked out once when
+    the method is added rather than on every request.
+
+    method -- the function to call
+    min_params, max_params -- the allowed number of positional params, not
+        counting the context. max_params is None for variadic methods.
+    validate -- checks the param types, or None if there are no types
+    auth -- the method's authentication requirement: 'required', 'optional'
+        or 'none'
+    """
+    __slots__ = ('method', 'min_params', 'max_params', 'validate', 'auth')
+
+    def __init__(self, method, min_params, max_params, validate, auth):
+        self.method = method
+        self.min_params = min_params
+        self.max_params = max_params
+        self.validate = validate
+        self.auth = auth
+
+
 class JSONRPCServiceCustom(JSONRPCService):
 
+    def __init__(self, batch_workers=1, use_gevent=False, codec=None):
+        """
+        Arguments:
+        batch_workers -- how many requests of a JSON-RPC batch may run at once.
+            With 1 they run one after another.
+        use_gevent -- run batch requests in a gevent pool rather than threads.
+        codec -- the JSON codec results are encoded with, from
+            jsoncodec.get_codec. Defaults to the standard library.
+        """
+        super(JSONRPCServiceCustom, self).__init__()
+        self.codec = codec or _get_codec('json', JSONObjectEncoder)
+        self.dispatch_table = dict()
+        self.batch_workers = batch_workers
+        self.use_gevent = use_gevent
+        self._batch_pool = None
+        self._batch_pool_pid = None
+        self._batch_pool_lock = threading.Lock()
+
+    def add(self, f, name=None, types=None, required=None, auth='required'):
+        """
+        Adds a new method to the jsonrpc service, and its entry to the
+        dispatch table. See JSONRPCService.add. auth is the method's
+        authentication requirement: 'required', 'optional' or 'none'.
+        """
+        if auth not in ('required', 'optional', 'none'):
+            raise ValueError('Unknown authentication requirement: ' + str(auth))
+        types = self._accept_longs(types)
+        super(JSONRPCServiceCustom, self).add(f, name=name, types=types,
+                                              required=required)
+        name = name or f.__name__
+        self.dispatch_table[name] = _DispatchEntry(
+            f, self._man_args(f) - 1,
+            None if self._vargs(f) else self._max_args(f) - 1,
+            self._compile_validator(types, required), auth)
+
+    def _accept_longs(self, types):
+        """
+        Lets int params be longs too. Some JSON parsers (ujson) return longs
+        for integers the standard library returns as ints.
+        """
+        def widen(type_):
+            return (int, long) if type_ is int else type_
+        if isinstance(types, list):
+            return [widen(type_) for type_ in types]
+        if isinstance(types, dict):
+            return dict((key, widen(type_)) for key, type_ in types.items())
+        return types
+
+    def _compile_validator(self, types, required=None):
+        """
+        Returns a function that checks request params against types the same
+        way as JSONRPCService._validate_params_types, or None if there are no
+        types to check.
+        """
+        if types is None:
+            return None
+        if isinstance(types, list):
+            def validate(params):
+                if isinstance(params, dict):
+                    raise InvalidParamsError(
+                        'expected positional params, not keyword')
+                if isinstance(params, list):
+                    for posnum, (param, type_) in enumerate(
+                            zip(params, types), 1):
+                        if not (param is None or isinstance(param, type_)):
+                            raise InvalidParamsError(
+                                'positional arg #%s is the wrong type' %
+                                posnum)
+            return validate
+
+        def validate(params):
+            if isinstance(params, list):
+                raise InvalidParamsError(
+                    'expected keyword params, not positional')
+            if isinstance(params, dict):
+                for key in required or []:
+                    if key not in params:
+                        raise InvalidParamsError('missing key: %s' % key)
+                for key, param in params.items():
+                    if key not in types or not (
+                            param is None or isinstance(param, types[key])):
+                        raise InvalidParamsError(
+                            'arg "%s" is the wrong type' % key)
+        return validate
+
+    def _get_batch_pool(self):
+        """
+        Returns the pool for running batch requests concurrently, or None if
+        they should run one after another. The pool is made on first use in
+        each process, since pool threads don't survive a fork.
+        """
+        if self.batch_workers < 2:
+            return None
+        with self._batch_pool_lock:
+            if self._batch_pool is None or self._batch_pool_pid != os.getpid():
+                if self.use_gevent:
+                    from gevent.pool import Pool
+                    self._batch_pool = Pool(self.batch_workers)
+                else:
+                    from multiprocessing.pool import ThreadPool
+                    self._batch_pool = ThreadPool(self.batch_workers)
+                self._batch_pool_pid = os.getpid()
+            return self._batch_pool
+
+    def map_batch(self, f, items):
+        """
+        Calls f on each of items, concurrently if batch_workers is over 1,
+        and returns the results in the same order as items.
+        """
+        pool = self._get_batch_pool() if len(items) > 1 else None
+        if pool is None:
+            return [f(item) for item in items]
+        # map keeps the results in order
+        return pool.map(f, items)
+
     def call(self, ctx, jsondata):
         """
         Calls jsonrpc service's method and returns its return value in a JSON
@@ -73,23 +220,41 @@ class JSONRPCServiceCustom(JSONRPCService):
         """
         result = self.call_py(ctx, jsondata)
         if result is not None:
-            return json.dumps(result, cls=JSONObjectEncoder)
+            return self.codec.dumps(result)
+
+        return None
+
+    def call_stream(self, ctx, jsondata):
+        """
+        Calls jsonrpc service's method and returns its return value as an
+        iterator of JSON string chunks, or None if there is none.
+
+        This method is same as call() except the response is encoded lazily,
+        so it is never held in memory as a single string.
+
+        Arguments:
+        jsondata -- remote method call in jsonrpc format
+        """
+        result = self.call_py(ctx, jsondata)
+        if result is not None:
+            return _StreamEncoder(JSONObjectEncoder()).iterencode(result)
 
         return None
 
     def _call_method(self, ctx, request):
         """Calls given method with given params and returns it value."""
-        method = self.method_data[request['method']]['method']
+        entry = self.dispatch_table[request['method']]
+        method = entry.method
         params = request['params']
         result = None
         try:
             if isinstance(params, list):
                 # Does it have enough arguments?
-                if len(params) < self._man_args(method) - 1:
+                if len(params) < entry.min_params:
                     raise InvalidParamsError('not enough arguments')
                 # Does it have too many arguments?
-                if(not self._vargs(method) and len(params) >
-                        self._max_args(method) - 1):
+                if(entry.max_params is not None and
+                        len(params) > entry.max_params):
                     raise InvalidParamsError('too many arguments')
 
                 result = method(ctx, *params)
@@ -158,8 +323,13 @@ class JSONRPCServiceCustom(JSONRPCService):
                 self._fill_request(request_, rdata_)
                 requests.append(request_)
 
-            for request_ in requests:
-                respond = self._handle_request(ctx, request_)
+            # each request gets its own copy of the context, since they may
+            # run at the same time
+            results = self.map_batch(
+                lambda request_: self._handle_request(copy.copy(ctx), request_),
+                requests)
+
+            for respond in results:
                 # Don't respond to notifications
                 if respond is not None:
                     responds.append(respond)
@@ -175,8 +345,9 @@ class JSONRPCServiceCustom(JSONRPCService):
 
     def _handle_request(self, ctx, request):
         """Handles given request and returns its response."""
-        if self.method_data[request['method']].has_key('types'):  # noqa @IgnorePep8
-            self._validate_params_types(request['method'], request['params'])
+        validate = self.dispatch_table[request['method']].validate
+        if validate is not None:
+            validate(request['params'])
 
         result = self._call_method(ctx, request)
 
@@ -317,7 +488,7 @@ class Application(object):
         self.serverlog.set_log_file(self.userlog.get_log_file())
 
     def log(self, level, context, message):
-        self.serverlog.log_message(level, message, context['client_ip'],
+        self.logwriter.log_message(level, message, context['client_ip'],
                                    context['user_id'], context['module'],
                                    context['method'], context['call_id'])
 
@@ -331,21 +502,52 @@ class Application(object):
             submod, ip_address=True, authuser=True, module=True, method=True,
             call_id=True, logfile=self.userlog.get_log_file())
         self.serverlog.set_log_level(6)
-        self.rpc_service = JSONRPCServiceCustom()
-        self.method_authentication = dict()
+        # writes the server log from a background thread, unless turned off
+        if config is not None and config.get('async-logging') == 'true':
+            self.logwriter = _AsyncLogWriter(
+                self.serverlog,
+                queue_size=int(config.get('log-queue-size', 10000)),
+                batch_size=int(config.get('log-batch-size', 100)),
+                policy=config.get('log-queue-policy', 'block'),
+                info_sample_rate=float(config.get('log-info-sample-rate', 1.0)))
+        else:
+            self.logwriter = self.serverlog
+        self.codec = _get_codec(
+            config.get('json-codec', 'auto') if config else 'auto',
+            JSONObjectEncoder)
+        self.rpc_service = JSONRPCServiceCustom(
+            batch_workers=int(config.get('rpc-batch-workers', 1)) if config else 1,
+            use_gevent=bool(config and config.get('gevent_monkeypatch_all', False)),
+            codec=self.codec)
         self.rpc_service.add(impl_narrative_job_mock.check_job,
                              name='narrative_job_mock.check_job',
-                             types=[basestring])
-        self.method_authentication['narrative_job_mock.check_job'] = 'required'  # noqa
+                             types=[basestring], auth='required')
         self.rpc_service.add(impl_narrative_job_mock.check_jobs,
                              name='narrative_job_mock.check_jobs',
-                             types=[dict])
-        self.method_authentication['narrative_job_mock.check_jobs'] = 'required'  # noqa
+                             types=[dict], auth='required')
+        self.rpc_service.add(impl_narrative_job_mock.check_jobs_since,
+                             name='narrative_job_mock.check_jobs_since',
+                             types=[dict], auth='required')
+        self.rpc_service.add(impl_narrative_job_mock.wait_for_job_states,
+                             name='narrative_job_mock.wait_for_job_states',
+                             types=[list, int, dict], auth='required')
         self.rpc_service.add(impl_narrative_job_mock.status,
                              name='narrative_job_mock.status',
-                             types=[dict])
+                             types=[dict], auth='none')
         authurl = config.get(AUTH) if config else None
-        self.auth_client = _KBaseAuth(authurl)
+        self.auth_client = _KBaseAuth(
+            authurl,
+            rejected_cache_size=int(config.get('auth-rejected-cache-size', 1000))
+            if config else 1000,
+            rejected_ttl=float(config.get('auth-rejected-cache-ttl-sec', 30))
+            if config else 30,
+            refresh_fraction=float(config.get('auth-refresh-ahead-fraction', 0))
+            if config else None)
+        self.stream_responses = config is not None and \
+            config.get('stream-responses') == 'true'
+        # seconds between keep-alive comments on idle job event streams
+        self.events_keepalive = float(config.get('job-events-keepalive-sec', 15)) \
+            if config else 15.0
 
     def __call__(self, environ, start_response):
         # Context object, equivalent to the perl impl CallContext
@@ -353,6 +555,10 @@ class Application(object):
         ctx['client_ip'] = getIPAddress(environ)
         status = '500 Internal Server Error'
 
+        if environ['REQUEST_METHOD'] == 'GET' and \
+                environ.get('PATH_INFO', '').rstrip('/') == JOB_EVENTS_PATH:
+            return self.job_events(environ, start_response, ctx)
+
         try:
             body_size = int(environ.get('CONTENT_LENGTH', 0))
         except (ValueError):
@@ -364,7 +570,7 @@ class Application(object):
         else:
             request_body = environ['wsgi.input'].read(body_size)
             try:
-                req = json.loads(request_body)
+                req = self.codec.loads(request_body)
             except ValueError as ve:
                 err = {'error': {'code': -32700,
                                  'name': "Parse error",
@@ -373,71 +579,39 @@ class Application(object):
                        }
                 rpc_result = self.process_error(err, ctx, {'version': '1.1'})
             else:
-                ctx['module'], ctx['method'] = req['method'].split('.')
-                ctx['call_id'] = req['id']
-                ctx['rpc_context'] = {
-                    'call_stack': [{'time': self.now_in_utc(),
-                                    'method': req['method']}
-                                   ]
-                }
-                prov_action = {'service': ctx['module'],
-                               'method': ctx['method'],
-                               'method_params': req['params']
-                               }
-                ctx['provenance'] = [prov_action]
-                try:
-                    token = environ.get('HTTP_AUTHORIZATION')
-                    # parse out the method being requested and check if it
-                    # has an authentication requirement
-                    method_name = req['method']
-                    auth_req = self.method_authentication.get(
-                        method_name, 'none')
-                    if auth_req != 'none':
-                        if token is None and auth_req == 'required':
-                            err = JSONServerError()
-                            err.data = (
-                                'Authentication required for ' +
-                                'narrative_job_mock ' +
-                                'but no authentication header was passed')
-                            raise err
-                        elif token is None and auth_req == 'optional':
-                            pass
-                        else:
-                            try:
-                                user = self.auth_client.get_user(token)
-                                ctx['user_id'] = user
-                                ctx['authenticated'] = 1
-                                ctx['token'] = token
-                            except Exception, e:
-                                if auth_req == 'required':
-                                    err = JSONServerError()
-                                    err.data = \
-                                        "Token validation failed: %s" % e
-                                    raise err
-                    if (environ.get('HTTP_X_FORWARDED_FOR')):
-                        self.log(log.INFO, ctx, 'X-Forwarded-For: ' +
-                                 environ.get('HTTP_X_FORWARDED_FOR'))
-                    self.log(log.INFO, ctx, 'start method')
-                    rpc_result = self.rpc_service.call(ctx, req)
-                    self.log(log.INFO, ctx, 'end method')
+                if isinstance(req, list) and req:
+                    rpc_result = self.call_batch(environ, req)
                     status = '200 OK'
-                except JSONRPCError as jre:
-                    err = {'error': {'code': jre.code,
-                                     'name': jre.message,
-                                     'message': jre.data
-                                     }
-                           }
-                    trace = jre.trace if hasattr(jre, 'trace') else None
-                    rpc_result = self.process_error(err, ctx, req, trace)
-                except Exception:
-                    err = {'error': {'code': 0,
-                                     'name': 'Unexpected Server Error',
-                                     'message': 'An unexpected server error ' +
-                                                'occurred',
-                                     }
-                           }
-                    rpc_result = self.process_error(err, ctx, req,
-                                                    traceback.format_exc())
+                else:
+                    try:
+                        self._set_up_call(environ, ctx, req)
+                        if (environ.get('HTTP_X_FORWARDED_FOR')):
+                            self.log(log.INFO, ctx, 'X-Forwarded-For: ' +
+                                     environ.get('HTTP_X_FORWARDED_FOR'))
+                        self.log(log.INFO, ctx, 'start method')
+                        if self.stream_responses:
+                            rpc_result = self.rpc_service.call_stream(ctx, req)
+                        else:
+                            rpc_result = self.rpc_service.call(ctx, req)
+                        self.log(log.INFO, ctx, 'end method')
+                        status = '200 OK'
+                    except JSONRPCError as jre:
+                        err = {'error': {'code': jre.code,
+                                         'name': jre.message,
+                                         'message': jre.data
+                                         }
+                               }
+                        trace = jre.trace if hasattr(jre, 'trace') else None
+                        rpc_result = self.process_error(err, ctx, req, trace)
+                    except Exception:
+                        err = {'error': {'code': 0,
+                                         'name': 'Unexpected Server Error',
+                                         'message': 'An unexpected server error ' +
+                                                    'occurred',
+                                         }
+                               }
+                        rpc_result = self.process_error(err, ctx, req,
+                                                        traceback.format_exc())
 
         # print 'Request method was %s\n' % environ['REQUEST_METHOD']
         # print 'Environment dictionary is:\n%s\n' % pprint.pformat(environ)
@@ -445,21 +619,191 @@ class Application(object):
         # print 'Result from the method call is:\n%s\n' % \
         #    pprint.pformat(rpc_result)
 
+        response_headers = [
+            ('Access-Control-Allow-Origin', '*'),
+            ('Access-Control-Allow-Headers', environ.get(
+                'HTTP_ACCESS_CONTROL_REQUEST_HEADERS', 'authorization')),
+            ('content-type', 'application/json')]
+
+        if rpc_result is not None and not isinstance(rpc_result, basestring):
+            # a streamed response; with no content-length the wsgi server
+            # sends it with chunked transfer encoding
+            start_response(status, response_headers)
+            return rpc_result
+
         if rpc_result:
             response_body = rpc_result
         else:
             response_body = ''
 
-        response_headers = [
-            ('Access-Control-Allow-Origin', '*'),
-            ('Access-Control-Allow-Headers', environ.get(
-                'HTTP_ACCESS_CONTROL_REQUEST_HEADERS', 'authorization')),
-            ('content-type', 'application/json'),
-            ('content-length', str(len(response_body)))]
+        response_headers.append(('content-length', str(len(response_body))))
         start_response(status, response_headers)
         return [response_body]
 
+    def call_batch(self, environ, reqs):
+        """
+        Handles a JSON-RPC batch. Each request in it gets its own context,
+        authentication and log lines, as if it had been sent on its own,
+        and they run concurrently if rpc-batch-workers is over 1. Returns the
+        JSON of the responses in request order, leaving out notifications,
+        or None if there are none.
+        """
+        def call(req):
+            ctx = MethodContext(self.userlog)
+            ctx['client_ip'] = getIPAddress(environ)
+            if not isinstance(req, dict):
+                req = {'version': '1.1', 'id': None}
+                err = {'error': {'code': -32600,
+                                 'name': 'Invalid Request',
+                                 'message': 'Batch entries must be objects'}}
+                return self._error_response(err, ctx, req)
+            try:
+                self._set_up_call(environ, ctx, req)
+                if (environ.get('HTTP_X_FORWARDED_FOR')):
+                    self.log(log.INFO, ctx, 'X-Forwarded-For: ' +
+                             environ.get('HTTP_X_FORWARDED_FOR'))
+                self.log(log.INFO, ctx, 'start method')
+                respond = self.rpc_service.call_py(ctx, req)
+                self.log(log.INFO, ctx, 'end method')
+                return respond
+            except JSONRPCError as jre:
+                err = {'error': {'code': jre.code,
+                                 'name': jre.message,
+                                 'message': jre.data
+                                 }
+                       }
+                trace = jre.trace if hasattr(jre, 'trace') else None
+                error = self._error_response(err, ctx, req, trace)
+            except Exception:
+                err = {'error': {'code': 0,
+                                 'name': 'Unexpected Server Error',
+                                 'message': 'An unexpected server error ' +
+                                            'occurred',
+                                 }
+                       }
+                error = self._error_response(err, ctx, req,
+                                             traceback.format_exc())
+            # notifications get no response, even when they fail
+            return error if req.get('id') is not None else None
+
+        responds = [respond for respond in self.rpc_service.map_batch(call, reqs)
+                    if respond is not None]
+        return self.codec.dumps(responds) if responds else None
+
+    def _set_up_call(self, environ, ctx, req):
+        """
+        Fills in ctx for the JSON-RPC request req, and checks the caller's
+        token if the method needs one.
+        """
+        ctx['module'], ctx['method'] = req['method'].split('.')
+        ctx['call_id'] = req.get('id')
+        ctx['rpc_context'] = {
+            'call_stack': [{'time': self.now_in_utc(),
+                            'method': req['method']}
+                           ]
+        }
+        prov_action = {'service': ctx['module'],
+                       'method': ctx['method'],
+                       'method_params': req.get('params')
+                       }
+        ctx['provenance'] = [prov_action]
+        token = environ.get('HTTP_AUTHORIZATION')
+        # parse out the method being requested and check if it
+        # has an authentication requirement
+        method_name = req['method']
+        entry = self.rpc_service.dispatch_table.get(method_name)
+        auth_req = entry.auth if entry else 'none'
+        if auth_req != 'none':
+            if token is None and auth_req == 'required':
+                err = JSONServerError()
+                err.data = (
+                    'Authentication required for ' +
+                    'narrative_job_mock ' +
+                    'but no authentication header was passed')
+                raise err
+            elif token is None and auth_req == 'optional':
+                pass
+            else:
+                try:
+                    user = self.auth_client.get_user(token)
+                    ctx['user_id'] = user
+                    ctx['authenticated'] = 1
+                    ctx['token'] = token
+                except Exception, e:
+                    if auth_req == 'required':
+                        err = JSONServerError()
+                        err.data = \
+                            "Token validation failed: %s" % e
+                        raise err
+
+    def job_events(self, environ, start_response, ctx):
+        """
+        Streams the state changes of the jobs given as job_id query
+        parameters (repeated or comma separated) as Server-Sent Events.
+        Each job's current state is sent first as a job_state event, then
+        again each time it changes. A check_error event is sent for jobs
+        that can't be checked. Once all of the jobs are finished an end event
+        is sent and the stream closes; clients should close their
+        EventSource then, or it will reconnect. If NJS can't be reached, a
+        poll_error event is sent and the stream stays open while it's
+        retried. The token must be sent in the Authorization header, never
+        in the URL, where it would end up in access logs; browsers can
+        read the stream with fetch() or an EventSource polyfill that sets
+        headers.
+        """
+        query = parse_qs(environ.get('QUERY_STRING', ''))
+        job_ids = [job_id for value in query.get('job_id', [])
+                   for job_id in value.split(',') if job_id]
+        token = environ.get('HTTP_AUTHORIZATION')
+        response_headers = [('Access-Control-Allow-Origin', '*'),
+                            ('Access-Control-Allow-Headers', environ.get(
+                                'HTTP_ACCESS_CONTROL_REQUEST_HEADERS', 'authorization'))]
+        if not job_ids:
+            return self._plain_response(start_response, '400 Bad Request',
+                                        response_headers, 'No job_id given')
+        if token is None:
+            return self._plain_response(
+                start_response, '401 Unauthorized', response_headers,
+                'Authentication required for narrative_job_mock ' +
+                'but no authentication header was passed')
+        try:
+            ctx['user_id'] = self.auth_client.get_user(token)
+        except Exception, e:
+            return self._plain_response(start_response, '401 Unauthorized',
+                                        response_headers,
+                                        'Token validation failed: %s' % e)
+        ctx['authenticated'] = 1
+        ctx['token'] = token
+        ctx['module'], ctx['method'] = 'narrative_job_mock', 'job_events'
+        self.log(log.INFO, ctx, 'start job events for %d jobs' % len(job_ids))
+        subscription = impl_narrative_job_mock.mocker.subscribe_job_states(token, job_ids)
+        response_headers.extend([('content-type', 'text/event-stream'),
+                                 ('cache-control', 'no-cache')])
+        start_response('200 OK', response_headers)
+        return self._job_event_stream(subscription, ctx)
+
+    def _job_event_stream(self, subscription, ctx):
+        try:
+            for name, data in subscription.events(self.events_keepalive):
+                if name is None:
+                    yield ': keep-alive\n\n'
+                else:
+                    yield 'event: %s\ndata: %s\n\n' % (name, self.codec.dumps(data))
+        finally:
+            # also reached when the client goes away and the server closes us
+            subscription.close()
+            self.log(log.INFO, ctx, 'end job events')
+
+    def _plain_response(self, start_response, status, response_headers, body):
+        start_response(status, response_headers + [('content-type', 'text/plain'),
+                                                    ('content-length', str(len(body)))])
+        return [body]
+
     def process_error(self, error, context, request, trace=None):
+        return self.codec.dumps(
+            self._error_response(error, context, request, trace))
+
+    def _error_response(self, error, context, request, trace=None):
         if trace:
             self.log(log.ERR, context, trace.split('\n')[0:-1])
         if 'id' in request:
@@ -475,7 +819,7 @@ class Application(object):
         else:
             error['version'] = '1.0'
             error['error']['error'] = trace
-        return json.dumps(error)
+        return error
 
     def now_in_utc(self):
         # noqa Taken from http://stackoverflow.com/questions/3401428/how-to-get-an-isoformat-datetime-string-including-the-default-timezone @IgnorePep8
@@ -518,35 +862,132 @@ except ImportError:
     pass
 
 _proc = None
+# the extra worker processes started by start_server
+_workers = list()
+
+
+class _ThreadPoolMixIn(ThreadingMixIn):
+    '''
+    Like ThreadingMixIn, but requests are handed to a fixed pool of
+    pool_size threads rather than each getting a new thread. The pool is
+    started on the first request in each process, so it works in forked
+    workers. A connection is only accepted once a pool thread is free, so
+    while this process is busy, other workers accept them instead.
+    '''
+    daemon_threads = True
+    pool_size = 1
+    _pool_pid = None
+
+    def _handle_request_noblock(self):
+        if self._pool_pid != os.getpid():
+            self._requests = Queue.Queue()
+            self._free = threading.Semaphore(self.pool_size)
+            for _ in range(self.pool_size):
+                t = threading.Thread(target=self._handle_requests)
+                t.daemon = True
+                t.start()
+            self._pool_pid = os.getpid()
+        self._free.acquire()
+        self._queued = False
+        try:
+            BaseServer._handle_request_noblock(self)
+        finally:
+            # nothing was accepted, e.g. another worker got the connection
+            if not self._queued:
+                self._free.release()
+
+    def process_request(self, request, client_address):
+        self._queued = True
+        self._requests.put((request, client_address))
+
+    def _handle_requests(self):
+        while True:
+            request, client_address = self._requests.get()
+            try:
+                self.process_request_thread(request, client_address)
+            finally:
+                self._free.release()
+
+
+class _ThreadPoolWSGIServer(_ThreadPoolMixIn, WSGIServer):
+    pass
 
 
-def start_server(host='localhost', port=0, newprocess=False):
+def _make_gevent_server(host, port, greenlets):
+    '''
+    A gevent WSGI server that serves up to greenlets requests at once in each
+    process. The standard library is monkey patched first, so the NJS and
+    auth clients, long polls and job event streams give way to other
+    requests while they wait instead of holding a thread.
+    '''
+    from gevent import monkey
+    monkey.patch_all()
+    from gevent.pool import Pool
+    from gevent.pywsgi import WSGIServer as _GeventWSGIServer
+    application.rpc_service.use_gevent = True
+    httpd = _GeventWSGIServer((host, port), application, spawn=Pool(greenlets))
+    # bind now, so the port is known and forked workers share the socket
+    httpd.init_socket()
+    return httpd
+
+
+def start_server(host='localhost', port=0, newprocess=False, threads=1,
+                 workers=1, use_gevent=False, greenlets=1000):
     '''
     By default, will start the server on localhost on a system assigned port
     in the main thread. Excecution of the main thread will stay in the server
     main loop until interrupted. To run the server in a separate process, and
     thus allow the stop_server method to be called, set newprocess = True. This
-    will also allow returning of the port number.'''
+    will also allow returning of the port number.
+
+    threads sets how many requests each process serves at once, from a pool
+    of that many threads. workers sets how many processes serve requests;
+    they're forked after the socket is opened and all accept from it.
+
+    With use_gevent, each process serves up to greenlets requests at once on
+    gevent instead, which suits many long polls and slow NJS calls; threads
+    is ignored.'''
 
     global _proc
     if _proc:
         raise RuntimeError('server is already running')
-    httpd = make_server(host, port, application)
-    port = httpd.server_address[1]
+    if use_gevent:
+        httpd = _make_gevent_server(host, port, greenlets)
+    elif threads > 1:
+        httpd = make_server(host, port, application,
+                            server_class=_ThreadPoolWSGIServer)
+        httpd.pool_size = threads
+    else:
+        httpd = make_server(host, port, application)
+    port = httpd.address[1] if use_gevent else httpd.server_address[1]
     print "Listening on port %s" % port
+    for _ in range(workers - 1):
+        worker = Process(target=httpd.serve_forever)
+        worker.daemon = True
+        worker.start()
+        _workers.append(worker)
     if newprocess:
         _proc = Process(target=httpd.serve_forever)
         _proc.daemon = True
         _proc.start()
     else:
-        httpd.serve_forever()
+        try:
+            httpd.serve_forever()
+        finally:
+            _stop_workers()
     return port
 
 
+def _stop_workers():
+    while _workers:
+        _workers.pop().terminate()
+
+
 def stop_server():
     global _proc
     _proc.terminate()
     _proc = None
+    _stop_workers()
 
 
 def process_async_cli(input_file_path, output_file_path, token):
@@ -609,23 +1050,38 @@ if __name__ == "__main__":
                 token = sys.argv[3]
         sys.exit(process_async_cli(sys.argv[1], sys.argv[2], token))
     try:
-        opts, args = getopt(sys.argv[1:], "", ["port=", "host="])
+        opts, args = getopt(sys.argv[1:], "", ["port=", "host=", "threads=",
+                                               "workers=", "gevent",
+                                               "greenlets="])
     except GetoptError as err:
         # print help information and exit:
         print str(err)  # will print something like "option -a not recognized"
         sys.exit(2)
     port = 9999
     host = 'localhost'
+    threads = 1
+    workers = 1
+    use_gevent = False
+    greenlets = 1000
     for o, a in opts:
         if o == '--port':
             port = int(a)
         elif o == '--host':
             host = a
             print "Host set to %s" % host
+        elif o == '--threads':
+            threads = int(a)
+        elif o == '--workers':
+            workers = int(a)
+        elif o == '--gevent':
+            use_gevent = True
+        elif o == '--greenlets':
+            greenlets = int(a)
         else:
             assert False, "unhandled option"
 
-    start_server(host=host, port=port)
+    start_server(host=host, port=port, threads=threads, workers=workers,
+                 use_gevent=use_gevent, greenlets=greenlets)
 #    print "Listening on port %s" % port
 #    httpd = make_server( host, port, application)
 #
@@ -0,0 +1,39 @@
+'''
+Sharing one call's result between threads that want the same thing at the
+same time, so only one of them makes it.
+'''
+import threading as _threading
+
+
+class Flight(object):
+    '''
+    A call in progress that other threads can wait on instead of making
+    their own. The thread that starts it (the leader) makes the call with
+    run; the others call wait, and get the same result or error.
+    '''
+
+    def __init__(self):
+        self.done = _threading.Event()
+        self.result = None
+        self.error = None
+
+    def run(self, f, *args):
+        '''
+        Calls f(*args), keeps its result or error for the waiters, and
+        returns or raises it.
+        '''
+        try:
+            self.result = f(*args)
+        except Exception as e:
+            self.error = e
+            raise
+        finally:
+            self.done.set()
+        return self.result
+
+    def wait(self):
+        ''' Waits for the leader's call, and returns or raises what it did. '''
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
@@ -1,67 +1,421 @@
-from NarrativeJobService.NarrativeJobServiceClient import NarrativeJobService
+import base64
+import hashlib
+import json
+import threading
+import time
+import zlib
 from pprint import pprint
+from clientpool import NJSClientPool
+from lrucache import LRUCache
+from jsoncodec import JSONFragment, get_codec
+from jobwatcher import JobWatcher
+from singleflight import Flight
 
 BATCH_APP_ID = "kb_BatchApp/run_batch"
 BATCH_APP_METHOD = "kb_BatchApp.run_batch"
+# NJS never changes a job once it reaches one of these
+TERMINAL_STATES = frozenset(["completed", "error", "canceled", "cancelled"])
+RESULT_KEYS = ("job_states", "job_params", "check_error")
+# mocked child jobs cycle through these states, in order
+MOCK_STATUS_ORDER = ("running", "error", "completed")
+SUB_JOBS_MODES = ("full", "summary", "none")
+# the parent fields copied into each mocked child
+MOCK_PARENT_FIELDS = ("canceled", "cancelled", "creation_time", "exec_start_time", "finish_time")
+# the fields check_jobs adds to batch job states
+MOCK_STATE_FIELDS = ("sub_jobs", "sub_jobs_total", "sub_jobs_summary")
+
+
+# shared by all mocked children, so these must not be modified
+MOCK_ERROR = {
+    "code": -32000,
+    "error": "An error occurred while running this child job. If this weren't a mockup, you should be worried.",
+    "message": "A dummy error happened.",
+    "name": "Mock Error"
+}
+MOCK_RESULT = [{
+    "report_ref": "123/45",
+    "report_name": "dummy_report"
+}]
+
+
+class MockBatch(object):
+    """
+    The mocked children of a batch job, from offset up to (not including) end.
+    Only the parent job id and the parent fields the children copy are kept;
+    the child dicts are built when the batch is serialized through
+    toJSONable, iterated or indexed. Child i is in state
+    MOCK_STATUS_ORDER[i % len(MOCK_STATUS_ORDER)].
+    """
+    __slots__ = ("job_id", "parent_fields", "offset", "end")
+
+    def __init__(self, job_id, parent_status, offset, end):
+        self.job_id = job_id
+        self.parent_fields = tuple(parent_status.get(field, 0) for field in MOCK_PARENT_FIELDS)
+        self.offset = offset
+        self.end = end
+
+    def __len__(self):
+        return max(0, self.end - self.offset)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('sub job index out of range')
+        return self._mock_job_status(self.offset + index)
+
+    def __iter__(self):
+        for i in range(self.offset, self.end):
+            yield self._mock_job_status(i)
+
+    def toJSONable(self):
+        return list(self)
+
+    def _mock_job_status(self, order):
+        job_state = MOCK_STATUS_ORDER[order % len(MOCK_STATUS_ORDER)]
+        job_status = dict(zip(MOCK_PARENT_FIELDS, self.parent_fields))
+        job_status["job_id"] = "{}_{}".format(self.job_id, order)
+        job_status["job_state"] = job_state
+        job_status["status"] = []
+        if job_state == "error":
+            job_status["error"] = MOCK_ERROR
+        elif job_state == "completed":
+            job_status["result"] = MOCK_RESULT
+        return job_status
+
+
+class _Batch(Flight):
+    """
+    Single job lookups for one token, collected during the batching window and
+    sent upstream as one check_jobs call.
+    """
+    def __init__(self):
+        super(_Batch, self).__init__()
+        self.job_ids = list()
 
 
 class StateMocker(object):
-    def __init__(self, cfg, token):
+    def __init__(self, cfg):
         self.cfg = cfg
         self.njs_url = self.cfg['njsw-url']
-        self.token = token
-        self.njs = NarrativeJobService(url=self.njs_url, token=token)
+        self.njs_clients = NJSClientPool(
+            self.njs_url,
+            maxsize=int(self.cfg.get('njs-client-cache-size', 500)),
+            ttl=int(self.cfg.get('njs-client-ttl-sec', 3600)),
+            pool_size=int(self.cfg.get('njs-http-pool-size', 10))
+        )
+        # (token, job_id) -> job_state for jobs that are finished
+        self.terminal_jobs = LRUCache(
+            maxsize=int(self.cfg.get('terminal-job-cache-size', 10000))
+        )
+        # (token, job_id) -> job_params, which never change after submission
+        self.job_params = LRUCache(
+            maxsize=int(self.cfg.get('job-params-cache-size', 10000))
+        )
+        # (token, job_id, with_job_params) -> Flight for upstream calls in progress
+        self._flights = dict()
+        self._flights_lock = threading.Lock()
+        self._flight_stats = {'upstream_calls': 0, 'coalesced_calls': 0, 'coalesced_jobs': 0}
+        # how long single check_job lookups wait to be batched together, 0 to disable
+        self.batch_window = float(self.cfg.get('check-job-batch-window-ms', 0)) / 1000.0
+        # token -> _Batch still open for lookups
+        self._batches = dict()
+        self._batches_lock = threading.Lock()
+        self._batch_stats = {'batches': 0, 'lookups': 0}
+        # (job_id, job_state, sub_jobs window and mode) -> JSONFragment of a finished
+        # job's state, and ('sub_jobs', job_id, batch size, parent fingerprint,
+        # sub_jobs window) -> JSONFragment of a batch job's mocked children, bounded
+        # by the size of the encoded JSON
+        self.job_fragments = LRUCache(
+            maxsize=int(float(self.cfg.get('job-fragment-cache-mb', 64)) * 1024 * 1024),
+            sizeof=lambda fragment: len(fragment.encoded)
+        )
+        self.codec = get_codec(self.cfg.get('json-codec', 'auto'))
+        # holds wait_for_job_states calls and job event streams, polling NJS for all
+        # of them at once
+        self.watcher = JobWatcher(
+            lambda token, job_ids: self.check_jobs(token, job_ids, False, sub_jobs_mode="none"),
+            poll_interval=float(self.cfg.get('wait-poll-interval-ms', 1000)) / 1000.0,
+            is_terminal=self._is_terminal
+        )
+        self.max_wait = float(self.cfg.get('wait-max-timeout-ms', 60000)) / 1000.0
 
-    def check_job(self, job_id):
-        status = self.check_jobs([job_id], True)
+    def check_job(self, token, job_id):
+        if self.batch_window > 0:
+            status = self._check_job_batched(token, job_id)
+        else:
+            status = self.check_jobs(token, [job_id], True)
         return status['job_states'].get(job_id, status['check_error'].get(job_id))
 
-    def check_jobs(self, job_list, with_job_params):
-        stats = self.njs.check_jobs({'job_ids': job_list, 'with_job_params': 1})
-        for job_id in stats['job_params']:
-            app_info = stats['job_params'][job_id]
+    def check_jobs(self, token, job_list, with_job_params, sub_jobs_offset=0, sub_jobs_limit=None,
+                   sub_jobs_mode="full", encode_fragments=False):
+        """
+        Returns the states of the jobs in job_list, and their params if
+        with_job_params is set, with mocked sub_jobs added to batch jobs.
+        If encode_fragments is set, the states of finished jobs are returned as
+        JSONFragments holding their encoded JSON, which is cached since those
+        states never change, and so are the mocked sub_jobs of every batch job.
+        Only the states of jobs still running, minus their sub_jobs, get
+        encoded on each poll.
+        The cache isn't keyed by token: a fragment is only handed out for a
+        job whose state this token just got from NJS or the terminal job
+        cache.
+        """
+        stats = dict((key, {}) for key in RESULT_KEYS)
+        # jobs we haven't seen need their params fetched once, the rest only
+        # need their state, and finished jobs don't need anything
+        need_params = list()
+        need_state = list()
+        for job_id in job_list:
+            params = self.job_params.get((token, job_id))
+            if params is None:
+                need_params.append(job_id)
+                continue
+            stats['job_params'][job_id] = params
+            state = self.terminal_jobs.get((token, job_id))
+            if state is None:
+                need_state.append(job_id)
+            else:
+                stats['job_states'][job_id] = dict(state)
+        for job_ids, get_params in [(need_params, True), (need_state, False)]:
+            if job_ids:
+                fetched = self._fetch_jobs(token, job_ids, get_params)
+                for key in stats:
+                    stats[key].update(fetched.get(key) or {})
+        for job_id, job_state in stats['job_states'].items():
+            fragment_key = None
+            if encode_fragments and self._is_terminal(job_state):
+                fragment_key = (job_id, job_state.get('job_state'), sub_jobs_offset,
+                                sub_jobs_limit, sub_jobs_mode)
+                fragment = self.job_fragments.get(fragment_key)
+                if fragment is not None:
+                    stats['job_states'][job_id] = fragment
+                    continue
+            app_info = stats['job_params'].get(job_id) or {}
             if app_info.get('app_id') == BATCH_APP_ID or app_info.get('method') == BATCH_APP_METHOD:
-                stats['job_states'][job_id]['sub_jobs'] = self._build_mock_batch(
-                    job_id, app_info, stats['job_states'][job_id]
-                )
+                job_state['sub_jobs_total'] = self._batch_size(app_info)
+                if sub_jobs_mode == "full":
+                    job_state['sub_jobs'] = self._build_mock_batch(
+                        job_id, app_info, job_state, sub_jobs_offset, sub_jobs_limit,
+                        encode=encode_fragments
+                    )
+                elif sub_jobs_mode == "summary":
+                    job_state['sub_jobs_summary'] = self._summarize_mock_batch(
+                        job_state['sub_jobs_total']
+                    )
+            if fragment_key is not None:
+                fragment = JSONFragment(job_state, self.codec.dumps(job_state))
+                self.job_fragments.put(fragment_key, fragment)
+                stats['job_states'][job_id] = fragment
         if not with_job_params:
             del stats['job_params']
         return stats
 
-    def _build_mock_batch(self, job_id, app_info, app_status):
-        """
-        Builds a list of mocked batch infos by using the list of inputs (in app_info)
-        """
-        mocked_status = list()
-        for i, param_set in enumerate(app_info['params'][0].get('batch_params', [])):
-            mock_job_id = "{}_{}".format(job_id, i)
-            mock_status = self._mock_job_status(i, mock_job_id, app_status)
-            mocked_status.append(mock_status)
-        return mocked_status
-
-    def _mock_job_status(self, order, job_id, parent_status):
-        status_order = ["running", "error", "completed"]
-        current_state = order % len(status_order)
-        job_status = {
-            "job_id": job_id,
-            "canceled": parent_status.get("canceled", 0),
-            "cancelled": parent_status.get("cancelled", 0),
-            "creation_time": parent_status.get("creation_time", 0),
-            "exec_start_time": parent_status.get("exec_start_time", 0),
-            "finish_time": parent_status.get("finish_time", 0),
-            "job_state": status_order[current_state],
-            "status": []
-        }
-        if status_order[current_state] == "error":
-            job_status["error"] = {
-                "code": -32000,
-                "error": "An error occurred while running this child job. If this weren't a mockup, you should be worried.",
-                "message": "A dummy error happened.",
-                "name": "Mock Error"
-            }
-        elif status_order[current_state] == "completed":
-            job_status["result"] = [{
-                "report_ref": "123/45",
-                "report_name": "dummy_report"
-            }]
-        return job_status
+    def check_jobs_since(self, token, job_list, cursor, with_job_params, sub_jobs_offset=0,
+                         sub_jobs_limit=None, sub_jobs_mode="full"):
+        """
+        Like check_jobs, but only returns the jobs whose state changed since
+        cursor was issued, along with a new cursor. The cursor holds a
+        version of each job's state, so it works against any server process.
+        An empty cursor, or one made with different options, gets every job
+        back. Errors from check_error are always returned.
+        """
+        known = self._decode_cursor(cursor)
+        options = [bool(with_job_params), sub_jobs_offset, sub_jobs_limit, sub_jobs_mode]
+        if known.get('o') != options:
+            known = {}
+        known_versions = known.get('v') or {}
+        stats = self.check_jobs(token, job_list, True, sub_jobs_offset, sub_jobs_limit,
+                                sub_jobs_mode, encode_fragments=True)
+        versions = dict()
+        changed = dict()
+        for job_id, job_state in stats['job_states'].items():
+            versions[job_id] = self._state_version(job_state)
+            if known_versions.get(job_id) != versions[job_id]:
+                changed[job_id] = job_state
+        stats['job_states'] = changed
+        if with_job_params:
+            stats['job_params'] = dict((job_id, stats['job_params'][job_id])
+                                       for job_id in changed if job_id in stats['job_params'])
+        else:
+            del stats['job_params']
+        stats['cursor'] = self._encode_cursor({'o': options, 'v': versions})
+        return stats
+
+    def wait_for_job_states(self, token, job_list, timeout_ms, known_states):
+        """
+        Waits up to timeout_ms (capped at the wait-max-timeout-ms setting)
+        for any job in job_list to leave its state in known_states, a mapping
+        of job id to job_state. Returns the states of the jobs that changed,
+        without sub_jobs, any check errors, and whether it timed out.
+        """
+        timeout = min(timeout_ms / 1000.0, self.max_wait)
+        return self.watcher.wait(token, job_list, known_states or {}, timeout)
+
+    def subscribe_job_states(self, token, job_list):
+        """
+        Returns a jobwatcher.Subscription that streams the state changes of
+        the jobs in job_list until they're all finished. States don't have
+        sub_jobs.
+        """
+        return self.watcher.subscribe(token, job_list)
+
+    def _check_job_batched(self, token, job_id):
+        """
+        Adds job_id to the open batch for this token, or opens one. The thread
+        that opens a batch waits out the window, then checks every job that
+        was added to it in one call and shares the result with the others.
+        """
+        with self._batches_lock:
+            batch = self._batches.get(token)
+            leader = batch is None
+            if leader:
+                batch = _Batch()
+                self._batches[token] = batch
+                self._batch_stats['batches'] += 1
+            if job_id not in batch.job_ids:
+                batch.job_ids.append(job_id)
+            self._batch_stats['lookups'] += 1
+        if not leader:
+            return batch.wait()
+
+        time.sleep(self.batch_window)
+        with self._batches_lock:
+            del self._batches[token]
+        return batch.run(self.check_jobs, token, batch.job_ids, True)
+
+    def stats(self):
+        return {'njs_clients': self.njs_clients.stats(),
+                'terminal_jobs': self.terminal_jobs.stats(),
+                'job_params': self.job_params.stats(),
+                'upstream': dict(self._flight_stats),
+                'check_job_batches': dict(self._batch_stats),
+                'job_fragments': self.job_fragments.stats(),
+                'waits': self.watcher.stats()}
+
+    def _fetch_jobs(self, token, job_ids, with_job_params):
+        """
+        Fetches job states (and params, if asked) for the given jobs. Jobs that
+        another thread is already fetching for the same token are waited on
+        and shared, and only the rest go to NJS.
+        """
+        own = list()
+        waiting = dict()
+        with self._flights_lock:
+            for job_id in job_ids:
+                flight = self._flights.get((token, job_id, True))
+                if flight is None and not with_job_params:
+                    flight = self._flights.get((token, job_id, False))
+                if flight is None:
+                    own.append(job_id)
+                else:
+                    waiting[job_id] = flight
+            if own:
+                my_flight = Flight()
+                for job_id in own:
+                    self._flights[(token, job_id, with_job_params)] = my_flight
+                self._flight_stats['upstream_calls'] += 1
+            if waiting:
+                self._flight_stats['coalesced_calls'] += 1
+                self._flight_stats['coalesced_jobs'] += len(waiting)
+
+        fetched = dict((key, {}) for key in RESULT_KEYS)
+        if own:
+            try:
+                my_flight.run(self._call_njs, token, own, with_job_params)
+            finally:
+                with self._flights_lock:
+                    for job_id in own:
+                        key = (token, job_id, with_job_params)
+                        if self._flights.get(key) is my_flight:
+                            del self._flights[key]
+            self._copy_results(my_flight.result, own, fetched)
+        for job_id, flight in waiting.items():
+            self._copy_results(flight.wait(), [job_id], fetched)
+        return fetched
+
+    def _copy_results(self, source, job_ids, dest):
+        """
+        Copies the results for job_ids from a shared check_jobs result into
+        dest. States are copied, since callers add sub_jobs to them.
+        """
+        for key in RESULT_KEYS:
+            found = source.get(key) or {}
+            for job_id in job_ids:
+                if job_id in found:
+                    value = found[job_id]
+                    dest[key][job_id] = dict(value) if key == 'job_states' else value
+
+    def _call_njs(self, token, job_ids, with_job_params):
+        """
+        Calls NJS check_jobs and caches the parts of the result that won't change.
+        """
+        njs = self.njs_clients.get_client(token)
+        fetched = njs.check_jobs({'job_ids': job_ids,
+                                  'with_job_params': 1 if with_job_params else 0})
+        for job_id, params in (fetched.get('job_params') or {}).items():
+            self.job_params.put((token, job_id), params)
+        for job_id, state in (fetched.get('job_states') or {}).items():
+            if self._is_terminal(state):
+                self.terminal_jobs.put((token, job_id), dict(state))
+        return fetched
+
+    def _is_terminal(self, state):
+        return bool(state.get('finished')) or state.get('job_state') in TERMINAL_STATES
+
+    def _batch_size(self, app_info):
+        return len(app_info['params'][0].get('batch_params', []))
+
+    def _build_mock_batch(self, job_id, app_info, app_status, offset=0, limit=None,
+                          encode=False):
+        """
+        Builds the mocked batch infos by using the list of inputs (in app_info),
+        as a MockBatch that makes the child dicts when it's serialized.
+        Only the children from offset up to offset + limit (or the end, if limit
+        is None) are built.
+        If encode is set, a JSONFragment of the MockBatch is returned instead.
+        The children only depend on the parent fields in MOCK_PARENT_FIELDS, so
+        the fragment is cached and reused until those change, even while the
+        parent job is still running.
+        """
+        total = self._batch_size(app_info)
+        end = total if limit is None else min(total, offset + limit)
+        mock_batch = MockBatch(job_id, app_status, offset, end)
+        if not encode:
+            return mock_batch
+        key = ('sub_jobs', job_id, total, mock_batch.parent_fields, offset, limit)
+        fragment = self.job_fragments.get(key)
+        if fragment is None:
+            fragment = JSONFragment(mock_batch, self.codec.dumps(mock_batch))
+            self.job_fragments.put(key, fragment)
+        return fragment
+
+    def _summarize_mock_batch(self, total):
+        """
+        Counts the mocked children in each state without building them. Child i
+        is in state MOCK_STATUS_ORDER[i % len(MOCK_STATUS_ORDER)].
+        """
+        cycles, remainder = divmod(total, len(MOCK_STATUS_ORDER))
+        return dict((state, cycles + (1 if i < remainder else 0))
+                    for i, state in enumerate(MOCK_STATUS_ORDER))
+
+    def _state_version(self, job_state):
+        """
+        A short hash of a job's state from NJS. The mocked sub_jobs fields are
+        left out, since they only follow from the rest of the state.
+        """
+        state = job_state.value if isinstance(job_state, JSONFragment) else job_state
+        upstream = dict((key, value) for key, value in state.items()
+                        if key not in MOCK_STATE_FIELDS)
+        return hashlib.md5(json.dumps(upstream, sort_keys=True)).hexdigest()[:16]
+
+    def _encode_cursor(self, cursor):
+        return base64.urlsafe_b64encode(zlib.compress(json.dumps(cursor, sort_keys=True)))
+
+    def _decode_cursor(self, cursor):
+        if not cursor:
+            return {}
+        try:
+            return json.loads(zlib.decompress(base64.urlsafe_b64decode(str(cursor))))
+        except (TypeError, ValueError, zlib.error):
+            raise ValueError('Invalid cursor')
@@ -14,14 +14,27 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
 
 /**
  * <p>Original spec-file type: CheckJobsParams</p>
- * 
+ * <pre>
+ * job_ids - ids of jobs to check;
+ * with_job_params - if true, also return the parameters of the jobs;
+ * sub_jobs_offset, sub_jobs_limit - for batch jobs, only return the child
+ *     jobs in this window, starting at sub_jobs_offset (default 0) and
+ *     returning at most sub_jobs_limit of them (default all);
+ * sub_jobs_mode - how to report the child jobs of batch jobs. 'full'
+ *     (the default) returns them in sub_jobs, 'summary' only returns
+ *     the number in each state in sub_jobs_summary, and 'none' returns
+ *     neither.
+ * </pre>
  * 
  */
 @JsonInclude(JsonInclude.Include.NON_NULL)
 @Generated("com.googlecode.jsonschema2pojo")
 @JsonPropertyOrder({
     "job_ids",
-    "with_job_params"
+    "with_job_params",
+    "sub_jobs_offset",
+    "sub_jobs_limit",
+    "sub_jobs_mode"
 })
 public class CheckJobsParams {
 
@@ -29,6 +42,12 @@ public class CheckJobsParams {
     private List<String> jobIds;
     @JsonProperty("with_job_params")
     private Long withJobParams;
+    @JsonProperty("sub_jobs_offset")
+    private Long subJobsOffset;
+    @JsonProperty("sub_jobs_limit")
+    private Long subJobsLimit;
+    @JsonProperty("sub_jobs_mode")
+    private String subJobsMode;
     private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
 
     @JsonProperty("job_ids")
@@ -61,6 +80,51 @@ public class CheckJobsParams {
         return this;
     }
 
+    @JsonProperty("sub_jobs_offset")
+    public Long getSubJobsOffset() {
+        return subJobsOffset;
+    }
+
+    @JsonProperty("sub_jobs_offset")
+    public void setSubJobsOffset(Long subJobsOffset) {
+        this.subJobsOffset = subJobsOffset;
+    }
+
+    public CheckJobsParams withSubJobsOffset(Long subJobsOffset) {
+        this.subJobsOffset = subJobsOffset;
+        return this;
+    }
+
+    @JsonProperty("sub_jobs_limit")
+    public Long getSubJobsLimit() {
+        return subJobsLimit;
+    }
+
+    @JsonProperty("sub_jobs_limit")
+    public void setSubJobsLimit(Long subJobsLimit) {
+        this.subJobsLimit = subJobsLimit;
+    }
+
+    public CheckJobsParams withSubJobsLimit(Long subJobsLimit) {
+        this.subJobsLimit = subJobsLimit;
+        return this;
+    }
+
+    @JsonProperty("sub_jobs_mode")
+    public String getSubJobsMode() {
+        return subJobsMode;
+    }
+
+    @JsonProperty("sub_jobs_mode")
+    public void setSubJobsMode(String subJobsMode) {
+        this.subJobsMode = subJobsMode;
+    }
+
+    public CheckJobsParams withSubJobsMode(String subJobsMode) {
+        this.subJobsMode = subJobsMode;
+        return this;
+    }
+
     @JsonAnyGetter
     public Map<java.lang.String, Object> getAdditionalProperties() {
         return this.additionalProperties;
@@ -73,7 +137,7 @@ public class CheckJobsParams {
 
     @Override
     public java.lang.String toString() {
-        return ((((((("CheckJobsParams"+" [jobIds=")+ jobIds)+", withJobParams=")+ withJobParams)+", additionalProperties=")+ additionalProperties)+"]");
+        return ((((((((((((("CheckJobsParams"+" [jobIds=")+ jobIds)+", withJobParams=")+ withJobParams)+", subJobsOffset=")+ subJobsOffset)+", subJobsLimit=")+ subJobsLimit)+", subJobsMode=")+ subJobsMode)+", additionalProperties=")+ additionalProperties)+"]");
     }
 
 }
@@ -0,0 +1,157 @@
+
+package us.kbase.narrativejobmock;
+
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: CheckJobsSinceParams</p>
+ * <pre>
+ * job_ids - ids of jobs to check;
+ * cursor - the cursor returned by the last call to check_jobs_since for
+ *     these jobs, or empty to get the states of all of them;
+ * with_job_params, sub_jobs_offset, sub_jobs_limit, sub_jobs_mode - as in
+ *     CheckJobsParams. Changing these makes the cursor start over.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "job_ids",
+    "cursor",
+    "with_job_params",
+    "sub_jobs_offset",
+    "sub_jobs_limit",
+    "sub_jobs_mode"
+})
+public class CheckJobsSinceParams {
+
+    @JsonProperty("job_ids")
+    private List<String> jobIds;
+    @JsonProperty("cursor")
+    private String cursor;
+    @JsonProperty("with_job_params")
+    private Long withJobParams;
+    @JsonProperty("sub_jobs_offset")
+    private Long subJobsOffset;
+    @JsonProperty("sub_jobs_limit")
+    private Long subJobsLimit;
+    @JsonProperty("sub_jobs_mode")
+    private String subJobsMode;
+    private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
+
+    @JsonProperty("job_ids")
+    public List<String> getJobIds() {
+        return jobIds;
+    }
+
+    @JsonProperty("job_ids")
+    public void setJobIds(List<String> jobIds) {
+        this.jobIds = jobIds;
+    }
+
+    public CheckJobsSinceParams withJobIds(List<String> jobIds) {
+        this.jobIds = jobIds;
+        return this;
+    }
+
+    @JsonProperty("cursor")
+    public String getCursor() {
+        return cursor;
+    }
+
+    @JsonProperty("cursor")
+    public void setCursor(String cursor) {
+        this.cursor = cursor;
+    }
+
+    public CheckJobsSinceParams withCursor(String cursor) {
+        this.cursor = cursor;
+        return this;
+    }
+
+    @JsonProperty("with_job_params")
+    public Long getWithJobParams() {
+        return withJobParams;
+    }
+
+    @JsonProperty("with_job_params")
+    public void setWithJobParams(Long withJobParams) {
+        this.withJobParams = withJobParams;
+    }
+
+    public CheckJobsSinceParams withWithJobParams(Long withJobParams) {
+        this.withJobParams = withJobParams;
+        return this;
+    }
+
+    @JsonProperty("sub_jobs_offset")
+    public Long getSubJobsOffset() {
+        return subJobsOffset;
+    }
+
+    @JsonProperty("sub_jobs_offset")
+    public void setSubJobsOffset(Long subJobsOffset) {
+        this.subJobsOffset = subJobsOffset;
+    }
+
+    public CheckJobsSinceParams withSubJobsOffset(Long subJobsOffset) {
+        this.subJobsOffset = subJobsOffset;
+        return this;
+    }
+
+    @JsonProperty("sub_jobs_limit")
+    public Long getSubJobsLimit() {
+        return subJobsLimit;
+    }
+
+    @JsonProperty("sub_jobs_limit")
+    public void setSubJobsLimit(Long subJobsLimit) {
+        this.subJobsLimit = subJobsLimit;
+    }
+
+    public CheckJobsSinceParams withSubJobsLimit(Long subJobsLimit) {
+        this.subJobsLimit = subJobsLimit;
+        return this;
+    }
+
+    @JsonProperty("sub_jobs_mode")
+    public String getSubJobsMode() {
+        return subJobsMode;
+    }
+
+    @JsonProperty("sub_jobs_mode")
+    public void setSubJobsMode(String subJobsMode) {
+        this.subJobsMode = subJobsMode;
+    }
+
+    public CheckJobsSinceParams withSubJobsMode(String subJobsMode) {
+        this.subJobsMode = subJobsMode;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<java.lang.String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(java.lang.String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public java.lang.String toString() {
+        return ((((((((((((((("CheckJobsSinceParams"+" [jobIds=")+ jobIds)+", cursor=")+ cursor)+", withJobParams=")+ withJobParams)+", subJobsOffset=")+ subJobsOffset)+", subJobsLimit=")+ subJobsLimit)+", subJobsMode=")+ subJobsMode)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
@@ -31,6 +31,10 @@ import us.kbase.common.service.UObject;
  *     start and finish events in milliseconds since Unix Epoch,
  * canceled - whether the job is canceled or not.
  * cancelled - Deprecated field, please use 'canceled' field instead.
+ * sub_jobs - for batch jobs, the states of the child jobs in the requested window;
+ * sub_jobs_total - for batch jobs, the total number of child jobs;
+ * sub_jobs_summary - for batch jobs checked in 'summary' mode, the number
+ *     of child jobs in each state.
  * </pre>
  * 
  */
@@ -50,7 +54,9 @@ import us.kbase.common.service.UObject;
     "finish_time",
     "cancelled",
     "canceled",
-    "sub_jobs"
+    "sub_jobs",
+    "sub_jobs_total",
+    "sub_jobs_summary"
 })
 public class JobState {
 
@@ -89,7 +95,11 @@ public class JobState {
     private Long canceled;
     @JsonProperty("sub_jobs")
     private UObject subJobs;
-    private Map<String, Object> additionalProperties = new HashMap<String, Object>();
+    @JsonProperty("sub_jobs_total")
+    private Long subJobsTotal;
+    @JsonProperty("sub_jobs_summary")
+    private Map<String, Long> subJobsSummary;
+    private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
 
     @JsonProperty("job_id")
     public String getJobId() {
@@ -315,19 +325,49 @@ public class JobState {
         return this;
     }
 
+    @JsonProperty("sub_jobs_total")
+    public Long getSubJobsTotal() {
+        return subJobsTotal;
+    }
+
+    @JsonProperty("sub_jobs_total")
+    public void setSubJobsTotal(Long subJobsTotal) {
+        this.subJobsTotal = subJobsTotal;
+    }
+
+    public JobState withSubJobsTotal(Long subJobsTotal) {
+        this.subJobsTotal = subJobsTotal;
+        return this;
+    }
+
+    @JsonProperty("sub_jobs_summary")
+    public Map<String, Long> getSubJobsSummary() {
+        return subJobsSummary;
+    }
+
+    @JsonProperty("sub_jobs_summary")
+    public void setSubJobsSummary(Map<String, Long> subJobsSummary) {
+        this.subJobsSummary = subJobsSummary;
+    }
+
+    public JobState withSubJobsSummary(Map<String, Long> subJobsSummary) {
+        this.subJobsSummary = subJobsSummary;
+        return this;
+    }
+
     @JsonAnyGetter
-    public Map<String, Object> getAdditionalProperties() {
+    public Map<java.lang.String, Object> getAdditionalProperties() {
         return this.additionalProperties;
     }
 
     @JsonAnySetter
-    public void setAdditionalProperties(String name, Object value) {
+    public void setAdditionalProperties(java.lang.String name, Object value) {
         this.additionalProperties.put(name, value);
     }
 
     @Override
-    public String toString() {
-        return ((((((((((((((((((((((((((((((("JobState"+" [jobId=")+ jobId)+", finished=")+ finished)+", ujsUrl=")+ ujsUrl)+", status=")+ status)+", result=")+ result)+", error=")+ error)+", jobState=")+ jobState)+", position=")+ position)+", creationTime=")+ creationTime)+", execStartTime=")+ execStartTime)+", finishTime=")+ finishTime)+", cancelled=")+ cancelled)+", canceled=")+ canceled)+", subJobs=")+ subJobs)+", additionalProperties=")+ additionalProperties)+"]");
+    public java.lang.String toString() {
+        return ((((((((((((((((((((((((((((((((((("JobState"+" [jobId=")+ jobId)+", finished=")+ finished)+", ujsUrl=")+ ujsUrl)+", status=")+ status)+", result=")+ result)+", error=")+ error)+", jobState=")+ jobState)+", position=")+ position)+", creationTime=")+ creationTime)+", execStartTime=")+ execStartTime)+", finishTime=")+ finishTime)+", cancelled=")+ cancelled)+", canceled=")+ canceled)+", subJobs=")+ subJobs)+", subJobsTotal=")+ subJobsTotal)+", subJobsSummary=")+ subJobsSummary)+", additionalProperties=")+ additionalProperties)+"]");
     }
 
 }
@@ -197,6 +197,50 @@ public class NarrativeJobMockClient {
         return res.get(0);
     }
 
+    /**
+     * <p>Original spec-file function name: check_jobs_since</p>
+     * <pre>
+     * Like check_jobs, but only returns the jobs whose state changed since
+     * the given cursor, along with a new cursor.
+     * </pre>
+     * @param   params   instance of type {@link us.kbase.narrativejobmock.CheckJobsSinceParams CheckJobsSinceParams}
+     * @return   instance of type {@link us.kbase.narrativejobmock.CheckJobsSinceResults CheckJobsSinceResults}
+     * @throws IOException if an IO exception occurs
+     * @throws JsonClientException if a JSON RPC exception occurs
+     */
+    public CheckJobsSinceResults checkJobsSince(CheckJobsSinceParams params, RpcContext... jsonRpcContext) throws IOException, JsonClientException {
+        List<Object> args = new ArrayList<Object>();
+        args.add(params);
+        TypeReference<List<CheckJobsSinceResults>> retType = new TypeReference<List<CheckJobsSinceResults>>() {};
+        List<CheckJobsSinceResults> res = caller.jsonrpcCall("narrative_job_mock.check_jobs_since", args, retType, true, true, jsonRpcContext, this.serviceVersion);
+        return res.get(0);
+    }
+
+    /**
+     * <p>Original spec-file function name: wait_for_job_states</p>
+     * <pre>
+     * Waits for any of the given jobs to leave the state the caller knows it
+     * to be in, or for timeout_ms milliseconds to pass, whichever is first.
+     * known_states maps job ids to their last known job_state; jobs not in it
+     * count as changed. The timeout is capped by the server.
+     * </pre>
+     * @param   jobIds   instance of list of original type "job_id" (A job id.)
+     * @param   timeoutMs   instance of Long
+     * @param   knownStates   instance of mapping from original type "job_id" (A job id.) to String
+     * @return   parameter "results" of type {@link us.kbase.narrativejobmock.WaitForJobStatesResults WaitForJobStatesResults}
+     * @throws IOException if an IO exception occurs
+     * @throws JsonClientException if a JSON RPC exception occurs
+     */
+    public WaitForJobStatesResults waitForJobStates(List<String> jobIds, Long timeoutMs, Map<String,String> knownStates, RpcContext... jsonRpcContext) throws IOException, JsonClientException {
+        List<Object> args = new ArrayList<Object>();
+        args.add(jobIds);
+        args.add(timeoutMs);
+        args.add(knownStates);
+        TypeReference<List<WaitForJobStatesResults>> retType = new TypeReference<List<WaitForJobStatesResults>>() {};
+        List<WaitForJobStatesResults> res = caller.jsonrpcCall("narrative_job_mock.wait_for_job_states", args, retType, true, true, jsonRpcContext, this.serviceVersion);
+        return res.get(0);
+    }
+
     public Map<String, Object> status(RpcContext... jsonRpcContext) throws IOException, JsonClientException {
         List<Object> args = new ArrayList<Object>();
         TypeReference<List<Map<String, Object>>> retType = new TypeReference<List<Map<String, Object>>>() {};
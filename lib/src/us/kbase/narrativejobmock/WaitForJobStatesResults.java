@@ -0,0 +1,101 @@
+
+package us.kbase.narrativejobmock;
+
+import java.util.HashMap;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: WaitForJobStatesResults</p>
+ * <pre>
+ * job_states - states of the jobs that are no longer in their known
+ *     state, without sub_jobs;
+ * check_error - errors that happened while checking jobs;
+ * timed_out - true if no job changed before the timeout.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "job_states",
+    "check_error",
+    "timed_out"
+})
+public class WaitForJobStatesResults {
+
+    @JsonProperty("job_states")
+    private Map<String, JobState> jobStates;
+    @JsonProperty("check_error")
+    private Map<String, JsonRpcError> checkError;
+    @JsonProperty("timed_out")
+    private Long timedOut;
+    private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
+
+    @JsonProperty("job_states")
+    public Map<String, JobState> getJobStates() {
+        return jobStates;
+    }
+
+    @JsonProperty("job_states")
+    public void setJobStates(Map<String, JobState> jobStates) {
+        this.jobStates = jobStates;
+    }
+
+    public WaitForJobStatesResults withJobStates(Map<String, JobState> jobStates) {
+        this.jobStates = jobStates;
+        return this;
+    }
+
+    @JsonProperty("check_error")
+    public Map<String, JsonRpcError> getCheckError() {
+        return checkError;
+    }
+
+    @JsonProperty("check_error")
+    public void setCheckError(Map<String, JsonRpcError> checkError) {
+        this.checkError = checkError;
+    }
+
+    public WaitForJobStatesResults withCheckError(Map<String, JsonRpcError> checkError) {
+        this.checkError = checkError;
+        return this;
+    }
+
+    @JsonProperty("timed_out")
+    public Long getTimedOut() {
+        return timedOut;
+    }
+
+    @JsonProperty("timed_out")
+    public void setTimedOut(Long timedOut) {
+        this.timedOut = timedOut;
+    }
+
+    public WaitForJobStatesResults withTimedOut(Long timedOut) {
+        this.timedOut = timedOut;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<java.lang.String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(java.lang.String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public java.lang.String toString() {
+        return ((((((((("WaitForJobStatesResults"+" [jobStates=")+ jobStates)+", checkError=")+ checkError)+", timedOut=")+ timedOut)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
@@ -112,6 +112,10 @@ module narrative_job_mock {
             start and finish events in milliseconds since Unix Epoch,
         canceled - whether the job is canceled or not.
         cancelled - Deprecated field, please use 'canceled' field instead.
+        sub_jobs - for batch jobs, the states of the child jobs in the requested window;
+        sub_jobs_total - for batch jobs, the total number of child jobs;
+        sub_jobs_summary - for batch jobs checked in 'summary' mode, the number
+            of child jobs in each state.
     */
     typedef structure {
         string job_id;
@@ -128,6 +132,8 @@ module narrative_job_mock {
         boolean cancelled;
         boolean canceled;
         UnspecifiedObject sub_jobs;
+        int sub_jobs_total;
+        mapping<string, int> sub_jobs_summary;
     } JobState;
 
     /*
@@ -135,9 +141,23 @@ module narrative_job_mock {
     */
     funcdef check_job(job_id job_id) returns (JobState job_state) authentication required;
 
+    /*
+        job_ids - ids of jobs to check;
+        with_job_params - if true, also return the parameters of the jobs;
+        sub_jobs_offset, sub_jobs_limit - for batch jobs, only return the child
+            jobs in this window, starting at sub_jobs_offset (default 0) and
+            returning at most sub_jobs_limit of them (default all);
+        sub_jobs_mode - how to report the child jobs of batch jobs. 'full'
+            (the default) returns them in sub_jobs, 'summary' only returns
+            the number in each state in sub_jobs_summary, and 'none' returns
+            neither.
+    */
     typedef structure {
         list<job_id> job_ids;
         boolean with_job_params;
+        int sub_jobs_offset;
+        int sub_jobs_limit;
+        string sub_jobs_mode;
     } CheckJobsParams;
 
     /*
@@ -154,4 +174,62 @@ module narrative_job_mock {
     funcdef check_jobs(CheckJobsParams params) returns (CheckJobsResults)
         authentication required;
 
+    /*
+        job_ids - ids of jobs to check;
+        cursor - the cursor returned by the last call to check_jobs_since for
+            these jobs, or empty to get the states of all of them;
+        with_job_params, sub_jobs_offset, sub_jobs_limit, sub_jobs_mode - as in
+            CheckJobsParams. Changing these makes the cursor start over.
+    */
+    typedef structure {
+        list<job_id> job_ids;
+        string cursor;
+        boolean with_job_params;
+        int sub_jobs_offset;
+        int sub_jobs_limit;
+        string sub_jobs_mode;
+    } CheckJobsSinceParams;
+
+    /*
+        job_states - states of jobs that changed since the cursor was issued,
+        job_params - parameters of those jobs,
+        check_error - this map includes info about errors happening during job checking,
+        cursor - pass this to the next call to only get the jobs that change after this one.
+    */
+    typedef structure {
+        mapping<job_id, JobState> job_states;
+        mapping<job_id, RunJobParams> job_params;
+        mapping<job_id, JsonRpcError> check_error;
+        string cursor;
+    } CheckJobsSinceResults;
+
+    /*
+        Like check_jobs, but only returns the jobs whose state changed since
+        the given cursor, along with a new cursor.
+    */
+    funcdef check_jobs_since(CheckJobsSinceParams params) returns (CheckJobsSinceResults)
+        authentication required;
+
+    /*
+        job_states - states of the jobs that are no longer in their known
+            state, without sub_jobs;
+        check_error - errors that happened while checking jobs;
+        timed_out - true if no job changed before the timeout.
+    */
+    typedef structure {
+        mapping<job_id, JobState> job_states;
+        mapping<job_id, JsonRpcError> check_error;
+        boolean timed_out;
+    } WaitForJobStatesResults;
+
+    /*
+        Waits for any of the given jobs to leave the state the caller knows it
+        to be in, or for timeout_ms milliseconds to pass, whichever is first.
+        known_states maps job ids to their last known job_state; jobs not in it
+        count as changed. The timeout is capped by the server.
+    */
+    funcdef wait_for_job_states(list<job_id> job_ids, int timeout_ms,
+        mapping<job_id, string> known_states) returns (WaitForJobStatesResults results)
+        authentication required;
+
 };
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import unittest
+import threading
+import time
+
+from narrative_job_mock.asynclog import AsyncLogWriter, INFO, WARNING
+
+ERR = 3
+
+
+class FakeLog(object):
+    '''
+    Records log_message calls. If gate is set, writes block until it's released.
+    '''
+
+    def __init__(self):
+        self.messages = list()
+        self.gate = None
+
+    def log_message(self, level, message, *args):
+        if self.gate is not None:
+            self.gate.wait()
+        self.messages.append((level, message) + args)
+
+
+class AsyncLogWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.target = FakeLog()
+
+    def wait_for(self, count):
+        for _ in range(200):
+            if len(self.target.messages) >= count:
+                return
+            time.sleep(0.01)
+
+    def test_writes_in_order(self):
+        writer = AsyncLogWriter(self.target)
+        for i in range(50):
+            writer.log_message(INFO, 'message %d' % i, 'ip', 'user', 'mod', 'meth', str(i))
+        self.wait_for(50)
+        self.assertEqual([m[1] for m in self.target.messages],
+                         ['message %d' % i for i in range(50)])
+        self.assertEqual(self.target.messages[0][2:], ('ip', 'user', 'mod', 'meth', '0'))
+
+    def test_drop_policy(self):
+        self.target.gate = threading.Event()
+        writer = AsyncLogWriter(self.target, queue_size=2, policy='drop')
+        writer.log_message(INFO, 'first')
+        # wait for the writer to pick up the first message and block on it
+        while writer._queue.qsize():
+            time.sleep(0.001)
+        for i in range(5):
+            writer.log_message(INFO, 'more %d' % i)
+        self.target.gate.set()
+        self.wait_for(4)
+        self.assertEqual(sorted(self.target.messages), [
+            (WARNING, 'Dropped 3 log messages'),
+            (INFO, 'first'), (INFO, 'more 0'), (INFO, 'more 1')
+        ])
+
+    def test_sampling(self):
+        writer = AsyncLogWriter(self.target, info_sample_rate=0.5)
+        for i in range(1000):
+            for message in ('start method', 'end method'):
+                writer.log_message(INFO, message, 'ip', 'user', 'mod', 'meth', str(i))
+        writer.log_message(ERR, 'an error', 'ip', 'user', 'mod', 'meth', '1')
+        expected = sum(1 for i in range(1000) if writer._sampled(('ip', str(i))))
+        self.assertTrue(400 < expected < 600)
+        self.wait_for(expected * 2 + 1)
+        kept = [m for m in self.target.messages if m[0] == INFO]
+        self.assertEqual(len(kept), expected * 2)
+        # requests are kept or dropped whole
+        self.assertEqual(len(set(m[-1] for m in kept)) * 2, len(kept))
+        self.assertIn('an error', [m[1] for m in self.target.messages])
+
+    def test_bad_policy(self):
+        with self.assertRaises(ValueError):
+            AsyncLogWriter(self.target, policy='sometimes')
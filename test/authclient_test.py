@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+import unittest
+import threading
+
+from narrative_job_mock import authclient
+from narrative_job_mock.authclient import KBaseAuth, TokenCache
+
+
+class FakeResponse(object):
+
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.ok = status_code == 200
+        self.reason = 'OK' if self.ok else 'Unauthorized'
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+class FakeAuthService(object):
+    '''
+    Stands in for the requests module, answering auth service posts. Tokens
+    starting with 'bad' or in revoked are rejected. If gate is set, posts block until it's
+    released. If down is set, it answers with a server error, and if throttled, with a 429.
+    '''
+
+    def __init__(self):
+        self.posts = list()
+        self.gate = None
+        self.entered = threading.Event()
+        self.down = False
+        self.throttled = False
+        self.revoked = set()
+
+    def post(self, url, data=None):
+        self.posts.append(data['token'])
+        self.entered.set()
+        if self.gate is not None:
+            self.gate.wait()
+        if self.down:
+            return FakeResponse(503, {'error': {'message': 'Service unavailable'}})
+        if self.throttled:
+            return FakeResponse(429, {'error': {'message': 'Too many requests'}})
+        if data['token'].startswith('bad') or data['token'] in self.revoked:
+            return FakeResponse(401, {'error': {'message': 'Invalid token'}})
+        return FakeResponse(200, {'user_id': 'user_' + data['token']})
+
+
+class TokenCacheTest(unittest.TestCase):
+
+    def test_get_add(self):
+        cache = TokenCache(maxsize=100, stripes=4)
+        self.assertIsNone(cache.get_user('token'))
+        cache.add_valid_token('token', 'user')
+        self.assertEqual(cache.get_user('token'), 'user')
+        with self.assertRaises(ValueError):
+            cache.add_valid_token('', 'user')
+        with self.assertRaises(ValueError):
+            cache.add_valid_token('token', None)
+
+    def test_stripes_share_maxsize(self):
+        cache = TokenCache(maxsize=100, stripes=4)
+        for i in range(1000):
+            cache.add_valid_token('token_%d' % i, 'user_%d' % i)
+        self.assertEqual(sum(len(stripe) for stripe in cache._stripes), 100)
+        self.assertEqual(cache.get_user('token_999'), 'user_999')
+
+    def test_digest_memo_bounded(self):
+        cache = TokenCache(digest_cache_size=10)
+        for i in range(25):
+            cache.get_user('token_%d' % i)
+        self.assertLessEqual(len(cache._digests), 10)
+
+
+class KBaseAuthTest(unittest.TestCase):
+
+    def setUp(self):
+        self.service = FakeAuthService()
+        self._requests = authclient._requests
+        authclient._requests = self.service
+        self.auth = KBaseAuth('http://localhost/auth')
+
+    def tearDown(self):
+        authclient._requests = self._requests
+
+    def test_get_user(self):
+        self.assertEqual(self.auth.get_user('token'), 'user_token')
+        self.assertEqual(self.auth.get_user('token'), 'user_token')
+        self.assertEqual(self.service.posts, ['token'])
+        with self.assertRaises(ValueError):
+            self.auth.get_user('bad_token')
+
+    def test_concurrent_validations_collapsed(self):
+        self.service.gate = threading.Event()
+        users = list()
+        threads = [threading.Thread(target=lambda: users.append(self.auth.get_user('token')))
+                   for _ in range(5)]
+        for t in threads:
+            t.start()
+        self.service.entered.wait()
+        while self.auth.stats()['collapsed'] < 4:
+            threading.Event().wait(0.001)
+        self.service.gate.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(users, ['user_token'] * 5)
+        self.assertEqual(self.service.posts, ['token'])
+        stats = self.auth.stats()
+        self.assertEqual((stats['validations'], stats['collapsed']), (1, 4))
+
+    def test_rejected_tokens_cached(self):
+        with self.assertRaises(ValueError) as first:
+            self.auth.get_user('bad_token')
+        with self.assertRaises(ValueError) as second:
+            self.auth.get_user('bad_token')
+        self.assertEqual(str(first.exception), str(second.exception))
+        self.assertIn('Invalid token', str(second.exception))
+        self.assertEqual(self.service.posts, ['bad_token'])
+        self.assertEqual(self.auth.stats()['rejected']['hits'], 1)
+
+    def test_outages_not_cached(self):
+        self.service.down = True
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                self.auth.get_user('token')
+        self.assertEqual(self.service.posts, ['token', 'token'])
+        self.service.down = False
+        self.assertEqual(self.auth.get_user('token'), 'user_token')
+
+    def test_throttling_not_cached(self):
+        self.service.throttled = True
+        with self.assertRaises(ValueError):
+            self.auth.get_user('token')
+        self.service.throttled = False
+        self.assertEqual(self.auth.get_user('token'), 'user_token')
+        self.assertEqual(self.service.posts, ['token', 'token'])
+        self.assertEqual(self.auth.stats()['rejected']['size'], 0)
+
+    def wait_for_refreshes(self, auth, count):
+        for _ in range(500):
+            stats = auth.stats()
+            if stats['refreshes'] + stats['refresh_failures'] >= count:
+                return
+            threading.Event().wait(0.01)
+
+    def test_refresh_ahead(self):
+        auth = KBaseAuth('http://localhost/auth', refresh_fraction=1e-9)
+        self.assertEqual(auth.get_user('token'), 'user_token')
+        self.service.gate = threading.Event()
+        # served from the cache while the refresh waits on the auth service
+        self.assertEqual(auth.get_user('token'), 'user_token')
+        self.assertEqual(auth.get_user('token'), 'user_token')
+        self.service.gate.set()
+        self.wait_for_refreshes(auth, 1)
+        self.assertEqual(self.service.posts, ['token', 'token'])
+        self.assertEqual(auth.stats()['refreshes'], 1)
+
+    def test_refresh_ahead_revoked(self):
+        auth = KBaseAuth('http://localhost/auth', refresh_fraction=1e-9)
+        auth.get_user('token')
+        self.service.revoked.add('token')
+        self.assertEqual(auth.get_user('token'), 'user_token')
+        self.wait_for_refreshes(auth, 1)
+        self.assertEqual(auth.stats()['refresh_failures'], 1)
+        with self.assertRaises(ValueError):
+            auth.get_user('token')
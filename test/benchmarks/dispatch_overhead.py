@@ -0,0 +1,66 @@
+'''
+Measures the per-request overhead of JSON-RPC dispatch in the server, using
+a no-op method so only the dispatch itself is timed. Compares the dispatch
+table against the per-call introspection it replaced.
+
+Run from the repo root, in an environment where the server can be imported
+(e.g. the module's docker image), with:
+    KB_DEPLOYMENT_CONFIG=deploy.cfg PYTHONPATH=lib python test/benchmarks/dispatch_overhead.py
+'''
+from __future__ import print_function
+import timeit
+
+from narrative_job_mock.narrative_job_mockServer import JSONRPCServiceCustom
+
+ITERATIONS = 100000
+
+
+class Impl(object):
+
+    def check_jobs(self, ctx, params):
+        return [params]
+
+
+def introspection_dispatch(service, ctx, request):
+    ''' What _handle_request and _call_method used to do on every call. '''
+    name = request['method']
+    if service.method_data[name].has_key('types'):  # noqa @IgnorePep8
+        service._validate_params_types(name, request['params'])
+    method = service.method_data[name]['method']
+    params = request['params']
+    if len(params) < service._man_args(method) - 1:
+        raise ValueError('not enough arguments')
+    if not service._vargs(method) and len(params) > service._max_args(method) - 1:
+        raise ValueError('too many arguments')
+    return method(ctx, *params)
+
+
+def table_dispatch(service, ctx, request):
+    ''' The same steps using the precomputed dispatch table. '''
+    entry = service.dispatch_table[request['method']]
+    entry.validate(request['params'])
+    params = request['params']
+    if len(params) < entry.min_params:
+        raise ValueError('not enough arguments')
+    if entry.max_params is not None and len(params) > entry.max_params:
+        raise ValueError('too many arguments')
+    return entry.method(ctx, *params)
+
+
+def main():
+    service = JSONRPCServiceCustom()
+    service.add(Impl().check_jobs, name='narrative_job_mock.check_jobs', types=[dict])
+    ctx = {}
+    request = {'method': 'narrative_job_mock.check_jobs', 'jsonrpc': '1.1', 'id': '1',
+               'params': [{'job_ids': ['5ad7ec09e4b0a7033d0286cf'], 'with_job_params': 0}]}
+    full = {'method': 'narrative_job_mock.check_jobs', 'version': '1.1', 'id': '1',
+            'params': request['params']}
+    for name, func in [('introspection', lambda: introspection_dispatch(service, ctx, request)),
+                       ('dispatch table', lambda: table_dispatch(service, ctx, request)),
+                       ('call_py', lambda: service.call_py(ctx, full))]:
+        secs = min(timeit.repeat(func, number=ITERATIONS, repeat=3))
+        print('{:>15}: {:.2f} us per request'.format(name, secs / ITERATIONS * 1e6))
+
+
+if __name__ == '__main__':
+    main()
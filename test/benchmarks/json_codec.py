@@ -0,0 +1,57 @@
+'''
+Times parsing and encoding a realistic check_jobs response with each
+installed JSON codec.
+
+Run from the repo root with:
+    PYTHONPATH=lib python test/benchmarks/json_codec.py
+'''
+from __future__ import print_function
+import timeit
+
+from narrative_job_mock.jsoncodec import CODECS, get_codec
+from narrative_job_mock.statemocker import MockBatch
+
+JOBS = 50
+BATCH_SIZE = 1000
+REPEAT = 20
+
+
+def check_jobs_response():
+    job_states = dict()
+    job_params = dict()
+    for i in range(JOBS):
+        job_id = '5b1e95fde4b0d417818a%04d' % i
+        state = {'job_id': job_id, 'finished': 1, 'job_state': 'completed',
+                 'ujs_url': 'https://kbase.us/services/userandjobstate/',
+                 'status': ['2018-06-11T15:55:20+0000', 'complete', 'done', None, None, 1, 0],
+                 'creation_time': 1528731219000, 'exec_start_time': 1528731225000,
+                 'finish_time': 1528731320000, 'canceled': 0, 'cancelled': 0,
+                 'result': [{'report_name': 'report_' + job_id, 'report_ref': '123/45/6'}]}
+        params = {'method': 'kb_BatchApp.run_batch', 'app_id': 'kb_BatchApp/run_batch',
+                  'service_ver': 'dev', 'wsid': 12345, 'meta': {'cell_id': 'abc', 'tag': 'dev'},
+                  'params': [{'batch_params': [{'input': 'reads_%d' % n} for n in range(20)]}]}
+        if i == 0:
+            state['sub_jobs'] = MockBatch(job_id, state, 0, BATCH_SIZE)
+        job_states[job_id] = state
+        job_params[job_id] = params
+    return {'version': '1.1', 'id': '12345',
+            'result': [{'job_states': job_states, 'job_params': job_params, 'check_error': {}}]}
+
+
+def main():
+    response = check_jobs_response()
+    encoded = get_codec('json').dumps(response)
+    print('payload: {} jobs, {} batch children, {} bytes'.format(JOBS, BATCH_SIZE, len(encoded)))
+    for name in sorted(CODECS):
+        codec = get_codec(name)
+        if codec.name != name:
+            print('{:>10}: not installed'.format(name))
+            continue
+        encode = min(timeit.repeat(lambda: codec.dumps(response), number=REPEAT, repeat=3))
+        parse = min(timeit.repeat(lambda: codec.loads(encoded), number=REPEAT, repeat=3))
+        print('{:>10}: encode {:.2f} ms, parse {:.2f} ms'.format(
+            name, encode / REPEAT * 1000, parse / REPEAT * 1000))
+
+
+if __name__ == '__main__':
+    main()
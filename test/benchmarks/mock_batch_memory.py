@@ -0,0 +1,51 @@
+'''
+Compares the memory and time taken by a MockBatch against the fully built
+list of child dicts it stands in for, at a few batch sizes.
+
+Run from the repo root with:
+    PYTHONPATH=lib python test/benchmarks/mock_batch_memory.py
+'''
+from __future__ import print_function
+import sys
+import time
+
+from narrative_job_mock.statemocker import MockBatch
+
+SIZES = (1000, 10000, 100000)
+PARENT = {'canceled': 0, 'cancelled': 0, 'creation_time': 1528731219000,
+          'exec_start_time': 1528731225000, 'finish_time': 1528731320000}
+
+
+def deep_size(obj, seen=None):
+    ''' Total size of obj and everything it refers to, counting shared objects once. '''
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_size(v, seen) for v in obj)
+    elif hasattr(obj, '__slots__'):
+        size += sum(deep_size(getattr(obj, s), seen) for s in obj.__slots__)
+    return size
+
+
+def main():
+    print('{:>8} {:>14} {:>12} {:>14} {:>12}'.format(
+        'children', 'dicts (bytes)', 'dicts (ms)', 'batch (bytes)', 'batch (ms)'))
+    for size in SIZES:
+        start = time.time()
+        batch = MockBatch('5b1e95fde4b0d417818a2b85', PARENT, 0, size)
+        batch_ms = (time.time() - start) * 1000
+        start = time.time()
+        children = batch.toJSONable()
+        dicts_ms = (time.time() - start) * 1000
+        print('{:>8} {:>14} {:>12.2f} {:>14} {:>12.3f}'.format(
+            size, deep_size(children), dicts_ms, deep_size(batch), batch_ms))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+'''
+Times TokenCache.get_user / add_valid_token and KBaseAuth.get_user from
+several threads at once, with more distinct tokens than the cache holds, so
+entries keep getting evicted. The old sort-on-overflow cache is timed too,
+for comparison.
+
+The auth service is replaced by a stub that answers right away, so only the
+cache is measured.
+
+Run from the repo root with:
+    PYTHONPATH=lib python test/benchmarks/token_cache.py
+'''
+from __future__ import print_function
+import hashlib
+import random
+import threading
+import time
+
+from narrative_job_mock import authclient
+from narrative_job_mock.authclient import KBaseAuth, TokenCache
+
+THREADS = 5
+CALLS = 20000
+TOKENS = 3000
+MAXSIZE = 2000
+
+
+class SortingTokenCache(object):
+    ''' The TokenCache this replaced, which sorts and halves itself when full. '''
+
+    _MAX_TIME_SEC = 5 * 60
+
+    _lock = threading.RLock()
+
+    def __init__(self, maxsize=2000):
+        self._cache = {}
+        self._maxsize = maxsize
+        self._halfmax = maxsize // 2
+
+    def get_user(self, token):
+        token = hashlib.sha256(token).hexdigest()
+        with self._lock:
+            usertime = self._cache.get(token)
+        if not usertime:
+            return None
+        user, intime = usertime
+        if time.time() - intime > self._MAX_TIME_SEC:
+            return None
+        return user
+
+    def add_valid_token(self, token, user):
+        token = hashlib.sha256(token).hexdigest()
+        with self._lock:
+            self._cache[token] = [user, time.time()]
+            if len(self._cache) > self._maxsize:
+                for i, (t, _) in enumerate(sorted(self._cache.items(),
+                                                  key=lambda item: item[1][1])):
+                    if i <= self._halfmax:
+                        del self._cache[t]
+                    else:
+                        break
+
+
+class _Response(object):
+    ok = True
+
+    def __init__(self, user):
+        self._user = user
+
+    def json(self):
+        return {'user_id': self._user}
+
+
+class _FakeRequests(object):
+
+    def post(self, url, data=None):
+        return _Response('user_' + data['token'])
+
+
+def tokens(seed):
+    '''
+    CALLS tokens drawn from TOKENS, skewed so a few users make most calls,
+    like the polling Narratives a server sees.
+    '''
+    rand = random.Random(seed)
+    return ['token_%d' % int(TOKENS * rand.random() ** 2) for _ in range(CALLS)]
+
+
+def cache_calls(cache, seed, stats):
+    for token in tokens(seed):
+        if cache.get_user(token) is None:
+            start = time.time()
+            cache.add_valid_token(token, 'user_' + token)
+            stats['slowest_add'] = max(stats['slowest_add'], time.time() - start)
+            stats['misses'] += 1
+
+
+def auth_calls(auth, seed, stats):
+    for token in tokens(seed):
+        auth.get_user(token)
+
+
+def timed(calls, target, threads=THREADS):
+    '''
+    Runs calls against target from several threads at once, and returns the
+    calls per second, the hit rate and the slowest add_valid_token in ms.
+    '''
+    stats = {'slowest_add': 0, 'misses': 0}
+    workers = [threading.Thread(target=calls, args=(target, n, stats))
+               for n in range(threads)]
+    start = time.time()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.time() - start
+    total = threads * CALLS
+    return (total / elapsed, 1 - float(stats['misses']) / total,
+            stats['slowest_add'] * 1000)
+
+
+CACHES = [('sorting', SortingTokenCache),
+          ('1 stripe', lambda maxsize: TokenCache(maxsize, stripes=1)),
+          ('TokenCache', TokenCache)]
+
+
+def main():
+    print('{} calls per thread over {} tokens, cache size {}'.format(CALLS, TOKENS, MAXSIZE))
+    for name, make in CACHES:
+        # one thread, so the slowest add isn't just a thread switch
+        rate, hits, slowest = timed(cache_calls, make(MAXSIZE), threads=1)
+        print('{:>22}: 1 thread,  {:>7.0f} calls/s, {:.0%} hits, slowest add {:.2f} ms'.format(
+            name + ' cache', rate, hits, slowest))
+        rate, hits, _ = timed(cache_calls, make(MAXSIZE))
+        print('{:>22}: {} threads, {:>7.0f} calls/s, {:.0%} hits'.format(
+            name + ' cache', THREADS, rate, hits))
+    authclient._requests = _FakeRequests()
+    for name, make in CACHES:
+        auth = KBaseAuth('http://localhost/auth')
+        auth._cache = make(MAXSIZE)
+        rate, _, _ = timed(auth_calls, auth)
+        print('{:>22}: {} threads, {:>7.0f} calls/s'.format(
+            name + ' KBaseAuth', THREADS, rate))
+
+
+if __name__ == '__main__':
+    main()
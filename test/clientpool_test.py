@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import unittest
+import cookielib
+import json
+import urllib2
+
+from narrative_job_mock.clientpool import NJSClientPool
+
+NJS_URL = 'http://localhost/njs'
+
+
+class FakeResponse(object):
+
+    status_code = 200
+    ok = True
+    headers = {}
+
+    def __init__(self, result):
+        self._result = result
+
+    def json(self):
+        return {'version': '1.1', 'result': [self._result]}
+
+
+class FakeSession(object):
+    '''
+    Stands in for the pool's requests.Session, recording the method of each post.
+    '''
+
+    def __init__(self):
+        self.posts = list()
+
+    def post(self, url, data=None, **kwargs):
+        method = json.loads(data)['method']
+        self.posts.append((url, method, kwargs['headers'].get('AUTHORIZATION')))
+        return FakeResponse(method)
+
+
+class NJSClientPoolTest(unittest.TestCase):
+
+    def test_client_reused_per_token(self):
+        pool = NJSClientPool(NJS_URL)
+        njs = pool.get_client('token1')
+        self.assertIs(pool.get_client('token1'), njs)
+        self.assertIsNot(pool.get_client('token2'), njs)
+        self.assertEqual(pool.stats()['hits'], 1)
+
+    def test_eviction(self):
+        pool = NJSClientPool(NJS_URL, maxsize=1)
+        njs = pool.get_client('token1')
+        pool.get_client('token2')
+        self.assertIsNot(pool.get_client('token1'), njs)
+        self.assertEqual(pool.stats()['size'], 1)
+
+    def test_calls_use_session(self):
+        pool = NJSClientPool(NJS_URL)
+        pool._session = FakeSession()
+        for token in ('token1', 'token2'):
+            njs = pool.get_client(token)
+            self.assertEqual(njs._client.call_method('NarrativeJobService.ver', []),
+                             'NarrativeJobService.ver')
+        self.assertEqual(pool._session.posts, [
+            (NJS_URL, 'NarrativeJobService.ver', 'token1'),
+            (NJS_URL, 'NarrativeJobService.ver', 'token2')
+        ])
+
+    def test_session_refuses_cookies(self):
+        policy = NJSClientPool(NJS_URL)._session.cookies._policy
+        cookie = cookielib.Cookie(0, 'session', 'user1', None, False, 'localhost', False,
+                                  False, '/', False, False, None, False, None, None, {})
+        request = urllib2.Request(NJS_URL)
+        self.assertFalse(policy.set_ok(cookie, request))
+        self.assertFalse(policy.return_ok(cookie, request))
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+import unittest
+import threading
+
+from narrative_job_mock.jobwatcher import JobWatcher
+
+TOKEN = 'some_token'
+
+
+class FakeChecker(object):
+    '''
+    Answers checks from a dict of job id to job_state, recording each call.
+    The next failures calls raise an error instead.
+    '''
+
+    def __init__(self, states):
+        self.states = states
+        self.calls = list()
+        self.failures = 0
+
+    def __call__(self, token, job_ids):
+        self.calls.append((token, list(job_ids)))
+        if self.failures:
+            self.failures -= 1
+            raise ValueError('NJS is down')
+        ret = {'job_states': {}, 'check_error': {}}
+        for job_id in job_ids:
+            if job_id in self.states:
+                ret['job_states'][job_id] = {'job_id': job_id, 'job_state': self.states[job_id]}
+            else:
+                ret['check_error'][job_id] = {'name': 'Not found'}
+        return ret
+
+
+class JobWatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.checker = FakeChecker({'a': 'queued', 'b': 'in-progress'})
+        self.watcher = JobWatcher(self.checker, poll_interval=0.01)
+
+    def test_changed_right_away(self):
+        ret = self.watcher.wait(TOKEN, ['a', 'b'], {'a': 'queued'}, 10)
+        self.assertEqual(list(ret['job_states']), ['b'])
+        self.assertEqual(ret['timed_out'], 0)
+
+    def test_error_counts_as_change(self):
+        ret = self.watcher.wait(TOKEN, ['a', 'c'], {'a': 'queued'}, 10)
+        self.assertEqual(ret['job_states'], {})
+        self.assertIn('c', ret['check_error'])
+
+    def test_timeout(self):
+        ret = self.watcher.wait(TOKEN, ['a'], {'a': 'queued'}, 0.05)
+        self.assertEqual(ret, {'job_states': {}, 'check_error': {}, 'timed_out': 1})
+        self.assertEqual(self.watcher.stats()['waiting'], 0)
+
+    def test_waiters_share_polls(self):
+        known = {'a': 'queued', 'b': 'in-progress'}
+        results = list()
+
+        def wait(job_ids):
+            results.append(self.watcher.wait(TOKEN, job_ids, known, 10))
+        threads = [threading.Thread(target=wait, args=(job_ids,))
+                   for job_ids in (['a'], ['a', 'b'], ['b'])]
+        for t in threads:
+            t.start()
+        while self.watcher.stats()['waiting'] < len(threads):
+            threading.Event().wait(0.001)
+        del self.checker.calls[:]
+        self.checker.states = {'a': 'in-progress', 'b': 'completed'}
+        for t in threads:
+            t.join()
+        # every poll checks all the jobs being waited on at once
+        self.assertTrue(self.checker.calls)
+        for token, job_ids in self.checker.calls:
+            self.assertEqual(sorted(job_ids), ['a', 'b'])
+        self.assertEqual(sorted(len(r['job_states']) for r in results), [1, 1, 2])
+
+    def test_subscription(self):
+        watcher = JobWatcher(self.checker, poll_interval=0.01,
+                             is_terminal=lambda state: state['job_state'] == 'completed')
+        subscription = watcher.subscribe(TOKEN, ['a', 'b', 'a', 'c'])
+        self.assertEqual(self.checker.calls, [(TOKEN, ['a', 'b', 'c'])])
+        events = subscription.events(keepalive=0.05)
+        self.assertEqual(sorted(next(events) for i in range(3)), [
+            ('check_error', {'job_id': 'c', 'error': {'name': 'Not found'}}),
+            ('job_state', {'job_id': 'a', 'job_state': 'queued'}),
+            ('job_state', {'job_id': 'b', 'job_state': 'in-progress'})
+        ])
+        # nothing changes, so only a keep-alive comes
+        self.assertEqual(next(events), (None, None))
+        self.checker.states = {'a': 'completed', 'b': 'in-progress'}
+        self.assertEqual(next(events), ('job_state', {'job_id': 'a', 'job_state': 'completed'}))
+        self.checker.states = {'b': 'completed'}
+        self.assertEqual(next(events), ('job_state', {'job_id': 'b', 'job_state': 'completed'}))
+        self.assertEqual(list(events), [('end', {})])
+        self.assertEqual(watcher.stats()['waiting'], 0)
+
+    def test_subscription_closed(self):
+        subscription = self.watcher.subscribe(TOKEN, ['a'])
+        subscription.close()
+        threading.Event().wait(0.05)
+        self.assertEqual(self.watcher.stats()['waiting'], 0)
+
+    def test_subscription_survives_poll_errors(self):
+        watcher = JobWatcher(self.checker, poll_interval=0.01,
+                             is_terminal=lambda state: state['job_state'] == 'completed')
+        subscription = watcher.subscribe(TOKEN, ['a'])
+        events = subscription.events(keepalive=1)
+        self.assertEqual(next(events), ('job_state', {'job_id': 'a', 'job_state': 'queued'}))
+        self.checker.failures = 2
+        self.assertEqual(next(events), ('poll_error', {'message': 'NJS is down',
+                                                       'retry_in': 0.02}))
+        self.assertEqual(next(events), ('poll_error', {'message': 'NJS is down',
+                                                       'retry_in': 0.04}))
+        self.checker.states = {'a': 'completed'}
+        self.assertEqual(next(events), ('job_state', {'job_id': 'a', 'job_state': 'completed'}))
+        self.assertEqual(list(events), [('end', {})])
+        self.assertEqual(watcher.stats()['poll_errors'], 2)
+
+    def test_subscription_fails_after_max_failures(self):
+        watcher = JobWatcher(self.checker, poll_interval=0.01, max_failures=2)
+        subscription = watcher.subscribe(TOKEN, ['a'])
+        events = subscription.events(keepalive=1)
+        next(events)
+        self.checker.failures = 2
+        self.assertEqual([name for name, data in events], ['poll_error', 'error'])
+        self.assertEqual(watcher.stats()['waiting'], 0)
+
+    def test_wait_fails_on_first_failure(self):
+        watcher = JobWatcher(self.checker, poll_interval=0.01, max_failures=1)
+        errors = list()
+
+        def wait():
+            try:
+                watcher.wait(TOKEN, ['a'], {'a': 'queued'}, 10)
+            except ValueError as e:
+                errors.append(str(e))
+        waiting = threading.Thread(target=wait)
+        waiting.start()
+        while watcher.stats()['waiting'] < 1:
+            threading.Event().wait(0.001)
+        self.checker.failures = 1
+        waiting.join(5)
+        self.assertEqual(errors, ['NJS is down'])
+        # later waits are still polled
+        threading.Timer(0.05, self.checker.states.update, kwargs={'a': 'in-progress'}).start()
+        ret = watcher.wait(TOKEN, ['a'], {'a': 'queued'}, 5)
+        self.assertEqual(ret['timed_out'], 0)
+
+    def test_poll_thread_survives_errors(self):
+        watcher = JobWatcher(self.checker, poll_interval=0.01)
+        broken = [True]
+        poll = watcher._poll
+
+        def flaky_poll(token, waiters):
+            if broken[0]:
+                broken[0] = False
+                raise RuntimeError('unexpected')
+            poll(token, waiters)
+        watcher._poll = flaky_poll
+        done = threading.Event()
+        results = list()
+
+        def wait():
+            results.append(watcher.wait(TOKEN, ['a'], {'a': 'queued'}, 10))
+            done.set()
+        threading.Thread(target=wait).start()
+        while watcher.stats()['waiting'] < 1:
+            threading.Event().wait(0.001)
+        self.checker.states = {'a': 'completed'}
+        self.assertTrue(done.wait(5))
+        self.assertEqual(results[0]['job_states'], {'a': {'job_id': 'a', 'job_state': 'completed'}})
+        self.assertEqual(watcher.stats()['poll_errors'], 1)
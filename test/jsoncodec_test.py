@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import unittest
+import json
+
+from narrative_job_mock.jsoncodec import get_codec, CODECS, StdlibCodec, JSONFragment
+from narrative_job_mock.jsonstream import StreamEncoder
+from narrative_job_mock.statemocker import MockBatch
+
+
+class JSONCodecTest(unittest.TestCase):
+
+    def codecs(self):
+        return [get_codec(name) for name in CODECS]
+
+    def test_round_trip(self):
+        obj = {'version': '1.1', 'id': '123', 'result': [{
+            'job_states': {'a': {'job_id': u'a\xe9', 'finished': 1, 'status': [None, True, 1.5],
+                                 'sub_jobs': MockBatch('a', {}, 0, 4)}},
+            'tags': set(['x'])
+        }]}
+        expected = json.loads(StdlibCodec().dumps(obj))
+        self.assertEqual(len(expected['result'][0]['job_states']['a']['sub_jobs']), 4)
+        for codec in self.codecs():
+            self.assertEqual(json.loads(codec.dumps(obj)), expected, codec.name)
+            self.assertEqual(codec.loads(json.dumps(expected)), expected, codec.name)
+
+    def test_parse_error(self):
+        for codec in self.codecs():
+            with self.assertRaises(ValueError):
+                codec.loads('{"method": ')
+
+    def json_types(self, values):
+        names = list()
+        for value in values:
+            if isinstance(value, bool):
+                names.append('boolean')
+            elif isinstance(value, (int, long)):
+                names.append('integer')
+            elif isinstance(value, basestring):
+                names.append('string')
+            else:
+                names.append(type(value).__name__)
+        return names
+
+    def test_parsed_types(self):
+        params = [['j1'], 2 ** 31, {}, 2 ** 63, 2 ** 64 + 1, -2 ** 63 - 1, 1.5, u'a\xe9',
+                  True, None]
+        data = json.dumps({'version': '1.1', 'method': 'm', 'params': params})
+        expected = self.json_types(json.loads(data)['params'])
+        for codec in self.codecs():
+            parsed = codec.loads(data)['params']
+            self.assertEqual(parsed, params, codec.name)
+            self.assertEqual(self.json_types(parsed), expected, codec.name)
+            # what the server's int params accept
+            for value, param in zip(parsed, params):
+                if self.json_types([param]) == ['integer']:
+                    self.assertIsInstance(value, (int, long), codec.name)
+
+    def test_auto(self):
+        codec = get_codec('auto')
+        self.assertEqual(codec._encoder.name, 'json')
+        self.assertIn(codec._parser.name, ('ujson', 'json'))
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            get_codec('nope')
+
+    def test_unserializable(self):
+        for codec in self.codecs():
+            with self.assertRaises(TypeError):
+                codec.dumps({'a': object()})
+
+    def test_fragments_spliced(self):
+        state = {'job_id': 'a', 'job_state': 'completed', 'note': u'\x00 "quoted"'}
+        # the encoded JSON is what gets written, even if it differs from the value
+        fragment = JSONFragment(state, json.dumps(dict(state, spliced=True)))
+        obj = {'job_states': {'a': fragment, 'b': {'job_id': 'b'}}, 'x': u'\x00'}
+        expected = {'job_states': {'a': dict(state, spliced=True), 'b': {'job_id': 'b'}},
+                    'x': u'\x00'}
+        for codec in self.codecs():
+            self.assertEqual(json.loads(codec.dumps(obj)), expected, codec.name)
+        streamed = ''.join(StreamEncoder(json.JSONEncoder()).iterencode(obj))
+        self.assertEqual(json.loads(streamed), expected)
+        self.assertEqual(fragment['job_state'], 'completed')
+        self.assertIn('job_id', fragment)
+
+    def test_ujson_splices_fragments(self):
+        codec = get_codec('ujson')
+        if codec.name != 'ujson':
+            raise unittest.SkipTest('ujson is not installed')
+        codec._fallback = None
+        fragment = JSONFragment({'job_id': 'a'}, '{"job_id": "a", "spliced": true}')
+        self.assertEqual(json.loads(codec.dumps({'a': fragment, 'b': [1]})),
+                         {'a': {'job_id': 'a', 'spliced': True}, 'b': [1]})
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import unittest
+import json
+
+from narrative_job_mock.jsoncodec import JSONFragment
+from narrative_job_mock.jsonstream import StreamEncoder
+from narrative_job_mock.statemocker import MockBatch
+
+
+class StreamEncoderTest(unittest.TestCase):
+
+    def encode(self, obj, chunk_size=64 * 1024):
+        return list(StreamEncoder(json.JSONEncoder(), chunk_size).iterencode(obj))
+
+    def test_matches_json(self):
+        obj = {'version': '1.1', 'id': '123', 'result': [{
+            'job_states': {'a': {'job_id': 'a', 'finished': 1, 'status': [None, True, 1.5]},
+                           'b': {'job_id': u'bé', 'position': 3}},
+            'check_error': {},
+            'numbers': {1: 'one', None: 'none'}
+        }]}
+        self.assertEqual(json.loads(''.join(self.encode(obj))), json.loads(json.dumps(obj)))
+
+    def test_chunks(self):
+        batch = MockBatch('parent', {}, 0, 100)
+        chunks = self.encode({'sub_jobs': batch}, chunk_size=1000)
+        self.assertTrue(len(chunks) > 10)
+        self.assertEqual(json.loads(''.join(chunks)),
+                         {'sub_jobs': json.loads(json.dumps(batch.toJSONable()))})
+
+    def test_mock_batch(self):
+        batch = MockBatch('parent', {'creation_time': 5}, 0, 7)
+        self.assertEqual(json.loads(''.join(self.encode({'sub_jobs': batch}))),
+                         {'sub_jobs': json.loads(json.dumps(batch.toJSONable()))})
+
+    def test_fragments(self):
+        state = {'job_id': 'a', 'job_state': 'completed'}
+        fragment = JSONFragment(state, json.dumps(dict(state, spliced=True)))
+        batch = MockBatch('parent', {}, 0, 3)
+        obj = {'job_states': {'a': fragment, 'b': {'sub_jobs': batch}}, 'x': u'\x00'}
+        decoded = json.loads(''.join(self.encode(obj, chunk_size=10)))
+        self.assertTrue(decoded['job_states']['a']['spliced'])
+        self.assertEqual(len(decoded['job_states']['b']['sub_jobs']), 3)
+        self.assertEqual(decoded['x'], u'\x00')
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import unittest
+import time
+
+from narrative_job_mock.lrucache import LRUCache
+
+
+class LRUCacheTest(unittest.TestCase):
+
+    def test_get_put(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('b', 'nope'), 'nope')
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 2)
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_ttl(self):
+        cache = LRUCache(maxsize=2, ttl=0.05)
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+    def test_put_expires_old_entries(self):
+        cache = LRUCache(maxsize=10, ttl=0.05, expire_batch=2)
+        for key in 'abc':
+            cache.put(key, 1)
+        time.sleep(0.1)
+        cache.put('d', 1)
+        self.assertEqual(len(cache), 2)
+        cache.put('e', 1)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()['evictions'], 3)
+
+    def test_bad_maxsize(self):
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=0)
+
+    def test_sizeof(self):
+        cache = LRUCache(maxsize=10, sizeof=len)
+        cache.put('a', 'xxxx')
+        cache.put('b', 'xxxx')
+        cache.put('c', 'xxxx')
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['total_size'], 8)
+        cache.put('b', 'x')
+        self.assertEqual(cache.stats()['total_size'], 5)
+        # too big to keep at all
+        cache.put('d', 'x' * 11)
+        self.assertIsNone(cache.get('d'))
+        self.assertEqual(cache.stats()['total_size'], 0)
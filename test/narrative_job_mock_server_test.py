@@ -2,10 +2,13 @@
 import unittest
 import os  # noqa: F401
 import json  # noqa: F401
+import socket
 import time
+import threading
 import requests
 
 from os import environ
+from multiprocessing import Process
 try:
     from ConfigParser import ConfigParser  # py2
 except:
@@ -15,8 +18,10 @@ from pprint import pprint  # noqa: F401
 
 from biokbase.workspace.client import Workspace as workspaceService
 from narrative_job_mock.narrative_job_mockImpl import narrative_job_mock
-from narrative_job_mock.narrative_job_mockServer import MethodContext
+from narrative_job_mock.narrative_job_mockServer import MethodContext, application, \
+    start_server, stop_server
 from narrative_job_mock.authclient import KBaseAuth as _KBaseAuth
+from narrative_job_mock.jsoncodec import get_codec
 
 
 class narrative_job_mockTest(unittest.TestCase):
@@ -84,3 +89,191 @@ class narrative_job_mockTest(unittest.TestCase):
         self.assertIn(self.job_ids[1], state['job_states'])
         self.assertIn('sub_jobs', state['job_states'][self.job_ids[1]])
         pprint(state)
+
+    def test_check_jobs_sub_jobs_window_ok(self):
+        state = self.getImpl().check_jobs(self.getContext(), {'job_ids': [self.job_ids[1]],
+                                                              'sub_jobs_offset': 1,
+                                                              'sub_jobs_limit': 5})[0]
+        batch_state = state['job_states'][self.job_ids[1]]
+        self.assertEqual(batch_state['sub_jobs_total'], 2)
+        self.assertEqual(len(batch_state['sub_jobs']), 1)
+        self.assertEqual(batch_state['sub_jobs'][0]['job_id'], self.job_ids[1] + '_1')
+
+    def test_check_jobs_sub_jobs_summary_ok(self):
+        state = self.getImpl().check_jobs(self.getContext(), {'job_ids': [self.job_ids[1]],
+                                                              'sub_jobs_mode': 'summary'})[0]
+        batch_state = state['job_states'][self.job_ids[1]]
+        self.assertNotIn('sub_jobs', batch_state)
+        self.assertEqual(sum(batch_state['sub_jobs_summary'].values()), 2)
+
+    def test_check_jobs_bad_sub_jobs_mode(self):
+        with self.assertRaises(ValueError):
+            self.getImpl().check_jobs(self.getContext(), {'job_ids': self.job_ids,
+                                                          'sub_jobs_mode': 'some'})
+
+    def test_check_jobs_bad_sub_jobs_window(self):
+        for window in ({'sub_jobs_offset': -1}, {'sub_jobs_offset': '1'},
+                       {'sub_jobs_offset': 0.5}, {'sub_jobs_limit': 2.5},
+                       {'sub_jobs_limit': True}):
+            window['job_ids'] = self.job_ids
+            with self.assertRaises(ValueError):
+                self.getImpl().check_jobs(self.getContext(), window)
+
+    def test_check_jobs_since_ok(self):
+        state = self.getImpl().check_jobs_since(self.getContext(), {'job_ids': self.job_ids})[0]
+        self.assertIn('cursor', state)
+        self.assertIn(self.job_ids[0], state['job_states'])
+        state = self.getImpl().check_jobs_since(self.getContext(), {'job_ids': self.job_ids,
+                                                                    'cursor': state['cursor']})[0]
+        self.assertEqual(state['job_states'], {})
+
+    def test_wait_for_job_states_ok(self):
+        ret = self.getImpl().wait_for_job_states(self.getContext(), self.job_ids, 1000, {})[0]
+        self.assertEqual(ret['timed_out'], 0)
+        self.assertIn(self.job_ids[0], ret['job_states'])
+
+
+class HttpTestBase(unittest.TestCase):
+    '''
+    Helpers for calling a running server over HTTP.
+    '''
+
+    token = environ.get('KB_AUTH_TOKEN', None)
+    job_ids = ["5ad7ec09e4b0a7033d0286cf", "5b1e95fde4b0d417818a2b85"]
+
+    def call(self, body):
+        ret = requests.post(self.url, data=json.dumps(body),
+                            headers={'Authorization': self.token})
+        return ret.status_code, (ret.json() if ret.content else None)
+
+    def request(self, method, params, call_id=None):
+        req = {'version': '1.1', 'method': 'narrative_job_mock.' + method, 'params': params}
+        if call_id is not None:
+            req['id'] = call_id
+        return req
+
+
+class narrative_job_mockHttpTest(HttpTestBase):
+    '''
+    Calls a running server over HTTP, with JSON-RPC batches run on a pool.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        application.rpc_service.batch_workers = 4
+        cls.url = 'http://localhost:%s' % start_server(newprocess=True)
+        time.sleep(1)
+
+    @classmethod
+    def tearDownClass(cls):
+        stop_server()
+        application.rpc_service.batch_workers = 1
+
+    def test_batch(self):
+        status, ret = self.call([
+            self.request('check_jobs', [{'job_ids': self.job_ids[:1]}], '1'),
+            self.request('status', []),
+            self.request('no_such_method', [], '3'),
+            self.request('check_jobs', ['not a dict'], '4'),
+            5,
+            self.request('status', [], '6')
+        ])
+        self.assertEqual(status, 200)
+        # in request order, with nothing for the notification
+        self.assertEqual([r['id'] for r in ret], ['1', '3', '4', None, '6'])
+        self.assertIn(self.job_ids[0], ret[0]['result'][0]['job_states'])
+        for r in ret[1:4]:
+            self.assertIn('error', r)
+            self.assertNotIn('result', r)
+        self.assertEqual(ret[4]['result'][0]['state'], 'OK')
+
+    def test_long_int_params(self):
+        # ujson parses 2**31 as a long
+        validate = application.rpc_service.dispatch_table[
+            'narrative_job_mock.wait_for_job_states'].validate
+        for codec in ('json', 'ujson'):
+            validate(get_codec(codec).loads('[["j1"], 2147483648, {}]'))
+
+    def test_batch_of_notifications(self):
+        status, ret = self.call([self.request('status', []), self.request('status', [])])
+        self.assertEqual(status, 200)
+        self.assertIsNone(ret)
+
+
+class narrative_job_mockThreadedTest(HttpTestBase):
+    '''
+    Long-polls a server that serves requests from a pool of threads.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.url = 'http://localhost:%s' % start_server(newprocess=True, threads=4)
+        time.sleep(1)
+
+    @classmethod
+    def tearDownClass(cls):
+        stop_server()
+
+    def long_poll(self, known_states, results):
+        _, ret = self.call(self.request('wait_for_job_states',
+                                       [self.job_ids[:1], 2000, known_states], '1'))
+        results.append(ret['result'][0])
+
+    def test_long_polls_overlap(self):
+        _, ret = self.call(self.request('check_jobs', [{'job_ids': self.job_ids[:1]}], '1'))
+        job_state = ret['result'][0]['job_states'][self.job_ids[0]]['job_state']
+        # the job stays in the state we know, so each poll waits out its 2 seconds
+        results = list()
+        polls = [threading.Thread(target=self.long_poll,
+                                  args=({self.job_ids[0]: job_state}, results))
+                 for _ in range(4)]
+        start = time.time()
+        for t in polls:
+            t.start()
+        for t in polls:
+            t.join()
+        elapsed = time.time() - start
+        self.assertEqual([r['timed_out'] for r in results], [1] * 4)
+        # one at a time they'd take 8 seconds, two at a time 4
+        self.assertLess(elapsed, 3)
+
+
+class narrative_job_mockPreforkTest(narrative_job_mockThreadedTest):
+    '''
+    Long-polls a server with two worker processes of two threads each, so the
+    polls only overlap if each worker leaves connections to the other while
+    its threads are busy.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.url = 'http://localhost:%s' % start_server(newprocess=True, threads=2, workers=2)
+        time.sleep(1)
+
+
+class narrative_job_mockGeventTest(narrative_job_mockThreadedTest):
+    '''
+    Long-polls a server that serves requests on gevent.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            import gevent  # noqa: F401
+        except ImportError:
+            raise unittest.SkipTest('gevent is not installed')
+        # gevent monkey patches the process that starts the server, so start
+        # it in its own process
+        sock = socket.socket()
+        sock.bind(('localhost', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        cls.server = Process(target=start_server, kwargs={'port': port, 'use_gevent': True})
+        cls.server.daemon = True
+        cls.server.start()
+        cls.url = 'http://localhost:%s' % port
+        time.sleep(1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.terminate()
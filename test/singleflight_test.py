@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+import unittest
+import threading
+
+from narrative_job_mock.singleflight import Flight
+
+
+class FlightTest(unittest.TestCase):
+
+    def test_waiters_share_result(self):
+        flight = Flight()
+        gate = threading.Event()
+        results = list()
+        waiters = [threading.Thread(target=lambda: results.append(flight.wait()))
+                   for _ in range(3)]
+        for t in waiters:
+            t.start()
+        leader = threading.Thread(target=flight.run, args=(lambda: gate.wait() and 'done',))
+        leader.start()
+        self.assertEqual(results, [])
+        gate.set()
+        for t in waiters + [leader]:
+            t.join()
+        self.assertEqual(results, ['done'] * 3)
+
+    def test_waiters_share_error(self):
+        flight = Flight()
+
+        def fail():
+            raise ValueError('no')
+        with self.assertRaises(ValueError):
+            flight.run(fail)
+        with self.assertRaises(ValueError) as waited:
+            flight.wait()
+        self.assertEqual(str(waited.exception), 'no')
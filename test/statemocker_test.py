@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+import unittest
+import copy
+import json
+import threading
+import time
+
+from narrative_job_mock.statemocker import StateMocker, MockBatch, BATCH_APP_ID
+from narrative_job_mock.jsoncodec import JSONFragment
+
+TOKEN = 'some_token'
+
+
+class FakeNJS(object):
+    '''
+    Stands in for a NarrativeJobService client, answering check_jobs from a
+    fixed set of job states and recording each call it gets.
+    '''
+
+    def __init__(self, job_states, job_params):
+        self.job_states = job_states
+        self.job_params = job_params
+        self.calls = list()
+        # if set, calls block until it's released
+        self.gate = None
+        self.entered = threading.Event()
+
+    def check_jobs(self, params):
+        self.calls.append(params)
+        self.entered.set()
+        if self.gate is not None:
+            self.gate.wait()
+        ret = {'job_states': {}, 'job_params': {}, 'check_error': {}}
+        for job_id in params['job_ids']:
+            if job_id not in self.job_states:
+                ret['check_error'][job_id] = {'code': -32000, 'name': 'Not found',
+                                              'message': 'no such job', 'error': ''}
+                continue
+            ret['job_states'][job_id] = copy.deepcopy(self.job_states[job_id])
+            if params.get('with_job_params'):
+                ret['job_params'][job_id] = copy.deepcopy(self.job_params[job_id])
+        return ret
+
+
+class FakePool(object):
+
+    def __init__(self, njs):
+        self.njs = njs
+
+    def get_client(self, token):
+        return self.njs
+
+    def stats(self):
+        return {}
+
+
+class StateMockerTest(unittest.TestCase):
+
+    def setUp(self):
+        job_states = {
+            'done': {'job_id': 'done', 'finished': 1, 'job_state': 'completed',
+                     'creation_time': 1, 'exec_start_time': 2, 'finish_time': 3},
+            'running': {'job_id': 'running', 'finished': 0, 'job_state': 'in-progress',
+                        'creation_time': 1, 'exec_start_time': 2},
+            'batch': {'job_id': 'batch', 'finished': 0, 'job_state': 'in-progress',
+                      'creation_time': 1, 'exec_start_time': 2}
+        }
+        job_params = {
+            'done': {'method': 'foo.bar', 'params': [{}]},
+            'running': {'method': 'foo.bar', 'params': [{}]},
+            'batch': {'app_id': BATCH_APP_ID,
+                      'params': [{'batch_params': [{}, {}, {}, {}]}]}
+        }
+        self.njs = FakeNJS(job_states, job_params)
+        self.mocker = StateMocker({'njsw-url': 'https://localhost/njs'})
+        self.mocker.njs_clients = FakePool(self.njs)
+
+    def test_check_job(self):
+        state = self.mocker.check_job(TOKEN, 'running')
+        self.assertEqual(state['job_id'], 'running')
+        self.assertNotIn('sub_jobs', state)
+
+    def test_check_job_missing(self):
+        state = self.mocker.check_job(TOKEN, 'nope')
+        self.assertEqual(state['name'], 'Not found')
+
+    def test_check_batch_job(self):
+        state = self.mocker.check_job(TOKEN, 'batch')
+        self.assertEqual(len(state['sub_jobs']), 4)
+        self.assertEqual([j['job_state'] for j in state['sub_jobs']],
+                         ['running', 'error', 'completed', 'running'])
+        self.assertEqual(state['sub_jobs'][1]['job_id'], 'batch_1')
+
+    def test_check_jobs_params(self):
+        ret = self.mocker.check_jobs(TOKEN, ['done', 'running'], True)
+        self.assertEqual(set(ret['job_params']), set(['done', 'running']))
+        ret = self.mocker.check_jobs(TOKEN, ['done', 'running'], False)
+        self.assertNotIn('job_params', ret)
+        self.assertEqual(set(ret['job_states']), set(['done', 'running']))
+
+    def test_terminal_jobs_cached(self):
+        self.mocker.check_jobs(TOKEN, ['done', 'running'], False)
+        ret = self.mocker.check_jobs(TOKEN, ['done', 'running'], True)
+        self.assertEqual(self.njs.calls[-1]['job_ids'], ['running'])
+        self.assertEqual(ret['job_states']['done']['job_state'], 'completed')
+        self.assertIn('done', ret['job_params'])
+        # other tokens don't share cached states
+        self.mocker.check_jobs('other_token', ['done'], False)
+        self.assertEqual(self.njs.calls[-1]['job_ids'], ['done'])
+
+    def test_job_params_cached(self):
+        self.mocker.check_jobs(TOKEN, ['batch'], False)
+        self.assertEqual(self.njs.calls[-1]['with_job_params'], 1)
+        ret = self.mocker.check_jobs(TOKEN, ['batch', 'running'], True)
+        self.assertEqual(self.njs.calls[-2], {'job_ids': ['running'], 'with_job_params': 1})
+        self.assertEqual(self.njs.calls[-1], {'job_ids': ['batch'], 'with_job_params': 0})
+        self.assertEqual(len(ret['job_states']['batch']['sub_jobs']), 4)
+        self.assertIn('batch', ret['job_params'])
+
+    def test_concurrent_calls_coalesced(self):
+        self.mocker.check_jobs(TOKEN, ['running', 'batch'], False)
+        self.njs.gate = threading.Event()
+        self.njs.calls = list()
+        self.njs.entered.clear()
+        results = dict()
+
+        def poll(name, job_ids):
+            results[name] = self.mocker.check_jobs(TOKEN, job_ids, False)
+        first = threading.Thread(target=poll, args=('first', ['running', 'batch']))
+        first.start()
+        self.assertTrue(self.njs.entered.wait(5))
+        second = threading.Thread(target=poll, args=('second', ['running']))
+        second.start()
+        while self.mocker.stats()['upstream']['coalesced_calls'] == 0:
+            time.sleep(0.01)
+        self.njs.gate.set()
+        first.join(5)
+        second.join(5)
+        self.assertEqual(len(self.njs.calls), 1)
+        self.assertEqual(set(results['first']['job_states']), set(['running', 'batch']))
+        self.assertEqual(set(results['second']['job_states']), set(['running']))
+        self.assertIsNot(results['first']['job_states']['running'],
+                         results['second']['job_states']['running'])
+        self.assertEqual(self.mocker.stats()['upstream']['coalesced_jobs'], 1)
+
+    def test_check_job_batched(self):
+        self.mocker.batch_window = 0.2
+        results = dict()
+
+        def poll(job_id):
+            results[job_id] = self.mocker.check_job(TOKEN, job_id)
+        threads = [threading.Thread(target=poll, args=(job_id,))
+                   for job_id in ['running', 'done', 'batch']]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        self.assertEqual(len(self.njs.calls), 1)
+        self.assertEqual(sorted(self.njs.calls[0]['job_ids']), ['batch', 'done', 'running'])
+        for job_id in ['running', 'done', 'batch']:
+            self.assertEqual(results[job_id]['job_id'], job_id)
+        self.assertEqual(self.mocker.stats()['check_job_batches'], {'batches': 1, 'lookups': 3})
+
+    def test_sub_jobs_window(self):
+        ret = self.mocker.check_jobs(TOKEN, ['batch'], False, 1, 2)
+        state = ret['job_states']['batch']
+        self.assertEqual(state['sub_jobs_total'], 4)
+        self.assertEqual([j['job_id'] for j in state['sub_jobs']], ['batch_1', 'batch_2'])
+        ret = self.mocker.check_jobs(TOKEN, ['batch'], False, 3, 10)
+        self.assertEqual([j['job_id'] for j in ret['job_states']['batch']['sub_jobs']],
+                         ['batch_3'])
+        ret = self.mocker.check_jobs(TOKEN, ['batch'], False, 5)
+        self.assertEqual(list(ret['job_states']['batch']['sub_jobs']), [])
+
+    def test_sub_jobs_summary(self):
+        ret = self.mocker.check_jobs(TOKEN, ['batch', 'running'], False, sub_jobs_mode='summary')
+        state = ret['job_states']['batch']
+        self.assertNotIn('sub_jobs', state)
+        self.assertEqual(state['sub_jobs_total'], 4)
+        self.assertEqual(state['sub_jobs_summary'], {'running': 2, 'error': 1, 'completed': 1})
+        self.assertNotIn('sub_jobs_summary', ret['job_states']['running'])
+        ret = self.mocker.check_jobs(TOKEN, ['batch'], False, sub_jobs_mode='none')
+        state = ret['job_states']['batch']
+        self.assertNotIn('sub_jobs', state)
+        self.assertNotIn('sub_jobs_summary', state)
+        self.assertEqual(state['sub_jobs_total'], 4)
+
+    def test_summary_matches_full(self):
+        for total in range(8):
+            summary = self.mocker._summarize_mock_batch(total)
+            counts = dict((s, 0) for s in summary)
+            for child in MockBatch('x', {}, 0, total):
+                counts[child['job_state']] += 1
+            self.assertEqual(summary, counts)
+
+    def test_mock_batch(self):
+        parent = {'canceled': 0, 'cancelled': 0, 'creation_time': 1, 'exec_start_time': 2,
+                  'finish_time': 3, 'job_state': 'completed'}
+        batch = MockBatch('parent', parent, 2, 5)
+        self.assertEqual(len(batch), 3)
+        children = batch.toJSONable()
+        self.assertEqual(children, list(batch))
+        self.assertEqual(children[-1], batch[-1])
+        self.assertEqual(children[0], {
+            'job_id': 'parent_2', 'job_state': 'completed', 'status': [],
+            'canceled': 0, 'cancelled': 0, 'creation_time': 1, 'exec_start_time': 2,
+            'finish_time': 3, 'result': [{'report_ref': '123/45', 'report_name': 'dummy_report'}]
+        })
+        self.assertEqual(children[2]['error']['name'], 'Mock Error')
+        with self.assertRaises(IndexError):
+            batch[3]
+        self.assertEqual(len(MockBatch('parent', parent, 5, 2)), 0)
+
+    def test_finished_job_fragments(self):
+        ret = self.mocker.check_jobs(TOKEN, ['done', 'running'], False, encode_fragments=True)
+        done = ret['job_states']['done']
+        self.assertIsInstance(done, JSONFragment)
+        self.assertEqual(json.loads(done.encoded), done.value)
+        self.assertEqual(done['job_state'], 'completed')
+        self.assertIsInstance(ret['job_states']['running'], dict)
+        ret = self.mocker.check_jobs(TOKEN, ['done', 'running'], False, encode_fragments=True)
+        self.assertIs(ret['job_states']['done'], done)
+        # shared by every token that can see the job
+        ret = self.mocker.check_jobs('other_token', ['done'], False, encode_fragments=True)
+        self.assertIs(ret['job_states']['done'], done)
+        ret = self.mocker.check_jobs(TOKEN, ['done'], False)
+        self.assertIsInstance(ret['job_states']['done'], dict)
+
+    def test_running_batch_sub_jobs_fragment(self):
+        ret = self.mocker.check_jobs(TOKEN, ['batch'], False, encode_fragments=True)
+        state = ret['job_states']['batch']
+        self.assertIsInstance(state, dict)
+        sub_jobs = state['sub_jobs']
+        self.assertIsInstance(sub_jobs, JSONFragment)
+        self.assertEqual(json.loads(sub_jobs.encoded), list(sub_jobs))
+        self.assertEqual(sub_jobs[1]['job_id'], 'batch_1')
+        ret = self.mocker.check_jobs(TOKEN, ['batch'], False, encode_fragments=True)
+        self.assertIs(ret['job_states']['batch']['sub_jobs'], sub_jobs)
+        # another window gets its own
+        ret = self.mocker.check_jobs(TOKEN, ['batch'], False, 1, 2, encode_fragments=True)
+        self.assertEqual([j['job_id'] for j in ret['job_states']['batch']['sub_jobs']],
+                         ['batch_1', 'batch_2'])
+        # the children copy the parent's times, so a new one is encoded when they change
+        self.njs.job_states['batch']['finish_time'] = 10
+        ret = self.mocker.check_jobs(TOKEN, ['batch'], False, encode_fragments=True)
+        changed = ret['job_states']['batch']['sub_jobs']
+        self.assertIsNot(changed, sub_jobs)
+        self.assertEqual(json.loads(changed.encoded)[0]['finish_time'], 10)
+
+    def test_check_jobs_since(self):
+        job_ids = ['done', 'running', 'batch', 'missing']
+        ret = self.mocker.check_jobs_since(TOKEN, job_ids, None, True)
+        self.assertEqual(set(ret['job_states']), set(['done', 'running', 'batch']))
+        self.assertEqual(set(ret['job_params']), set(['done', 'running', 'batch']))
+        self.assertIn('missing', ret['check_error'])
+        ret = self.mocker.check_jobs_since(TOKEN, job_ids, ret['cursor'], True)
+        self.assertEqual(ret['job_states'], {})
+        self.assertEqual(ret['job_params'], {})
+        self.assertIn('missing', ret['check_error'])
+        self.njs.job_states['running']['job_state'] = 'completed'
+        self.njs.job_states['running']['finished'] = 1
+        changed = self.mocker.check_jobs_since(TOKEN, job_ids, ret['cursor'], True)
+        self.assertEqual(list(changed['job_states']), ['running'])
+        self.assertEqual(list(changed['job_params']), ['running'])
+        # a cursor made with other options starts over
+        ret = self.mocker.check_jobs_since(TOKEN, job_ids, changed['cursor'], False)
+        self.assertEqual(len(ret['job_states']), 3)
+        self.assertNotIn('job_params', ret)
+        ret = self.mocker.check_jobs_since(TOKEN, job_ids, ret['cursor'], False,
+                                           sub_jobs_mode='summary')
+        self.assertEqual(len(ret['job_states']), 3)
+        with self.assertRaises(ValueError):
+            self.mocker.check_jobs_since(TOKEN, job_ids, 'not a cursor', False)